@@ -1,32 +1,73 @@
 # adapters/driven/mongo_plan_result_writer_adapter.py
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 import uuid
-from pymongo import MongoClient, ASCENDING, DESCENDING
-from config.settings import MONGODB_CONFIG
+from pymongo import ASCENDING, DESCENDING
 from core.models.data_model import PlanResultDTO
+from adapters.driven.redis_progress_adapter import publish_run_status
+from adapters.driven.redis_read_cache import invalidate_run_status
+from adapters.pooling.connection_pool import get_mongo_db
+from config.worker_topology import queue_eta_seconds
+
+_indexes_ready = False # Index'leri her nesnede değil, süreç başına bir kez oluşturalım.
 
 class MongoPlanResultWriter:
     def __init__(self) -> None:
-        self._client = MongoClient(MONGODB_CONFIG["uri"]) # Mongo bağlantı açarken pool sağlıyormuş, hap bilgi :)
-        self._db = self._client[MONGODB_CONFIG["db_name"]]
+        global _indexes_ready
+        self._db = get_mongo_db() # Mongo client kendi içinde pool tutuyor; süreç genelinde tek client paylaşıyoruz.
         self._meta = self._db["plan_metadata"]
         self._res = self._db["plan_result"]
-        # Index'lerimi oluşturalım. Bunlar tablo yapım gereği gerekli.
-        self._meta.create_index([("run_id", ASCENDING)], unique=True)
-        self._meta.create_index([("created_at", DESCENDING)])
-        self._res.create_index([("run_id", ASCENDING)])
-        self._res.create_index([("start_time", ASCENDING)])
+        if not _indexes_ready:
+            # Index'lerimi oluşturalım. Bunlar tablo yapım gereği gerekli.
+            self._meta.create_index([("run_id", ASCENDING)], unique=True)
+            self._meta.create_index([("created_at", DESCENDING)])
+            self._meta.create_index([("queue", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)])
+            self._res.create_index([("run_id", ASCENDING)])
+            self._res.create_index([("start_time", ASCENDING)])
+            # Gantt endpoint'i run içinde start_time sırasıyla keyset sayfalıyor.
+            self._res.create_index([("run_id", ASCENDING), ("start_time", ASCENDING), ("task_instance_id", ASCENDING)])
+            _indexes_ready = True
 
-    def create_run_record(self, run_id: uuid.UUID) -> None:
+    def create_run_record(
+        self,
+        run_id: uuid.UUID,
+        solver_profile: Optional[str] = None,
+        *,
+        queue: Optional[str] = None,
+        estimated_instances: Optional[int] = None
+    ) -> dict:
         rid = str(run_id)
         now = datetime.now(timezone.utc)
+        position = eta = None
+        if queue is not None:
+            # Kuyrukta önümüzde bekleyenler ve o kuyruğun son run'larının ortalama süresiyle sıra/ETA tahmini.
+            ahead, running, avg_seconds = self.queue_estimate(queue)
+            position = ahead + 1
+            eta = queue_eta_seconds(queue, ahead + running, avg_seconds)
         self._meta.update_one( # run_id yoksa ekleyelim, varsa dokunmayalım. Bu upsert sayesinde oluyor.
             {"run_id": rid},
-            {"$setOnInsert": {"run_id": rid, "status": "PENDING", "created_at": now}},
+            {"$setOnInsert": {
+                "run_id": rid, "status": "PENDING", "created_at": now, "solver_profile": solver_profile,
+                "queue": queue, "estimated_instances": estimated_instances, "queue_position": position, "eta_seconds": eta,
+            }},
             upsert=True
         )
+        return {"queue": queue, "queue_position": position, "eta_seconds": eta}
+
+    def queue_estimate(self, queue: str, created_before=None) -> Tuple[int, int, Optional[float]]:
+        """(önde bekleyen PENDING run sayısı, çalışan run sayısı, son bitmiş run'ların ortalama süresi) döner."""
+        pending = {"queue": queue, "status": "PENDING"}
+        if created_before is not None:
+            pending["created_at"] = {"$lt": created_before}
+        ahead = self._meta.count_documents(pending)
+        running = self._meta.count_documents({"queue": queue, "status": "RUNNING"})
+        recent = self._meta.find(
+            {"queue": queue, "status": "COMPLETED", "started_at": {"$ne": None}},
+            {"_id": 0, "started_at": 1, "completed_at": 1},
+        ).sort("completed_at", DESCENDING).limit(20)
+        durations = [(r["completed_at"] - r["started_at"]).total_seconds() for r in recent if r.get("completed_at")]
+        return ahead, running, (sum(durations) / len(durations) if durations else None)
 
     def update_run_status(
         self,
@@ -35,19 +76,30 @@ class MongoPlanResultWriter:
         *,
         makespan: Optional[int] = None,
         solver_status: Optional[str] = None,
-        error_message: Optional[str] = None
+        error_message: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+        cache_hit: Optional[bool] = None,
+        metrics: Optional[dict] = None
     ) -> None: # Run’ın durumunu ve KPI kartlar için bilgileri güncelleyelim.
         rid = str(run_id)
         now = datetime.now(timezone.utc)
         upd = {"status": status} # Güncellenecek alanları toplayacağımız dict’i başlatalım.
         if status == "RUNNING":
             upd["started_at"] = now # RUNNING’e geçtiği anı kaydeder.
-        if status in ("COMPLETED", "FAILED"):
+        if status in ("COMPLETED", "FAILED", "CANCELLED", "CANCELLED_WITH_INCUMBENT"):
             upd["completed_at"] = now # Çalışma tamamlandığında/kaybedildiğinde bitiş zamanını yazar.
         if makespan is not None: upd["makespan"] = int(makespan) # Çözülen planın makespan'ını varsa int’e çevirip ekleyelim.
         if solver_status is not None: upd["solver_status"] = str(solver_status) # Solver'ın çözüm durumunu ekleyelim.
         if error_message is not None: upd["error_message"] = str(error_message) # Error varsa mesajı da verelim.
+        if fingerprint is not None: upd["fingerprint"] = str(fingerprint) # Problemin parmak izi (çözüm önbelleği anahtarı).
+        if cache_hit is not None: upd["cache_hit"] = bool(cache_hit) # Plan önbellekten mi geldi?
+        if metrics is not None: upd["metrics"] = metrics # Aşama süreleri, model boyutu ve çözücü istatistikleri.
         self._meta.update_one({"run_id": rid}, {"$set": upd}, upsert=True) # İlgili run kaydını güncelleyelim; yoksa upsert=True ile oluşturalım.
+        invalidate_run_status("MONGO", rid) # API'nin önbellekteki eski durumu göstermemesi için.
+        # Durum geçişini abonelere (SSE) anında iletelim; istemcilerin status endpoint'ini yoklamasına gerek kalmasın.
+        publish_run_status(
+            rid, status, makespan=makespan, solver_status=solver_status, error=error_message, cache_hit=cache_hit,
+        )
 
     def write_results(self, run_id: uuid.UUID, results: List[PlanResultDTO]) -> int:
         rid = str(run_id)
@@ -70,3 +122,18 @@ class MongoPlanResultWriter:
         self._res.delete_many({"run_id": rid}) # Eski sonuç satırlarını toplu silelim varsa.
         self._res.insert_many(docs) # Yeni sonuçları topluca ekleyelim.
         return len(docs)
+
+    def read_results(self, run_id: uuid.UUID) -> List[PlanResultDTO]:
+        # Önceki bir run'ın planını geri okuyalım; what-if çözümlerinde ipucu olarak kullanılıyor.
+        rows = self._res.find({"run_id": str(run_id)}).sort("task_instance_id", ASCENDING)
+        return [
+            PlanResultDTO(
+                task_instance_id=int(r["task_instance_id"]),
+                job_id=int(r["job_id"]),
+                task_name=r.get("task_name", ""),
+                assigned_machine=r.get("assigned_machine", ""),
+                start_time=int(r.get("start_time", 0)),
+                end_time=int(r.get("end_time", 0)),
+                package_uid=r.get("package_uid"),
+            ) for r in rows
+        ]
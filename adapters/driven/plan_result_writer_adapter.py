@@ -1,33 +1,78 @@
 # adapters/driven/plan_result_writer_adapter.py
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
 import uuid
-import psycopg2
-from psycopg2.extras import execute_values, register_uuid
-from config.settings import POSTGRESQL_CONFIG
+from psycopg2.extras import Json, execute_values
+from adapters.pooling.connection_pool import pg_connection
 from core.models.data_model import PlanResultDTO
+from adapters.driven.redis_progress_adapter import publish_run_status
+from adapters.driven.redis_read_cache import invalidate_run_status
+from config.worker_topology import queue_eta_seconds
 
+# Kolonlar ve index'ler migrations/ altındaki SQL dosyalarıyla kuruluyor (python -m migrations.apply_migrations).
 
 class PostgreSQLPlanResultWriter:
-    def __init__(self) -> None: # Burada normalde açma işlemi vardı artık buradaki herkes açma kapamasını kendisi yapsın diyoruz. Mongo'da pool vardı sonuçta orada yaptık, burada böyle.
+    def __init__(self) -> None: # Bağlantıları artık süreç genelindeki havuzdan ödünç alıyoruz, burada açılacak bir şey yok.
         pass
 
+    @contextmanager
     def _get_connection(self):
-        # Her metot kendi açma kapamasını yapsın.
-        conn = psycopg2.connect(**POSTGRESQL_CONFIG)
-        register_uuid(conn_or_curs=conn)
-        return conn
+        # Her metot havuzdan bir bağlantı ödünç alsın; with bitince bağlantı havuza geri döner.
+        with pg_connection() as conn:
+            yield conn
 
-    def create_run_record(self, run_id: uuid.UUID) -> None:
-        # sql’i sabitler; plan_metadata tablosuna run_id ve başlangıç durumu PENDING ekleyecek.
-        sql = "INSERT INTO plan_metadata (run_id, status) VALUES (%s, 'PENDING')"
-        conn = self._get_connection()
-        try:
-            # connection açalım; insert çalışsın, commit edelim, sonunda kapatalım.
+    def create_run_record(
+            self,
+            run_id: uuid.UUID,
+            solver_profile: Optional[str] = None,
+            *,
+            queue: Optional[str] = None,
+            estimated_instances: Optional[int] = None
+    ) -> dict:
+        # sql’i sabitler; plan_metadata tablosuna run_id, başlangıç durumu PENDING ve seçilen solver profili eklenecek.
+        sql = """
+            INSERT INTO plan_metadata (run_id, status, solver_profile, queue, estimated_instances, queue_position, eta_seconds)
+            VALUES (%s, 'PENDING', %s, %s, %s, %s, %s)
+        """
+        with self._get_connection() as conn:
+            # connection ödünç alalım; insert çalışsın, commit edelim, sonunda havuza geri verelim.
+            position = eta = None
+            if queue is not None:
+                # Kuyrukta önümüzde bekleyenler ve o kuyruğun son run'larının ortalama süresiyle sıra/ETA tahmini.
+                ahead, running, avg_seconds = self._queue_load(conn, queue)
+                position = ahead + 1
+                eta = queue_eta_seconds(queue, ahead + running, avg_seconds)
             with conn.cursor() as cur:
-                cur.execute(sql, (run_id,))
+                cur.execute(sql, (run_id, solver_profile, queue, estimated_instances, position, eta))
             conn.commit() # autocommit default kapalı olunca böyle vermemiz gerekiyor.
-        finally:
-            conn.close()
+        return {"queue": queue, "queue_position": position, "eta_seconds": eta}
+
+    def queue_estimate(self, queue: str, created_before=None) -> Tuple[int, int, Optional[float]]:
+        """(önde bekleyen PENDING run sayısı, çalışan run sayısı, son bitmiş run'ların ortalama süresi) döner."""
+        with self._get_connection() as conn:
+            load = self._queue_load(conn, queue, created_before)
+            conn.commit()
+        return load
+
+    @staticmethod
+    def _queue_load(conn, queue: str, created_before=None) -> Tuple[int, int, Optional[float]]:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT
+                    COUNT(*) FILTER (WHERE status = 'PENDING' AND (%s::timestamptz IS NULL OR created_at < %s::timestamptz)),
+                    COUNT(*) FILTER (WHERE status = 'RUNNING')
+                FROM plan_metadata WHERE queue = %s AND status IN ('PENDING', 'RUNNING')
+            """, (created_before, created_before, queue))
+            ahead, running = cur.fetchone()
+            cur.execute("""
+                SELECT AVG(EXTRACT(EPOCH FROM completed_at - started_at)) FROM (
+                    SELECT started_at, completed_at FROM plan_metadata
+                    WHERE queue = %s AND status = 'COMPLETED' AND started_at IS NOT NULL
+                    ORDER BY completed_at DESC LIMIT 20
+                ) recent
+            """, (queue,))
+            avg_seconds = cur.fetchone()[0]
+        return int(ahead), int(running), float(avg_seconds) if avg_seconds is not None else None
 
     def update_run_status(
             self,
@@ -36,26 +81,37 @@ class PostgreSQLPlanResultWriter:
             *,
             makespan: Optional[int] = None,
             solver_status: Optional[str] = None,
-            error_message: Optional[str] = None
+            error_message: Optional[str] = None,
+            fingerprint: Optional[str] = None,
+            cache_hit: Optional[bool] = None,
+            metrics: Optional[dict] = None
     ) -> None:
         set_clauses = [ # Tek update ile güncelleme mantığı.
             "status = %s",
-            "completed_at = CASE WHEN %s IN ('COMPLETED', 'FAILED') THEN NOW() ELSE completed_at END",
+            "completed_at = CASE WHEN %s IN ('COMPLETED', 'FAILED', 'CANCELLED', 'CANCELLED_WITH_INCUMBENT') THEN NOW() ELSE completed_at END",
             "started_at = CASE WHEN %s = 'RUNNING' THEN NOW() ELSE started_at END",
             "makespan = COALESCE(%s, makespan)",
             "solver_status = COALESCE(%s, solver_status)",
             "error_message = COALESCE(%s, error_message)",
+            "fingerprint = COALESCE(%s, fingerprint)",
+            "cache_hit = COALESCE(%s, cache_hit)",
+            "metrics = COALESCE(%s, metrics)", # Aşama süreleri, model boyutu ve çözücü istatistikleri (JSONB).
         ]
         sql = f"UPDATE plan_metadata SET {', '.join(set_clauses)} WHERE run_id = %s" # yukarıda hazırlanan SET parçalarını tek UPDATE’e gömelim. Normalde burası daha manueldi SET'i de öğrenmiş olduk.
 
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
                 # İlk status ilk satır için, diğer ikisi ikinci ve üçüncü satırda koşul olarak kullanılıyor ondan dolayı.
-                cur.execute(sql, (status, status, status, makespan, solver_status, error_message, run_id))
+                cur.execute(sql, (
+                    status, status, status, makespan, solver_status, error_message, fingerprint, cache_hit,
+                    Json(metrics) if metrics is not None else None, run_id,
+                ))
             conn.commit()
-        finally:
-            conn.close()
+        invalidate_run_status("PG", run_id) # API'nin önbellekteki eski durumu göstermemesi için.
+        # Durum geçişini abonelere (SSE) anında iletelim; istemcilerin status endpoint'ini yoklamasına gerek kalmasın.
+        publish_run_status(
+            run_id, status, makespan=makespan, solver_status=solver_status, error=error_message, cache_hit=cache_hit,
+        )
 
     def write_results(self, run_id: uuid.UUID, results: List[PlanResultDTO]) -> int:
         if not results:
@@ -74,14 +130,27 @@ class PostgreSQLPlanResultWriter:
             ) for r in results
         ]
 
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn: # Hata olursa havuz rollback yapıp bağlantıyı geri alır.
             with conn.cursor() as cur:
                 execute_values(cur, sql, rows)
             conn.commit()
             return len(rows)
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
\ No newline at end of file
+
+    def read_results(self, run_id: uuid.UUID) -> List[PlanResultDTO]:
+        # Önceki bir run'ın planını geri okuyalım; what-if çözümlerinde ipucu olarak kullanılıyor.
+        sql = """
+            SELECT task_instance_id, job_id, task_name, assigned_machine, start_time, end_time, package_uid
+            FROM plan_result
+            WHERE run_id = %s
+            ORDER BY task_instance_id ASC
+        """
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, (str(run_id),))
+                rows = cur.fetchall()
+        return [
+            PlanResultDTO(
+                task_instance_id=int(tid), job_id=int(job_id), task_name=task_name,
+                assigned_machine=machine, start_time=int(start), end_time=int(end), package_uid=package_uid
+            ) for tid, job_id, task_name, machine, start, end, package_uid in rows
+        ]
@@ -0,0 +1,137 @@
+# adapters/driven/redis_progress_adapter.py
+
+import json
+import time
+from typing import Callable, Iterator, Optional
+import redis
+from adapters.pooling.connection_pool import get_redis
+
+PROGRESS_TTL_SECONDS = 24 * 60 * 60  # Son ilerleme bilgisini bir gün tutalım, sonra Redis kendisi silsin.
+
+def progress_key(run_id: str) -> str:
+    return f"fjsm:progress:{run_id}"
+
+def run_channel(run_id: str) -> str:
+    return f"fjsm:run:{run_id}"
+
+def cancel_key(run_id: str) -> str:
+    return f"fjsm:cancel:{run_id}"
+
+RUNS_CHANNEL = "fjsm:runs"  # Tüm run'ların durum geçişleri; dashboard listesi tek abonelikle izleyebilsin.
+TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED", "CANCELLED_WITH_INCUMBENT"})
+
+def _is_final(event: dict) -> bool:
+    return event.get("type") == "finished" or (event.get("type") == "status" and event.get("state") in TERMINAL_STATES)
+
+def publish_run_status(run_id: str, state: str, client: Optional[redis.Redis] = None, **fields) -> None:
+    """
+    Plan yazıcıları durum değiştirince çağırır: {"type": "status", ...} olayı run kanalına ve genel kanala gider.
+    None alanlar atlanır. Redis'e ulaşılamazsa sessizce geçilir; asıl kayıt veritabanında.
+    """
+    event = {"type": "status", "run_id": str(run_id), "state": state}
+    event.update({k: v for k, v in fields.items() if v is not None})
+    payload = json.dumps(event, default=str)
+    try:
+        pipe = (client or get_redis()).pipeline()
+        pipe.publish(run_channel(str(run_id)), payload)
+        pipe.publish(RUNS_CHANNEL, payload)
+        pipe.execute()
+    except redis.RedisError:
+        pass
+
+class RedisProgressPublisher:
+    """
+    Worker tarafı: solver'ın ilerleme olaylarını Redis'e yazar.
+    Son olay bir key'de saklanır (status endpoint'i için), ayrıca run kanalına publish edilir (SSE için).
+    """
+    def __init__(self, run_id: str, client: Optional[redis.Redis] = None):
+        self.run_id = str(run_id)
+        self._client = client or get_redis()
+
+    def __call__(self, event: dict) -> None:
+        payload = json.dumps(event, default=str)
+        pipe = self._client.pipeline()
+        pipe.set(progress_key(self.run_id), payload, ex=PROGRESS_TTL_SECONDS)
+        pipe.publish(run_channel(self.run_id), payload)
+        pipe.execute()
+
+    def finish(self, state: str, **extra) -> None:
+        # Dinleyen SSE bağlantılarına run'ın bittiğini haber verelim ki akışı kapatsınlar.
+        # Redis'e ulaşılamasa bile run'ın sonucu zaten veritabanında; burada hata fırlatmıyoruz.
+        event = {"type": "finished", "state": state, **extra}
+        try:
+            self._client.publish(run_channel(self.run_id), json.dumps(event, default=str))
+        except redis.RedisError:
+            pass
+
+class RedisProgressReader:
+    """API tarafı: son ilerleme bilgisini okur ve run kanalını dinler."""
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._client = client or get_redis()
+
+    def latest(self, run_id: str) -> Optional[dict]:
+        raw = self._client.get(progress_key(str(run_id)))
+        return json.loads(raw) if raw else None
+
+    def stream(
+        self,
+        run_id: str,
+        heartbeat: float = 15.0,
+        current_status: Optional[Callable[[], Optional[dict]]] = None,
+    ) -> Iterator[Optional[dict]]:
+        """
+        Run kanalındaki olayları (ilerleme ve durum geçişleri) sırayla verir. heartbeat saniye boyunca olay gelmezse
+        None verir (bağlantı canlı kalsın diye). "finished" ya da bitmiş duruma geçiş olayından sonra biter.
+        current_status verilirse abone olduktan sonra çağrılır: abone olmadan hemen önce biten run'ı kaçırmayalım.
+        """
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(run_channel(str(run_id)))  # Önce abone olalım ki son durumu okurken olay kaçmasın.
+        try:
+            if current_status is not None:
+                status = current_status()
+                if status is not None:
+                    yield status
+                    if _is_final(status):
+                        return
+            last = self.latest(run_id)
+            if last is not None:
+                yield last
+            yield from self._listen(pubsub, heartbeat, stop=_is_final)
+        finally:
+            pubsub.close()
+
+    def stream_all(self, heartbeat: float = 15.0) -> Iterator[Optional[dict]]:
+        """Tüm run'ların durum geçişleri; istemci bağlantıyı kapatana kadar sürer."""
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(RUNS_CHANNEL)
+        try:
+            yield from self._listen(pubsub, heartbeat, stop=lambda event: False)
+        finally:
+            pubsub.close()
+
+    @staticmethod
+    def _listen(pubsub, heartbeat: float, stop: Callable[[dict], bool]) -> Iterator[Optional[dict]]:
+        idle_since = time.monotonic()
+        while True:
+            message = pubsub.get_message(timeout=1.0)
+            if message is None:
+                if time.monotonic() - idle_since >= heartbeat:
+                    idle_since = time.monotonic()
+                    yield None
+                continue
+            idle_since = time.monotonic()
+            event = json.loads(message["data"])
+            yield event
+            if stop(event):
+                return
+
+class RedisRunControl:
+    """API ile worker arasında run iptal bayrağını taşır."""
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._client = client or get_redis()
+
+    def request_cancel(self, run_id: str) -> None:
+        self._client.set(cancel_key(str(run_id)), "1", ex=PROGRESS_TTL_SECONDS)
+
+    def is_cancel_requested(self, run_id: str) -> bool:
+        return bool(self._client.exists(cancel_key(str(run_id))))
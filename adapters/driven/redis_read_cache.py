@@ -0,0 +1,176 @@
+# adapters/driven/redis_read_cache.py
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+import redis
+from adapters.pooling.connection_pool import get_redis
+
+try:
+    from config.settings import READ_CACHE_CONFIG
+except ImportError:
+    READ_CACHE_CONFIG = {}
+
+_DEFAULTS = {
+    "enabled": True,
+    "memory_max_bytes": 64 * 1024 * 1024,  # Süreç içi önbelleğin toplam boyutu; aşılınca en eski kullanılan atılır.
+    "ttl_seconds": 7 * 24 * 60 * 60,  # Bitmiş run'lar Redis'te bir hafta dokunulmazsa silinsin.
+    "live_ttl_seconds": 2,  # Süren run'ların durumu; update_run_status zaten anahtarı siler.
+}
+
+# Bu durumlardaki run'lar artık değişmez (backend/app.py ile aynı küme).
+TERMINAL_STATES = frozenset({"COMPLETED", "FAILED", "CANCELLED", "CANCELLED_WITH_INCUMBENT"})
+
+def _setting(key: str):
+    return READ_CACHE_CONFIG.get(key, _DEFAULTS[key])
+
+def status_key(db: str, run_id: str) -> str:
+    return f"fjsm:read:{db}:status:{run_id}"
+
+def gantt_key(db: str, run_id: str, variant: str) -> str:
+    return f"fjsm:read:{db}:gantt:{run_id}:{variant}"
+
+class _SizedLRU:
+    """Boyutu byte olarak sınırlı, thread-safe LRU. Sadece değişmeyecek (bitmiş run) kayıtlar konur."""
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, Tuple[object, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, value, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._items[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, dropped) = self._items.popitem(last=False)
+                self._size -= dropped
+
+_memory = _SizedLRU(int(_setting("memory_max_bytes")))
+
+class PlanReadCache:
+    """
+    Run durumu ve Gantt cevapları için read-through önbellek: önce süreç içi LRU, sonra Redis, en son veritabanı.
+    Bitmiş run'lar süresiz (boyuta göre LRU) tutulur; süren run'ın durumu Redis'te birkaç saniye tutulur ve
+    plan yazıcılarının update_run_status'u anahtarı siler. Redis hatalarında doğrudan veritabanına gidilir.
+    """
+    def __init__(self, client: Optional[redis.Redis] = None, logger=None):
+        self._client = client
+        self.logger = logger
+        self.enabled = bool(_setting("enabled"))
+        self.ttl = int(_setting("ttl_seconds"))
+        self.live_ttl = int(_setting("live_ttl_seconds"))
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = get_redis()
+        return self._client
+
+    def _warn(self, msg: str) -> None:
+        if self.logger:
+            self.logger.warning(msg)
+
+    def get_status(self, db: str, run_id: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """
+        Run durumu; yoksa None. Değerler JSON'dan geçirilerek döner (tarihler metin), böylece önbellekten gelen
+        ve veritabanından gelen cevap aynı görünür.
+        """
+        if not self.enabled:
+            return loader()
+        key = status_key(db, run_id)
+        cached = _memory.get(key)
+        if cached is not None:
+            return dict(cached)
+        try:
+            raw = self.client.get(key)
+        except redis.RedisError as e:
+            self._warn(f"Read cache lookup failed: {e}")
+            raw = None
+        if raw is not None:
+            value = json.loads(raw)
+            if value.get("state") in TERMINAL_STATES:
+                _memory.put(key, value, len(raw))
+            return dict(value)
+
+        value = loader()
+        if value is None:
+            return None
+        raw = json.dumps(value, default=str)
+        value = json.loads(raw)
+        terminal = value.get("state") in TERMINAL_STATES
+        if terminal:
+            _memory.put(key, value, len(raw))
+        try:
+            self.client.set(key, raw, ex=self.ttl if terminal else self.live_ttl)
+        except redis.RedisError as e:
+            self._warn(f"Read cache write failed: {e}")
+        return dict(value)
+
+    def get_gantt(
+        self,
+        db: str,
+        run_id: str,
+        variant: str,
+        loader: Callable[[], Tuple[bytes, Optional[str], Optional[str]]],
+    ) -> Tuple[bytes, Optional[str], Optional[str]]:
+        """
+        Bitmiş bir run'ın kodlanmış Gantt cevabı: (gövde, Content-Encoding, sonraki cursor).
+        variant filtreleri ve kodlamayı içerir; sıkıştırma da böylece bir kez yapılır.
+        """
+        if not self.enabled:
+            return loader()
+        key = gantt_key(db, run_id, variant)
+        cached = _memory.get(key)
+        if cached is not None:
+            return cached
+        try:
+            stored = self.client.hgetall(key)
+        except redis.RedisError as e:
+            self._warn(f"Read cache lookup failed: {e}")
+            stored = {}
+        if stored:
+            entry = (
+                stored[b"body"],
+                stored.get(b"encoding", b"").decode() or None,
+                stored.get(b"next", b"").decode() or None,
+            )
+            _memory.put(key, entry, len(entry[0]))
+            return entry
+
+        entry = loader()
+        _memory.put(key, entry, len(entry[0]))
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(key, mapping={"body": entry[0], "encoding": entry[1] or "", "next": entry[2] or ""})
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._warn(f"Read cache write failed: {e}")
+        return entry
+
+def invalidate_run_status(db: str, run_id: str, client: Optional[redis.Redis] = None) -> None:
+    """
+    Plan yazıcıları durum değiştirdikten sonra çağırır; API bir sonraki istekte veritabanından okur.
+    Süreç içi önbellekte sadece bitmiş run'lar olduğu için orada silinecek bir şey yok.
+    """
+    if not _setting("enabled"):
+        return
+    try:
+        (client or get_redis()).delete(status_key(db, str(run_id)))
+    except redis.RedisError:
+        pass  # Kısa TTL zaten eskiyi düşürecek; yazma işlemi bunun yüzünden bozulmasın.
@@ -0,0 +1,123 @@
+# adapters/driven/redis_solution_cache.py
+
+import json
+import time
+from dataclasses import asdict
+from typing import List, Optional
+import redis
+from adapters.pooling.connection_pool import get_redis
+from core.models.data_model import PlanResultDTO
+
+try:
+    from config.settings import SOLUTION_CACHE_CONFIG
+except ImportError:
+    SOLUTION_CACHE_CONFIG = {}
+
+_DEFAULTS = {
+    "enabled": True,
+    "ttl_seconds": 7 * 24 * 60 * 60,  # Bir hafta dokunulmayan plan kendiliğinden silinsin.
+    "max_entries": 200,  # Bundan fazlası olursa en uzun süredir kullanılmayanları atıyoruz (LRU).
+}
+
+LRU_KEY = "fjsm:solution:lru"
+
+def solution_key(fingerprint: str) -> str:
+    return f"fjsm:solution:{fingerprint}"
+
+class RedisSolutionCache:
+    """
+    Parmak izi -> tamamlanmış plan önbelleği. Her kayıt TTL ile tutulur, ayrıca son kullanım zamanına göre
+    bir sorted set'te izlenir; max_entries aşılınca en eskiler silinir.
+    Süre sınırına takılmış (OPTIMAL olmayan) planlar da saklanır ama istemci yenileme isterse miss sayılır;
+    yeni çözüm eskisinden kötü değilse kaydın yerine geçer.
+    Önbellek hiçbir zaman bir run'ı düşürmemeli: Redis hatalarında miss gibi davranıyoruz.
+    """
+    def __init__(self, client: Optional[redis.Redis] = None, logger=None):
+        self._client = client or get_redis()
+        self.logger = logger
+        self.enabled = bool(SOLUTION_CACHE_CONFIG.get("enabled", _DEFAULTS["enabled"]))
+        self.ttl = int(SOLUTION_CACHE_CONFIG.get("ttl_seconds", _DEFAULTS["ttl_seconds"]))
+        self.max_entries = int(SOLUTION_CACHE_CONFIG.get("max_entries", _DEFAULTS["max_entries"]))
+
+    def _warn(self, msg: str) -> None:
+        if self.logger:
+            self.logger.warning(msg)
+
+    def get(self, fingerprint: str, optimal_only: bool = False) -> Optional[dict]:
+        """
+        Kayıt varsa {"results": [PlanResultDTO], "makespan", "solver_status", "run_id"} döner.
+        optimal_only: istemci yeniden çözüm istedi; optimal olduğu ispatlanmamış kayıt miss sayılır.
+        """
+        if not self.enabled:
+            return None
+        key = solution_key(fingerprint)
+        try:
+            raw = self._client.get(key)
+            if raw is None:
+                return None
+            entry = json.loads(raw)
+            if optimal_only and entry.get("solver_status") != "OPTIMAL":
+                return None
+            # Kullanıldı: LRU sırasını ve TTL'i tazeleyelim.
+            pipe = self._client.pipeline()
+            pipe.zadd(LRU_KEY, {fingerprint: time.time()})
+            pipe.expire(key, self.ttl)
+            pipe.execute()
+        except redis.RedisError as e:
+            self._warn(f"Solution cache read failed: {e}")
+            return None
+        entry["results"] = [PlanResultDTO(**r) for r in entry["results"]]
+        return entry
+
+    def put(
+        self,
+        fingerprint: str,
+        results: List[PlanResultDTO],
+        *,
+        makespan: int,
+        solver_status: str,
+        run_id: Optional[str] = None,
+    ) -> None:
+        if not self.enabled or not results:
+            return
+        if solver_status != "OPTIMAL" and self._has_better(fingerprint, makespan):
+            return
+        payload = json.dumps({
+            "results": [asdict(r) for r in results],
+            "makespan": makespan,
+            "solver_status": solver_status,
+            "run_id": str(run_id) if run_id else None,
+        })
+        try:
+            pipe = self._client.pipeline()
+            pipe.set(solution_key(fingerprint), payload, ex=self.ttl)
+            pipe.zadd(LRU_KEY, {fingerprint: time.time()})
+            pipe.execute()
+            self._evict()
+        except redis.RedisError as e:
+            self._warn(f"Solution cache write failed: {e}")
+
+    def _has_better(self, fingerprint: str, makespan: int) -> bool:
+        # Yenilemede süre sınırına takılan yeni çözüm, önbellekteki daha iyi planın üstüne yazılmasın.
+        try:
+            raw = self._client.get(solution_key(fingerprint))
+        except redis.RedisError:
+            return False
+        if raw is None:
+            return False
+        old = json.loads(raw)
+        return old.get("solver_status") == "OPTIMAL" or int(old.get("makespan") or 0) < makespan
+
+    def _evict(self) -> None:
+        # TTL ile kendiliğinden silinenler de sorted set'te kalabilir; onlar da burada temizlenir.
+        excess = self._client.zcard(LRU_KEY) - self.max_entries
+        if excess <= 0:
+            return
+        stale = self._client.zrange(LRU_KEY, 0, excess - 1)
+        if not stale:
+            return
+        stale = [s.decode() if isinstance(s, bytes) else s for s in stale]
+        pipe = self._client.pipeline()
+        pipe.delete(*(solution_key(fp) for fp in stale))
+        pipe.zrem(LRU_KEY, *stale)
+        pipe.execute()
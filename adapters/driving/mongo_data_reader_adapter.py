@@ -1,15 +1,15 @@
 # adapters/driving/mongo_data_reader_adapter.py
 
 from typing import List
-from pymongo import MongoClient
 from core.models.data_model import PackageDTO, JobDTO, TaskDTO
 from core.ports.package_repo_port import IPackageRepository
 from config.settings import MONGODB_CONFIG
+from adapters.pooling.connection_pool import get_mongo_db
 
 class MongoReaderAdapter(IPackageRepository):
     def __init__(self):
-        self._client = MongoClient(MONGODB_CONFIG["uri"]) # Config'den bağlantı nesnemiz olan URI'mizi alıyoruz.
-        self._col = self._client[MONGODB_CONFIG["db_name"]][MONGODB_CONFIG["collection"]] # Üzerinde sorgulama yapabileceğimiz col nesnemizi yaratıyoruz. Bağlantımızdan veritabanımızın ismini ve collection'ımızı veriyoruz.
+        # Süreç genelinde paylaşılan MongoClient'ı kullanıyoruz; her nesne için yeni client açmıyoruz.
+        self._col = get_mongo_db()[MONGODB_CONFIG["collection"]] # Üzerinde sorgulama yapabileceğimiz col nesnemizi yaratıyoruz. Bağlantımızdan veritabanımızın ismini ve collection'ımızı veriyoruz.
 
     def read_packages(self) -> List[PackageDTO]:
         docs = list(self._col.find({})) # Collection'daki tüm document'leri getiren bir sorgu çalıştırıp listemize koyuyoruz.
@@ -40,11 +40,19 @@ class MongoReaderAdapter(IPackageRepository):
             ))
         return out # Doldurduğumuz PackageDTO'muzu döndürüyoruz.
 
-    def close(self):
-        try:
-            self._client.close()
-        except:
-            pass
+    def count_task_instances(self) -> int:
+        """process_packages'ın üreteceği task instance sayısı; document'leri Python'a taşımadan Mongo'da sayılır."""
+        rows = list(self._col.aggregate([
+            {"$unwind": "$jobs"},
+            {"$unwind": "$jobs.tasks"},
+            {"$group": {"_id": None, "n": {"$sum": {"$cond": [
+                {"$eq": ["$jobs.tasks.type", "split"]},
+                {"$max": [{"$ifNull": ["$jobs.tasks.count", 1]}, 1]},
+                1,
+            ]}}}},
+        ]))
+        return int(rows[0]["n"]) if rows else 0
 
-    def __del__(self):
-        self.close() # Bu class'ın destructor'ı. Bu class'ın nesnesi hafızadan silinirken otomatik çağrılır. Amaç, nesne yok olurken açık bir veritabanı bağlantısı kalmadığından emin olmaktır.
+    def close(self):
+        # Client paylaşımlı olduğu için burada kapatmıyoruz. Eski çağıranlar için bırakıldı.
+        pass
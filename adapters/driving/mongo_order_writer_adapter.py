@@ -1,19 +1,35 @@
 # adapters/driving/mongo_order_writer_adapter.py
 
-from typing import Optional, List
-from pymongo import MongoClient, ASCENDING
+from collections import defaultdict
+from typing import Dict, Optional, List
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from config.settings import MONGODB_CONFIG
+from adapters.pooling.connection_pool import get_mongo_db
+
+_indexes_ready = False # Index'leri her nesnede değil, süreç başına bir kez oluşturalım.
+
+class PartialOrderWrite(Exception):
+    """
+    Mongo'da toplu yazma transaction değil: bir işlem hata verirse öncekiler kalır. task_ids girdi sırasıyla
+    yazılanların id'sini, yazılamayanlar için None tutar.
+    """
+    def __init__(self, message: str, task_ids: List[Optional[int]]):
+        super().__init__(message)
+        self.task_ids = task_ids
 
 class MongoOrderWriterAdapter:
     def __init__(self):
-        self._client = MongoClient(MONGODB_CONFIG["uri"])
-        self._db = self._client[MONGODB_CONFIG["db_name"]]
+        global _indexes_ready
+        self._db = get_mongo_db() # Süreç genelinde paylaşılan client.
         self._col = self._db[MONGODB_CONFIG["collection"]]
-        self._col.create_index([("package_id", ASCENDING)], unique=True) # package_id alanında benzersiz (unique) artan indeks oluşsun diye unique parametresi var.
+        if not _indexes_ready:
+            self._col.create_index([("package_id", ASCENDING)], unique=True) # package_id alanında benzersiz (unique) artan indeks oluşsun diye unique parametresi var.
+            _indexes_ready = True
 
     def close(self):
-        try: self._client.close()
-        except: pass
+        # Client paylaşımlı olduğu için burada kapatmıyoruz.
+        pass
 
     def create_task( # Dışarıdan gelen verilerle Mongo’da package içinde job’a bir task eklensin; yeni task_id dönsün.
         self,
@@ -26,38 +42,97 @@ class MongoOrderWriterAdapter:
         eligible_machines: Optional[List[str]],
         deadline,
     ) -> int:
-        pkg = self._col.find_one({"package_id": int(package_id)}) # Bu package_id’ye sahip document var mı?
-        if not pkg: # Yoksa yeni bir paket dict'i hazırlamak için kolları sıvıyoruz. Daha içinde hiçbir şey yok, alanları koyuyoruz sadece.
-            pkg = {"package_id": int(package_id), "deadline": str(deadline), "jobs": []}
-
-        jobs = pkg.get("jobs", []) # Package içindeki iş listesini alalım; yoksa boş liste dönecek.
-        job = next((j for j in jobs if int(j.get("job_id")) == int(job_id)), None) # jobs içinde job_id eşleşen ilk job’ı bulalım.
-        if not job: # : Job yoksa yeni bir job taslağı oluşturalım, jobs listesine ekleyelim. Maksat Mongo'nun iç içe yapısını işlemek burada.
-            job = {"job_id": int(job_id), "tasks": []}
-            jobs.append(job)
-
-        new_tid = 1 # Task kimliğini package içinde benzersiz üretmek için 1 verelim.
-        for j in jobs: # Paket içindeki tüm job’lardaki tüm task’ları gezelim; en büyük task_id’yi bulup +1 yapalım ki benzersiz ve sıralı task_id'miz olsun.
-            for t in j.get("tasks", []):
-                try:
-                    new_tid = max(new_tid, int(t.get("task_id", 0)) + 1)
-                except:  # kötü veri koruması
-                    continue
-
-        task_doc = { # Artık eklenecek task'i kurabiliriz.
-            "task_id": new_tid,
-            "name": job_type,
-            "type": mode,
-            "order_id": int(phase),
-            "count": int(count) if count is not None else None,
-            "eligible_machines": list(eligible_machines or []),
-        }
-        job.setdefault("tasks", []).append(task_doc) # tasks listesi yoksa boş liste koyuyoruz, sonra yeni task’i sona ekliyoruz. setdefault bu key'i alır ve bakar.
-
-        pkg["jobs"] = jobs # Package içinde jobs alanını güncelleyelim.
-        self._col.update_one( # package_id eşleşen belgeyi günceller; yoksa oluşturur. Upsert bunu sağlar.
-            {"package_id": int(package_id)},
-            {"$set": {"deadline": str(deadline), "jobs": jobs}},
-            upsert=True
+        # Tek girdi de toplu yolla yazılıyor; böylece task_id'ler aynı sayaçtan gelir ve belge baştan yazılmaz.
+        try:
+            return self.create_tasks([{
+                "package_id": package_id, "job_id": job_id, "job_type": job_type, "mode": mode, "phase": phase,
+                "count": count, "eligible_machines": eligible_machines, "deadline": deadline,
+            }])[0]
+        except PartialOrderWrite as e:
+            raise RuntimeError(str(e)) from e
+
+    def _reserve_task_ids(self, package_id: int, n: int) -> int:
+        """
+        Paket içinde n tane ardışık task_id ayırır ve ilkini döner. Sayaç paket belgesindeki task_seq alanında $inc
+        ile artar; aynı pakete eşzamanlı yazanlar aynı id'yi alamaz. Sayaçtan önceki belgelerde sayaç bir kez
+        mevcut en büyük task_id ile başlatılır.
+        """
+        legacy = self._col.find_one(
+            {"package_id": package_id, "task_seq": {"$exists": False}}, {"_id": 0, "jobs.tasks.task_id": 1},
+        )
+        if legacy is not None:
+            top = 0
+            for j in legacy.get("jobs", []):
+                for t in j.get("tasks", []):
+                    try:
+                        top = max(top, int(t.get("task_id", 0)))
+                    except (TypeError, ValueError):  # kötü veri koruması
+                        continue
+            # Koşullu: arada başkası başlattıysa dokunmuyoruz.
+            self._col.update_one({"package_id": package_id, "task_seq": {"$exists": False}}, {"$set": {"task_seq": top}})
+        doc = self._col.find_one_and_update(
+            {"package_id": package_id}, {"$inc": {"task_seq": n}},
+            projection={"_id": 0, "task_seq": 1}, upsert=True, return_document=ReturnDocument.AFTER,
         )
-        return int(new_tid) # Yeni task’ın id’sini döndürelim.
+        return int(doc["task_seq"]) - n + 1
+
+    def create_tasks(self, orders: List[dict]) -> List[int]:
+        """
+        Doğrulanmış iş emirlerini (create_task argümanlarıyla aynı alanlar) tek bulk_write ile yazar; task_id'leri
+        girdi sırasıyla döner. Task'lar belgeyi baştan yazmak yerine $push ile ilgili job'a eklenir.
+        Mongo'da bu yazma atomik değil: bir işlem hata verirse PartialOrderWrite ile hangilerinin yazıldığı bildirilir.
+        """
+        if not orders:
+            return []
+        by_package: Dict[int, List[int]] = defaultdict(list) # package_id -> orders içindeki sıralar.
+        for i, o in enumerate(orders):
+            by_package[int(o["package_id"])].append(i)
+
+        task_ids: List[int] = [0] * len(orders)
+        ops = []
+        op_orders: Dict[int, List[int]] = {} # Task ekleyen işlemin sırası -> o işlemle yazılan girdiler.
+        for package_id, indexes in by_package.items():
+            next_tid = self._reserve_task_ids(package_id, len(indexes))
+            new_tasks: Dict[int, list] = defaultdict(list) # job_id -> eklenecek task'lar, girdi sırasıyla.
+            job_orders: Dict[int, List[int]] = defaultdict(list)
+            for i in indexes:
+                o = orders[i]
+                task_ids[i] = next_tid
+                new_tasks[int(o["job_id"])].append({
+                    "task_id": next_tid,
+                    "name": o["job_type"],
+                    "type": o["mode"],
+                    "order_id": int(o["phase"]),
+                    "count": int(o["count"]) if o["count"] is not None else None,
+                    "eligible_machines": list(o["eligible_machines"] or []),
+                })
+                job_orders[int(o["job_id"])].append(i)
+                next_tid += 1
+
+            # Deadline'ı güncelleyelim (sayaç paketi zaten oluşturdu); sonra eksik job'ları boş olarak ekleyelim.
+            # Koşullu $push sayesinde aynı job'ı eşzamanlı ekleyen iki import job'ı iki kez oluşturmaz.
+            ops.append(UpdateOne({"package_id": package_id}, {"$set": {"deadline": str(orders[indexes[-1]]["deadline"])}}))
+            for jid in new_tasks:
+                ops.append(UpdateOne(
+                    {"package_id": package_id, "jobs.job_id": {"$ne": jid}},
+                    {"$push": {"jobs": {"job_id": jid, "tasks": []}}},
+                ))
+            for jid, tasks in new_tasks.items():
+                op_orders[len(ops)] = job_orders[jid]
+                ops.append(UpdateOne(
+                    {"package_id": package_id},
+                    {"$push": {"jobs.$[j].tasks": {"$each": tasks}}},
+                    array_filters=[{"j.job_id": jid}],
+                ))
+
+        try:
+            self._col.bulk_write(ops, ordered=True) # Sıralı: hata veren işlemden sonrakiler hiç çalışmaz.
+        except BulkWriteError as e:
+            failed_at = min(err["index"] for err in e.details.get("writeErrors", [])) if e.details.get("writeErrors") else 0
+            written: List[Optional[int]] = [None] * len(orders)
+            for op_index, order_indexes in op_orders.items():
+                if op_index < failed_at:
+                    for i in order_indexes:
+                        written[i] = task_ids[i]
+            raise PartialOrderWrite(f"Bulk write stopped at operation {failed_at}: {e}", written) from e
+        return task_ids
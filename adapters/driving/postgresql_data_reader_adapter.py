@@ -1,84 +1,101 @@
 # adapters/driving/postgresql_data_reader_adapter.py
 
-from typing import List
-import psycopg2
+from collections import defaultdict
+from typing import Dict, List
 from psycopg2.extras import RealDictCursor # Sonuçları Dict olarak almamızı sağlar. ("değer1", "değer2") yerine {"değer1": "değer_1"} gibi döner.
 from core.models.data_model import PackageDTO, JobDTO, TaskDTO
 from core.ports.package_repo_port import IPackageRepository
-from config.settings import POSTGRESQL_CONFIG
+from adapters.pooling.connection_pool import pg_connection
+
+TASK_FETCH_SIZE = 5000 # Server-side cursor'ın her turda çektiği task satırı sayısı.
+
+def _parse_machines(raw) -> List[str]:
+    # eligible_machines JSONB (migrations/002); psycopg2 doğrudan liste döner.
+    return [str(m) for m in raw or []]
 
 class PostgreSQLReaderAdapter(IPackageRepository):
     def __init__(self):
-        # Bağlantı bilgilerini config'den çekip bağlantı nesnemizi oluşturalım.
-        self._conn = psycopg2.connect(
-            dbname=POSTGRESQL_CONFIG["dbname"],
-            user=POSTGRESQL_CONFIG["user"],
-            password=POSTGRESQL_CONFIG["password"],
-            host=POSTGRESQL_CONFIG["host"],
-            port=POSTGRESQL_CONFIG["port"]
-        )
+        # Bağlantıyı artık burada açmıyoruz; okuma anında süreç genelindeki havuzdan ödünç alıyoruz.
+        pass
 
     def read_packages(self) -> List[PackageDTO]:
+        with pg_connection() as conn:
+            return self._read_packages(conn)
+
+    def _read_packages(self, conn) -> List[PackageDTO]:
         try:
-            # with bloğu cursor'ın işi bittiğinde veya hata olduğunda otomatik olarak kapanmayı sağlar. Rollback sağlanmış olur.
+            # Eskiden her paket için job'ları, her job için task'ları ayrı ayrı sorguluyorduk (N+1 sorgu).
+            # Artık üç tabloyu üç toplu sorguyla çekip ağacı hafızada kuruyoruz.
             # Parantez içi ifadeyle diyoruz ki bana bu türden dön.
-            with self._conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT * FROM package") # Tüm paketleri getir.
-                package_rows = cur.fetchall() # Dönen tüm satırları bir listeye alalım.
-
-                packages: List[PackageDTO] = [] # packages adında bir liste oluşturup bu liste PackageDTO nesneleri alacak diyoruz.
-                for pkg in package_rows:
-                    package_id = pkg["package_id"]
-                    deadline = pkg["deadline"]
-                    # Mevcut pakete ait tüm işlemleri getirelim.
-                    # Burada %s kullanımı ile SQL Injection'lara karşı engel yapıyormuşuz.
-                    cur.execute("SELECT * FROM job WHERE package_id = %s", (package_id,))
-                    job_rows = cur.fetchall()
-                    # Asıl amaç task katmanına inmek. Aynı mantığı job'a da yapalım.
-                    jobs: List[JobDTO] = []
-
-                    for job in job_rows:
-                        job_id = job["job_id"]
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                # Üç sorgu aynı anlık görüntüyü görsün; arada yapılan bir sipariş importu task'sız job bırakmasın.
+                cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+                cur.execute("SELECT package_id, deadline FROM package ORDER BY package_id") # Tüm paketleri getir.
+                package_rows = cur.fetchall()
+                cur.execute("SELECT job_id, package_id FROM job ORDER BY job_id") # Tüm işleri getir.
+                job_rows = cur.fetchall()
 
-                        cur.execute("SELECT * FROM task WHERE job_id = %s", (job_id,))
-                        task_rows = cur.fetchall()
-                        tasks: List[TaskDTO] = []
+            # Task tablosu en büyüğü; isim verilen cursor server-side çalışır ve satırları TASK_FETCH_SIZE'lık parçalarla getirir.
+            # Böylece çok büyük sipariş defterlerinde bile tüm tablo bir anda hafızaya dolmaz.
+            tasks_by_job: Dict[int, List[TaskDTO]] = defaultdict(list)
+            with conn.cursor(name="fjsm_task_reader", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = TASK_FETCH_SIZE
+                cur.execute("""
+                    SELECT job_id, name, type, order_id, count, eligible_machines
+                    FROM task
+                    ORDER BY job_id, task_id
+                """)
+                for task in cur:
+                    tasks_by_job[task["job_id"]].append(TaskDTO(
+                        name=task["name"],
+                        type=task["type"],
+                        order=task["order_id"],
+                        count=task["count"],
+                        eligible_machines=_parse_machines(task["eligible_machines"])
+                    ))
+            conn.commit() # Okuma transaction'ını kapatalım, bağlantı "idle in transaction" kalmasın.
 
-                        for task in task_rows:
-                            raw = task["eligible_machines"]
-                            machines = raw.strip("[]").replace("'", "").replace('"', '').split(", ") if raw else []
-                            # Task katmanına indik şimdi tekrar yukarıya doğru katmansal çıkalım.
-                            tasks.append(TaskDTO(
-                                name=task["name"],
-                                type=task["type"],
-                                order=task["order_id"],
-                                count=task["count"],
-                                eligible_machines=machines
-                            ))
-                        # Olan tasklere şimdi bir de çektiğimiz job'ları ekleyelim.
-                        jobs.append(JobDTO(job_id=job_id, tasks=tasks))
+            # Task katmanından tekrar yukarıya doğru katmansal çıkalım.
+            jobs_by_package: Dict[int, List[JobDTO]] = defaultdict(list)
+            for job in job_rows:
+                jobs_by_package[job["package_id"]].append(
+                    JobDTO(job_id=job["job_id"], tasks=tasks_by_job.get(job["job_id"], []))
+                )
 
-                    # En üst katmana ve core'un kabul edeceği paket hazır.
-                    packages.append(PackageDTO(
-                        package_id=package_id,
-                        deadline=str(deadline),
-                        jobs=jobs,
-                        source="PG",
-                        uid=f"PG-{package_id}"
-                    ))
-                return packages
+            # En üst katmana ve core'un kabul edeceği paket hazır.
+            packages: List[PackageDTO] = []
+            for pkg in package_rows:
+                package_id = pkg["package_id"]
+                packages.append(PackageDTO(
+                    package_id=package_id,
+                    deadline=str(pkg["deadline"]),
+                    jobs=jobs_by_package.get(package_id, []),
+                    source="PG",
+                    uid=f"PG-{package_id}"
+                ))
+            return packages
         except Exception:
             # Eğer olur da try bloğunda bir hata olursa o ana kadar yapılmış olan commit edilmemiş tüm işlemleri geri alalım.
             # Böylelikle veritabanı bir hata durumunda saçma sapan bir aşamada kalmış olmasın.
             # Context manager aslında, yap her şey tam takır olacak ya da başa saracağız. (Atomiklik)
-            self._conn.rollback()
+            conn.rollback()
             raise
 
-    def close(self):
-        try:
-            self._conn.close()
-        except:
-            pass
+    def count_task_instances(self) -> int:
+        """
+        process_packages'ın üreteceği task instance sayısı (split görevler count kadar); paketleri okumadan
+        tek sorguyla. API run'ı kuyruğa koyarken küçük/büyük kuyruk seçimi için kullanıyor.
+        """
+        with pg_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT COALESCE(SUM(CASE WHEN type = 'split' THEN COALESCE(NULLIF(count, 0), 1) ELSE 1 END), 0)
+                    FROM task
+                """)
+                total = cur.fetchone()[0]
+            conn.commit()
+        return int(total)
 
-    def __del__(self):
-        self.close()
+    def close(self):
+        # Havuzdaki bağlantılar paylaşımlı; kapatacak bir şey yok. Eski çağıranlar için bırakıldı.
+        pass
@@ -2,22 +2,17 @@
 
 from typing import Optional, List
 import json
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from config.settings import POSTGRESQL_CONFIG
+from psycopg2.extras import RealDictCursor, execute_values
+from adapters.pooling.connection_pool import pg_connection
 
 class PostgreSQLOrderWriterAdapter:
     def __init__(self):
-        self._conn = psycopg2.connect(**POSTGRESQL_CONFIG)
+        # Bağlantılar yazma anında süreç genelindeki havuzdan ödünç alınır.
+        pass
 
     def close(self):
-        try:
-            self._conn.close()
-        except:
-            pass
-
-    def __del__(self):
-        self.close()
+        # Havuzdaki bağlantılar paylaşımlı; kapatacak bir şey yok. Eski çağıranlar için bırakıldı.
+        pass
 
     def _ensure_package(self, cur, package_id: int, deadline):
         cur.execute("SELECT 1 FROM package WHERE package_id = %s", (package_id,)) # SELECT 1 ile var mı diye bakıyoruz, varsa güncelleyeceğiz, yoksa ekleyeceğiz.
@@ -57,24 +52,70 @@ class PostgreSQLOrderWriterAdapter:
         eligible_machines: Optional[List[str]],
         deadline,
     ) -> int: # Yeni iş emri girdisini kaydetmek için dışarıdan gelen bilgilerle yeni bir task satırı ekleyeceğiz.
-        try:
-            with self._conn:
-                with self._conn.cursor(cursor_factory=RealDictCursor) as cur: # Cursor’ı as cur olarak isimlendirdik.
-                    self._ensure_package(cur, package_id, deadline) # Paket kaydı yoksa ekliyoruz, varsa deadline’ı güncelliyoruz.
-                    self._ensure_job(cur, package_id, job_id) # Job kaydı yoksa ekliyoruz, varsa gerekirse package_id düzeltiyoruz.
+        with pg_connection() as conn, conn: # İçteki "with conn" başarıda commit, hatada rollback yapar.
+            with conn.cursor(cursor_factory=RealDictCursor) as cur: # Cursor’ı as cur olarak isimlendirdik.
+                self._ensure_package(cur, package_id, deadline) # Paket kaydı yoksa ekliyoruz, varsa deadline’ı güncelliyoruz.
+                self._ensure_job(cur, package_id, job_id) # Job kaydı yoksa ekliyoruz, varsa gerekirse package_id düzeltiyoruz.
+
+                em_json = json.dumps(eligible_machines or []) # Listemizi yazmak için json formatına çevirelim.
 
-                    em_json = json.dumps(eligible_machines or []) # Listemizi yazmak için json formatına çevirelim.
+                cur.execute( # Yeni bir task satırı ekleyip ve DB’den dönen task_id’yi istiyoruz. Yani kayıt veriyoruz kimlik istiyoruz.
+                    """
+                    INSERT INTO task (job_id, name, type, order_id, count, eligible_machines)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    RETURNING task_id
+                    """,
+                    (job_id, job_type, mode, phase, count, em_json)
+                )
+                row = cur.fetchone() # RETURNING task_id’nin döndürdüğü tek satırı alalım bakalım task_id var mı?
+                return int(row["task_id"]) if row and "task_id" in row else -1 # row dolu ve içinde task_id anahtarı varsa onu integer’a çevirip döndürelim, yoksa -1 dönsün. (Gerçi direkt exception da atabilirmişim sanırım.)
 
-                    cur.execute( # Yeni bir task satırı ekleyip ve DB’den dönen task_id’yi istiyoruz. Yani kayıt veriyoruz kimlik istiyoruz.
-                        """
-                        INSERT INTO task (job_id, name, type, order_id, count, eligible_machines)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        RETURNING task_id
-                        """,
-                        (job_id, job_type, mode, phase, count, em_json)
-                    )
-                    row = cur.fetchone() # RETURNING task_id’nin döndürdüğü tek satırı alalım bakalım task_id var mı?
-                    return int(row["task_id"]) if row and "task_id" in row else -1 # row dolu ve içinde task_id anahtarı varsa onu integer’a çevirip döndürelim, yoksa -1 dönsün. (Gerçi direkt exception da atabilirmişim sanırım.)
-        except Exception:
-            self._conn.rollback()
-            raise
+    def create_tasks(self, orders: List[dict]) -> List[int]:
+        """
+        Doğrulanmış iş emirlerini (create_task argümanlarıyla aynı alanlar) tek transaction'da yazar; task_id'leri
+        girdi sırasıyla döner. Paket ve job'lar tek tek SELECT/INSERT yerine toplu upsert ile, task'lar tek
+        INSERT ... RETURNING ile eklenir. Hata olursa hiçbiri yazılmaz.
+        """
+        if not orders:
+            return []
+        # Aynı paket/job birden çok kez gelirse sonuncusu geçerli (tek tek eklemedeki güncelleme davranışı).
+        # Aynı satırı tek upsert içinde iki kez güncellemek Postgres'te hata verdiği için burada tekilleştiriyoruz.
+        packages = {int(o["package_id"]): str(o["deadline"]) for o in orders}
+        jobs = {int(o["job_id"]): int(o["package_id"]) for o in orders}
+        task_rows = [
+            (
+                int(o["job_id"]), o["job_type"], o["mode"], int(o["phase"]),
+                o["count"], json.dumps(o["eligible_machines"] or []),
+            ) for o in orders
+        ]
+        with pg_connection() as conn, conn: # İçteki "with conn" başarıda commit, hatada rollback yapar.
+            with conn.cursor() as cur:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO package (package_id, deadline) VALUES %s
+                    ON CONFLICT (package_id) DO UPDATE SET deadline = EXCLUDED.deadline
+                    """,
+                    list(packages.items()),
+                )
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO job (job_id, package_id) VALUES %s
+                    ON CONFLICT (job_id) DO UPDATE SET package_id = EXCLUDED.package_id
+                    WHERE job.package_id IS DISTINCT FROM EXCLUDED.package_id
+                    """,
+                    list(jobs.items()),
+                )
+                rows = execute_values(
+                    cur,
+                    """
+                    INSERT INTO task (job_id, name, type, order_id, count, eligible_machines)
+                    VALUES %s
+                    RETURNING task_id
+                    """,
+                    task_rows,
+                    page_size=1000,
+                    fetch=True, # Sayfaların RETURNING satırları girdi sırasıyla birleştirilip döner.
+                )
+        return [int(r[0]) for r in rows]
@@ -0,0 +1,152 @@
+# adapters/pooling/connection_pool.py
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+import psycopg2
+from psycopg2 import extensions, pool as pg_pool
+from psycopg2.extras import register_uuid
+from pymongo import MongoClient
+import redis
+from config.settings import POSTGRESQL_CONFIG, MONGODB_CONFIG
+
+try:
+    from config.settings import REDIS_URL
+except ImportError:  # Eski settings dosyalarında REDIS_URL yok; Celery broker'ı ile aynı adresi varsayıyoruz.
+    REDIS_URL = "redis://localhost:6379/0"
+
+try:
+    from config.settings import POOL_CONFIG
+except ImportError:
+    POOL_CONFIG = {}
+
+# Süreç başına tek havuz. Değerler settings.POOL_CONFIG ile ezilebilir.
+_DEFAULTS = {
+    "pg_minconn": 1,
+    "pg_maxconn": 10,
+    "pg_health_check_after": 30.0,  # Bu kadar saniye boşta kalan bağlantı ödünç verilmeden önce SELECT 1 ile yoklanır.
+    "pg_acquire_timeout": 30.0,  # Havuz doluysa bir bağlantının geri dönmesi için en fazla bu kadar saniye beklenir.
+    "mongo_max_pool_size": 50,
+    "redis_max_connections": 50,
+}
+
+def _setting(key: str):
+    return POOL_CONFIG.get(key, _DEFAULTS[key])
+
+_lock = threading.Lock()
+_state: Dict[str, object] = {"pid": None, "pg": None, "pg_slots": None, "mongo": None, "redis": None}
+_last_used: Dict[int, float] = {}  # id(conn) -> havuza son dönüş zamanı
+
+def _reset_if_forked() -> None:
+    # Celery prefork ya da gunicorn fork ettiğinde ebeveynin soketleri çocuğa geçer ama paylaşılamaz.
+    # pid değiştiyse ebeveynin havuzlarına dokunmadan (kapatmadan) unutuyoruz; çocuk kendi havuzunu kurar.
+    pid = os.getpid()
+    if _state["pid"] != pid:
+        _state.update(pid=pid, pg=None, pg_slots=None, mongo=None, redis=None)
+        _last_used.clear()
+
+def reset_pools() -> None:
+    """Süreç içindeki tüm havuzları bırakır. Celery worker_process_init sinyalinde çağrılır."""
+    with _lock:
+        _state.update(pid=None, pg=None, pg_slots=None, mongo=None, redis=None)
+        _last_used.clear()
+
+def get_pg_pool() -> pg_pool.ThreadedConnectionPool:
+    with _lock:
+        _reset_if_forked()
+        if _state["pg"] is None:
+            register_uuid()  # uuid.UUID parametreleri tüm bağlantılarda çalışsın.
+            _state["pg"] = pg_pool.ThreadedConnectionPool(
+                _setting("pg_minconn"), _setting("pg_maxconn"), **POSTGRESQL_CONFIG
+            )
+            # ThreadedConnectionPool dolunca beklemeden PoolError fırlatıyor; ödünç almayı bu semaforla sıraya sokuyoruz.
+            _state["pg_slots"] = threading.BoundedSemaphore(_setting("pg_maxconn"))
+        return _state["pg"]
+
+def _is_healthy(conn) -> bool:
+    if conn.closed:
+        return False
+    idle = time.monotonic() - _last_used.get(id(conn), 0.0)
+    if idle < _setting("pg_health_check_after"):
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+@contextmanager
+def pg_connection() -> Iterator["extensions.connection"]:
+    """
+    Havuzdan bir PostgreSQL bağlantısı ödünç verir, blok bitince geri koyar. Havuz doluysa pg_acquire_timeout
+    saniyeye kadar bir bağlantının dönmesini bekler, sonra PoolError fırlatır.
+    Blokta hata olursa ya da açık transaction kalırsa rollback yapılır; kopmuş bağlantılar havuzdan atılır.
+    """
+    pool = get_pg_pool()
+    slots = _state["pg_slots"]
+    if not slots.acquire(timeout=_setting("pg_acquire_timeout")):
+        raise pg_pool.PoolError(
+            f"No PostgreSQL connection became free within {_setting('pg_acquire_timeout')}s "
+            f"(pg_maxconn={_setting('pg_maxconn')})"
+        )
+    try:
+        conn = pool.getconn()
+        if not _is_healthy(conn):
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+    except Exception:
+        slots.release()
+        raise
+    broken = False
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        raise
+    finally:
+        if not broken and not conn.closed and conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
+        discard = broken or bool(conn.closed)
+        if discard:
+            _last_used.pop(id(conn), None)
+        else:
+            _last_used[id(conn)] = time.monotonic()
+        try:
+            pool.putconn(conn, close=discard)
+        finally:
+            slots.release()
+
+def get_mongo_client() -> MongoClient:
+    """Süreç başına tek MongoClient; kendi içinde bağlantı havuzu tutar."""
+    with _lock:
+        _reset_if_forked()
+        if _state["mongo"] is None:
+            # connect=False: ilk sorguya kadar bağlanmaz, fork öncesi oluşturulursa bile güvenli.
+            _state["mongo"] = MongoClient(
+                MONGODB_CONFIG["uri"], maxPoolSize=_setting("mongo_max_pool_size"), connect=False
+            )
+        return _state["mongo"]
+
+def get_mongo_db():
+    return get_mongo_client()[MONGODB_CONFIG["db_name"]]
+
+def get_redis() -> redis.Redis:
+    """Süreç başına tek Redis bağlantı havuzu."""
+    with _lock:
+        _reset_if_forked()
+        if _state["redis"] is None:
+            connection_pool = redis.ConnectionPool.from_url(
+                REDIS_URL, max_connections=_setting("redis_max_connections"), health_check_interval=30
+            )
+            _state["redis"] = redis.Redis(connection_pool=connection_pool)
+        return _state["redis"]
@@ -0,0 +1,134 @@
+# adapters/solver/decomposition.py
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+from config.machine_config_loader import MachineConfig
+from config.solver_profiles import SolverProfile
+from core.models.data_model import PlanResultDTO, TaskInstanceDTO
+from core.ports.solver_port import SolveCancelled
+
+def independent_components(tasks: List[TaskInstanceDTO], config: MachineConfig) -> List[List[TaskInstanceDTO]]:
+    """
+    Job-makine grafının bağlı bileşenleri: aynı makineye aday olan job'lar aynı bileşene düşer. Farklı bileşenler
+    hiçbir makineyi paylaşmadığı için birbirinden bağımsız çözülebilir. Büyükten küçüğe sıralı döner.
+    """
+    parent: Dict[tuple, tuple] = {}
+
+    def find(x: tuple) -> tuple:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for t in tasks:
+        row = config.durations_for(t.base_name)
+        job = find(("job", t.job_id))
+        for m in t.machine_candidates:
+            if row.get(m, 0) > 0:
+                parent[find(("machine", m))] = job
+                job = find(job)
+
+    groups: Dict[tuple, List[TaskInstanceDTO]] = defaultdict(list)
+    for t in tasks:
+        groups[find(("job", t.job_id))].append(t)
+    return sorted(groups.values(), key=len, reverse=True)
+
+def split_locks(components: List[List[TaskInstanceDTO]], config: MachineConfig, locks: list) -> List[list]:
+    """Kilitleri bileşenlere dağıtır: görev kilidi görevin, makine bloğu makinenin bileşenine gider."""
+    task_comp: Dict[int, int] = {}
+    machine_comp: Dict[str, int] = {}
+    for i, comp in enumerate(components):
+        for t in comp:
+            task_comp[t.id] = i
+            row = config.durations_for(t.base_name)
+            for m in t.machine_candidates:
+                if row.get(m, 0) > 0:
+                    machine_comp[m] = i
+
+    per_comp: List[list] = [[] for _ in components]
+    for lk in locks:
+        if "task_instance_id" in lk:
+            i = task_comp.get(int(lk["task_instance_id"]))
+        else:
+            i = machine_comp.get(str(lk["machine"]))  # Hiçbir görevin kullanmadığı makinelerin blokları düşer.
+        if i is not None:
+            per_comp[i].append(lk)
+    return per_comp
+
+def merge_components(components: List[List[TaskInstanceDTO]], groups: int) -> List[List[TaskInstanceDTO]]:
+    """
+    Bileşenleri en fazla `groups` gruba toplar (en büyük bileşen en boş gruba). Aynı modeldeki bağımsız bileşenler
+    yine doğru çözülür; grup sayısını worker sayısına eşitlemek bütün grupların aynı anda koşmasını garanti eder.
+    """
+    if len(components) <= groups:
+        return components
+    merged: List[List[TaskInstanceDTO]] = [[] for _ in range(groups)]
+    for comp in sorted(components, key=len, reverse=True):
+        min(merged, key=len).extend(comp)
+    return sorted(merged, key=len, reverse=True)
+
+# Bileşen çözen süreç/thread'lerin paylaştığı durum, initializer ile kurulur: "herkes dursun" olayı, Stage 1 sonrası
+# buluşma bariyeri ve bileşenlerin Stage 1 makespan'leri (-1: henüz yok).
+_stop = None
+_barrier = None
+_makespans = None
+
+# Bariyerde en fazla bütçe + bu kadar beklenir; çöken bir süreç yüzünden diğerleri sonsuza dek beklemesin.
+BARRIER_SLACK_SECONDS = 120.0
+
+def _init_shared(stop, barrier, makespans) -> None:
+    global _stop, _barrier, _makespans
+    _stop, _barrier, _makespans = stop, barrier, makespans
+
+def _component_solver(config: MachineConfig, profile: SolverProfile):
+    from adapters.logging.logger_adapter import LoggerAdapter
+    from adapters.solver.solver_adapter import ORToolsSolver
+
+    return ORToolsSolver(
+        config, logger=LoggerAdapter(level=logging.WARNING), profile=profile,
+        decompose=False, cancel_check=_stop.is_set,
+    )
+
+def _agree_makespan(index: int, makespan: int, timeout: float) -> Optional[int]:
+    """Bileşenin makespan'ini yazar, diğerlerini bekler ve global makespan'i döner. Bariyer bozulduysa None."""
+    _makespans[index] = makespan
+    try:
+        _barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        return None
+    return max(_makespans[:])
+
+def _solve_component(
+    index: int,
+    config: MachineConfig,
+    profile: SolverProfile,
+    tasks: List[TaskInstanceDTO],
+    locks: list,
+    hint_plan: Optional[List[PlanResultDTO]],
+    started_at: float,
+) -> dict:
+    """
+    Bileşenin iki aşamasını aynı modelle çözer; Stage 2'nin üst sınırı bütün bileşenlerin Stage 1 makespan'lerinin
+    en büyüğüdür. Süreçler arasında exception taşımak yerine sonucu dict olarak döner.
+    """
+    solver = _component_solver(config, profile)
+    outcome = {"index": index, "results": [], "cancelled": False, "stats": {}, "error": None}
+    try:
+        outcome["results"] = solver.solve_component(
+            tasks, locks, hint_plan,
+            lambda ms: _agree_makespan(index, ms, profile.time_budget + BARRIER_SLACK_SECONDS),
+            started_at,
+        )
+    except SolveCancelled as e:
+        outcome["results"] = e.results
+        outcome["cancelled"] = True
+    except Exception as e:
+        outcome["error"] = str(e)
+    finally:
+        if _makespans[index] < 0:
+            _barrier.abort()  # Stage 1'i bitiremedik; bekleyen bileşenler kendi Stage 1 planlarıyla dönsün.
+    outcome["stats"] = dict(solver.last_run_stats)
+    return outcome
@@ -0,0 +1,195 @@
+# adapters/solver/heuristic_solver.py
+
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from config.machine_config_loader import MachineConfig
+from core.models.data_model import PlanResultDTO, TaskInstanceDTO
+from core.ports.logging_port import ILoggingPort
+from core.ports.solver_port import ISolverPort
+from adapters.solver.list_scheduler import _earliest_fit
+
+DISPATCH_RULES = ("spt", "mwkr", "ect")
+
+class HeuristicSolver(ISolverPort):
+    """
+    Öncelik kurallarıyla (SPT, MWKR, en erken bitiş) çalışan hızlı çizelgeleyici. Optimal değil ama bin görevlik
+    bir planı saniyenin altında verir; canlı önizleme ve kapasite kontrolü için. ORToolsSolver ile aynı imza,
+    aynı faz önceliği ve kilitler. rule="best" ise tüm kuralları deneyip en kısa makespan'i seçer.
+    """
+    def __init__(self, machine_config: MachineConfig, logger: ILoggingPort, rule: str = "best"):
+        if rule != "best" and rule not in DISPATCH_RULES:
+            raise ValueError(f"Unknown dispatch rule '{rule}'. Available: best, {', '.join(DISPATCH_RULES)}")
+        self.config = machine_config
+        self.logger = logger
+        self.rule = rule
+        self.last_status: str | None = None
+        self.last_run_stats: dict = {}
+
+    def solve(
+        self,
+        tasks: List[TaskInstanceDTO],
+        locks: Optional[list] = None,
+        hint_plan: Optional[List[PlanResultDTO]] = None,  # Sezgisel ipucu kullanmıyor; imza uyumu için.
+    ) -> List[PlanResultDTO]:
+        started = time.perf_counter()
+        locks = locks or []
+        rules = DISPATCH_RULES if self.rule == "best" else (self.rule,)
+        best: Optional[Tuple[Tuple[int, int], str, List[PlanResultDTO]]] = None
+        errors = []
+        for rule in rules:
+            try:
+                plan = self._dispatch(tasks, locks, rule)
+            except RuntimeError as e:
+                errors.append(f"{rule}: {e}")
+                continue
+            score = (max((r.end_time for r in plan), default=0), sum(r.end_time for r in plan))
+            self.logger.debug(f"Dispatch rule {rule}: makespan {score[0]}")
+            if best is None or score < best[0]:
+                best = (score, rule, plan)
+        if best is None:
+            self.last_status = "INFEASIBLE"
+            raise RuntimeError("Heuristic could not build a plan: " + "; ".join(errors))
+
+        elapsed = time.perf_counter() - started
+        self.last_status = "HEURISTIC"
+        self.last_run_stats = {"tasks": len(tasks), "rule": best[1], "makespan": best[0][0], "solve_seconds": elapsed}
+        self.logger.info(f"Heuristic plan ({best[1]}): makespan {best[0][0]} for {len(tasks)} tasks in {elapsed:.3f}s")
+        return best[2]
+
+    def _dispatch(self, tasks: List[TaskInstanceDTO], locks: list, rule: str) -> List[PlanResultDTO]:
+        n = len(tasks)
+        if n == 0:
+            return []
+        machines = self.config.machine_names
+        m_index = self.config.machine_index
+
+        # D[i, m]: görevin makinedeki süresi; aday olmayan makineler için sonsuz (büyük sayı).
+        BIG = np.iinfo(np.int64).max // 4
+        D = np.full((n, len(machines)), BIG, dtype=np.int64)
+        for i, t in enumerate(tasks):
+            row = self.config.durations_for(t.base_name)
+            for m in t.machine_candidates:
+                j = m_index.get(m)
+                if j is not None and m in row:
+                    D[i, j] = row[m]
+        min_dur = D.min(axis=1)
+        if (min_dur >= BIG).any():
+            raise RuntimeError("a task has no valid machine")
+
+        # Job faz yapısı: her job için sıralı fazlar ve fazdaki görev index'leri.
+        phases: Dict[int, List[List[int]]] = {}
+        grouped: Dict[int, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for i, t in enumerate(tasks):
+            grouped[t.job_id][t.order].append(i)
+        for job_id, orders in grouped.items():
+            phases[job_id] = [orders[o] for o in sorted(orders)]
+        # MWKR için job'un kalan iş yükü (her fazın en az süresi).
+        phase_len = {job_id: [int(min_dur[p].max()) for p in ps] for job_id, ps in phases.items()}
+
+        free = np.zeros(len(machines), dtype=np.int64)  # Makinelerin zaman çizelgesinin sonu.
+        reserved: Dict[int, List[Tuple[int, int]]] = defaultdict(list)  # Kilit ve bloklar: makine index'i -> aralıklar
+        pinned: Dict[int, Tuple[int, int]] = {}  # görev index'i -> (makine index'i, başlangıç)
+        pos = {t.id: i for i, t in enumerate(tasks)}
+        for lk in locks:
+            j = m_index.get(str(lk["machine"]))
+            if j is None:
+                raise RuntimeError(f"unknown machine {lk['machine']}")
+            if "task_instance_id" in lk:
+                i = pos.get(int(lk["task_instance_id"]))
+                if i is None:
+                    continue
+                if D[i, j] >= BIG:
+                    raise RuntimeError(f"lock refers to invalid machine {lk['machine']} for task {tasks[i].id}")
+                pinned[i] = (j, int(lk["start_min"]))
+                reserved[j].append((int(lk["start_min"]), int(lk["start_min"]) + int(D[i, j])))
+            elif int(lk["end_min"]) > int(lk["start_min"]):
+                reserved[j].append((int(lk["start_min"]), int(lk["end_min"])))
+        for j in reserved:
+            reserved[j].sort()
+
+        start = np.zeros(n, dtype=np.int64)
+        end = np.zeros(n, dtype=np.int64)
+        assigned = np.full(n, -1, dtype=np.int64)
+        ready = np.full(n, BIG, dtype=np.int64)  # Faz açılmadıysa sonsuz.
+        done = np.zeros(n, dtype=bool)
+        remaining = {job_id: sum(ls) for job_id, ls in phase_len.items()}
+        job_of = np.array([t.job_id for t in tasks])
+        work_left = np.zeros(n, dtype=np.int64)
+        phase_pos = {job_id: 0 for job_id in phases}
+        open_left: Dict[int, int] = {}  # job -> açık fazda bitmemiş görev sayısı
+
+        def open_phase(job_id: int, at: int) -> None:
+            idx = phases[job_id][phase_pos[job_id]]
+            open_left[job_id] = len(idx)
+            for i in idx:
+                if i in pinned:
+                    j, s = pinned[i]
+                    if s < at:
+                        raise RuntimeError(f"lock on task {tasks[i].id} starts before its previous phase ends")
+                    start[i], end[i], assigned[i], done[i] = s, s + D[i, j], j, True
+                    open_left[job_id] -= 1
+                else:
+                    ready[i] = at
+                    work_left[i] = remaining[job_id]
+
+        def close_phase_if_done(job_id: int) -> None:
+            while open_left[job_id] == 0:
+                idx = phases[job_id][phase_pos[job_id]]
+                at = int(end[idx].max())
+                remaining[job_id] -= phase_len[job_id][phase_pos[job_id]]
+                phase_pos[job_id] += 1
+                if phase_pos[job_id] >= len(phases[job_id]):
+                    return
+                open_phase(job_id, at)
+
+        for job_id in phases:
+            open_phase(job_id, 0)
+            close_phase_if_done(job_id)
+
+        while not done.all():
+            cand = np.flatnonzero(~done & (ready < BIG))
+            if cand.size == 0:
+                raise RuntimeError("dispatch stalled")
+            # Tüm hazır görev x makine çiftleri için vektörel başlangıç/bitiş.
+            S = np.maximum(ready[cand, None], free[None, :])
+            C = np.where(D[cand] < BIG, S + D[cand], BIG)
+            ect = C.min(axis=1)
+            est = np.where(D[cand] < BIG, S, BIG).min(axis=1)
+            # Giffler-Thompson gibi: en erken bitişten önce başlayabilenler çakışma kümesi, kural aralarından seçer.
+            conflict = est < ect.min()
+            if not conflict.any():
+                conflict = ect == ect.min()
+            if rule == "spt":
+                key = np.where(conflict, min_dur[cand], BIG)
+            elif rule == "mwkr":
+                key = np.where(conflict, -work_left[cand], BIG)
+            else:
+                key = np.where(conflict, ect, BIG)
+            pick = int(np.argmin(key))
+            i = int(cand[pick])
+
+            # Seçilen görev için kilit/blok aralıklarını da hesaba katarak en erken biten makineyi bulalım.
+            best = None
+            for j in np.flatnonzero(D[i] < BIG):
+                d = int(D[i, j])
+                s = int(max(ready[i], free[j]))
+                if reserved.get(j):
+                    s = _earliest_fit(reserved[j], s, d)
+                if best is None or s + d < best[2]:
+                    best = (int(j), s, s + d)
+            j, s, e = best
+            start[i], end[i], assigned[i], done[i] = s, e, j, True
+            free[j] = max(free[j], e)
+            job_id = int(job_of[i])
+            open_left[job_id] -= 1
+            close_phase_if_done(job_id)
+
+        return [
+            PlanResultDTO(
+                task_instance_id=t.id, job_id=t.job_id, task_name=t.name,
+                assigned_machine=machines[int(assigned[i])], start_time=int(start[i]), end_time=int(end[i]),
+                package_uid=t.package_uid,
+            ) for i, t in enumerate(tasks)
+        ]
@@ -0,0 +1,124 @@
+# adapters/solver/list_scheduler.py
+
+import heapq
+from bisect import insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from config.machine_config_loader import MachineConfig
+from core.models.data_model import PlanResultDTO, TaskInstanceDTO
+from adapters.solver.machine_pools import _natural_key
+
+def _earliest_fit(busy: List[Tuple[int, int]], ready: int, duration: int) -> int:
+    """Makinenin dolu aralıkları arasında ready'den sonra duration'ın sığdığı ilk başlangıç."""
+    t = ready
+    for s, e in busy:
+        if e <= t:
+            continue
+        if s >= t + duration:
+            break
+        t = e
+    return t
+
+def _min_duration(task: TaskInstanceDTO, config: MachineConfig) -> int:
+    row = config.durations_for(task.base_name)
+    return min(row[m] for m in task.machine_candidates if m in row)
+
+def _phases(tasks: List[TaskInstanceDTO]) -> Dict[int, List[Tuple[int, List[TaskInstanceDTO]]]]:
+    by_job: Dict[int, Dict[int, List[TaskInstanceDTO]]] = defaultdict(lambda: defaultdict(list))
+    for t in tasks:
+        by_job[t.job_id][t.order].append(t)
+    return {job_id: sorted(orders.items()) for job_id, orders in by_job.items()}
+
+def phase_bounds(tasks: List[TaskInstanceDTO], config: MachineConfig) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Faz zincirinden görev başına (en erken başlangıç, kuyruk) döner. Bir faz, önceki fazın bütün parçaları
+    bitmeden başlayamaz; her fazın en az süresi parçalarının en kısa sürelerinin en büyüğüdür.
+    Kuyruk: görevin fazından sonra gelen fazların toplam en az süresi (bitiş <= horizon - kuyruk).
+    """
+    earliest: Dict[int, int] = {}
+    tail: Dict[int, int] = {}
+    for phases in _phases(tasks).values():
+        lengths = [max(_min_duration(t, config) for t in phase_tasks) for _, phase_tasks in phases]
+        before = 0
+        after = sum(lengths)
+        for (_, phase_tasks), length in zip(phases, lengths):
+            after -= length
+            for t in phase_tasks:
+                earliest[t.id] = before
+                tail[t.id] = after
+            before += length
+    return earliest, tail
+
+def earliest_finish_schedule(
+    tasks: List[TaskInstanceDTO],
+    config: MachineConfig,
+    locks: Iterable[dict] = (),
+) -> Optional[List[PlanResultDTO]]:
+    """
+    Hızlı liste çizelgeleme: job'lar faz faz, hazır olma zamanına göre (eşitlikte kalan iş yükü fazla olan önce)
+    ele alınır; fazın her parçası en erken bitireceği makineye, boşluklara da sığdırılarak yerleştirilir.
+    Görev kilitleri ve makine blokları önceden rezerve edilir. Kilitler faz sırasıyla çelişirse None döner.
+    """
+    busy: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    pinned: Dict[int, Tuple[str, int]] = {}
+    for lk in locks:
+        machine = str(lk["machine"])
+        if "task_instance_id" in lk:
+            pinned[int(lk["task_instance_id"])] = (machine, int(lk["start_min"]))
+        elif int(lk["end_min"]) > int(lk["start_min"]):
+            insort(busy[machine], (int(lk["start_min"]), int(lk["end_min"])))
+
+    by_id = {t.id: t for t in tasks}
+    results: Dict[int, PlanResultDTO] = {}
+
+    def place(task: TaskInstanceDTO, machine: str, start: int, end: int) -> None:
+        insort(busy[machine], (start, end))
+        results[task.id] = PlanResultDTO(
+            task_instance_id=task.id, job_id=task.job_id, task_name=task.name,
+            assigned_machine=machine, start_time=start, end_time=end, package_uid=task.package_uid,
+        )
+
+    for tid, (machine, start) in pinned.items():
+        task = by_id.get(tid)
+        if task is None:
+            continue
+        d = config.durations_for(task.base_name).get(machine)
+        if not d or _earliest_fit(busy[machine], start, d) != start:
+            return None  # Geçersiz ya da birbiriyle çakışan kilitler.
+        place(task, machine, start, start + d)
+
+    phases = _phases(tasks)
+    lengths = {
+        job_id: [max(_min_duration(t, config) for t in phase_tasks) for _, phase_tasks in job_phases]
+        for job_id, job_phases in phases.items()
+    }
+    remaining = {job_id: sum(ls) for job_id, ls in lengths.items()}
+
+    heap = [(0, -remaining[job_id], job_id, 0) for job_id in phases]
+    heapq.heapify(heap)
+    while heap:
+        ready, _, job_id, idx = heapq.heappop(heap)
+        _, phase_tasks = phases[job_id][idx]
+        phase_end = ready
+        # Uzun parçalar önce yerleşsin; kısa olanlar arada kalan boşluklara daha kolay sığar.
+        free = [t for t in phase_tasks if t.id not in pinned]
+        free.sort(key=lambda t: -max(config.durations_for(t.base_name).get(m, 0) for m in t.machine_candidates))
+        for t in phase_tasks:
+            if t.id in pinned:
+                if results[t.id].start_time < ready:
+                    return None  # Kilit önceki faz bitmeden başlıyor.
+                phase_end = max(phase_end, results[t.id].end_time)
+        for t in free:
+            row = config.durations_for(t.base_name)
+            best = None
+            for m in sorted((m for m in t.machine_candidates if m in row), key=_natural_key):
+                start = _earliest_fit(busy[m], ready, row[m])
+                if best is None or start + row[m] < best[2]:
+                    best = (m, start, start + row[m])
+            place(t, *best)
+            phase_end = max(phase_end, best[2])
+        if idx + 1 < len(phases[job_id]):
+            remaining[job_id] -= lengths[job_id][idx]
+            heapq.heappush(heap, (phase_end, -remaining[job_id], job_id, idx + 1))
+
+    return [results[t.id] for t in tasks]
@@ -0,0 +1,58 @@
+# adapters/solver/lns.py
+
+import random
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from core.models.data_model import TaskInstanceDTO
+
+NEIGHBORHOODS = ("time_window", "machine_family", "jobs")
+
+# incumbent: task_id -> (kaynak (makine ya da havuz adı), başlangıç, bitiş)
+Incumbent = Dict[int, Tuple[str, int, int]]
+
+def select_neighborhood(
+    kind: str,
+    tasks: List[TaskInstanceDTO],
+    incumbent: Incumbent,
+    size: int,
+    rng: random.Random,
+) -> Set[int]:
+    """
+    LNS turunda serbest bırakılacak görevleri seçer; geri kalan her şey mevcut planda sabitlenir.
+    time_window: planın bir zaman dilimiyle kesişen görevler (yarı olasılıkla makespan'e dayanan son dilim).
+    machine_family: aynı görev tipindeki (aynı makine ailesi) görevlerden bir alt küme.
+    jobs: rastgele job'ların tüm görevleri.
+    """
+    size = max(1, min(size, len(tasks)))
+    if kind == "time_window":
+        # Görevleri başlangıca göre sıralayıp ardışık size tanesini alıyoruz; bu bir zaman penceresine denk gelir.
+        ordered = sorted(tasks, key=lambda t: incumbent[t.id][1])
+        if rng.random() < 0.5:
+            first = len(ordered) - size  # Makespan'i belirleyen son kısım.
+        else:
+            first = rng.randint(0, len(ordered) - size)
+        return {t.id for t in ordered[first:first + size]}
+
+    if kind == "machine_family":
+        families: Dict[str, List[int]] = defaultdict(list)
+        for t in tasks:
+            families[t.base_name].append(t.id)
+        members = families[rng.choice(sorted(families))]
+        if len(members) <= size:
+            return set(members)
+        # Ailenin içinden de zamanca ardışık bir dilim alalım ki serbest görevler birbirini etkileyebilsin.
+        members.sort(key=lambda tid: incumbent[tid][1])
+        first = rng.randint(0, len(members) - size)
+        return set(members[first:first + size])
+
+    jobs: Dict[int, List[int]] = defaultdict(list)
+    for t in tasks:
+        jobs[t.job_id].append(t.id)
+    job_ids = list(jobs)
+    rng.shuffle(job_ids)
+    freed: Set[int] = set()
+    for job_id in job_ids:
+        if freed and len(freed) + len(jobs[job_id]) > size:
+            break
+        freed.update(jobs[job_id])
+    return freed
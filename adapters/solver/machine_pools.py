@@ -0,0 +1,99 @@
+# adapters/solver/machine_pools.py
+
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from config.machine_config_loader import MachineConfig
+from core.models.data_model import TaskInstanceDTO
+
+@dataclass(frozen=True)
+class MachinePool:
+    """
+    Birbirinin aynısı olan makinelerden oluşan kaynak sınıfı.
+    Tek makineli havuzlarda name direkt makinenin adıdır.
+    """
+    name: str
+    machines: Tuple[str, ...]
+
+    @property
+    def capacity(self) -> int:
+        return len(self.machines)
+
+    @property
+    def is_pooled(self) -> bool:
+        return len(self.machines) > 1
+
+def _natural_key(machine: str):
+    # K#2, K#10'dan önce gelsin diye sayısal kısmı int olarak karşılaştırıyoruz.
+    return [int(p) if p.isdigit() else p for p in re.split(r"(\d+)", machine)]
+
+def group_identical_machines(
+    tasks: List[TaskInstanceDTO],
+    config: MachineConfig,
+    excluded: Iterable[str] = (),
+) -> Dict[str, MachinePool]:
+    """
+    Makine -> havuz eşlemesini döner. İki makine ancak tüm görev tiplerindeki süreleri aynıysa
+    ve her task instance için ikisi birden aday (ya da ikisi birden aday değil) ise aynı havuza girer.
+    excluded içindeki makineler (örneğin kilitlerde geçenler) her zaman tek başına kalır.
+    """
+    excluded = set(excluded)
+    membership: Dict[str, set] = {}
+    for task in tasks:
+        durations = config.durations_for(task.base_name)
+        for m in task.machine_candidates:
+            if m in durations:
+                membership.setdefault(m, set()).add(task.id)
+
+    groups: Dict[tuple, List[str]] = {}
+    for machine, task_ids in membership.items():
+        if machine in excluded:
+            key = ("__single__", machine)
+        else:
+            key = (config.machine_profile(machine), frozenset(task_ids))
+        groups.setdefault(key, []).append(machine)
+
+    pools: Dict[str, MachinePool] = {}
+    for machines in groups.values():
+        machines = sorted(machines, key=_natural_key)
+        # Üyeler ardışık olmak zorunda değil (ör. O#1, O#7, O#9); isim hem log'da hem anahtar olarak tekil kalsın.
+        name = machines[0] if len(machines) == 1 else f"pool[{','.join(machines)}]"
+        pool = MachinePool(name=name, machines=tuple(machines))
+        for m in machines:
+            pools[m] = pool
+    return pools
+
+def assign_pool_machines(
+    pool: MachinePool,
+    intervals: List[Tuple[int, int, int]],
+    release: Optional[Dict[str, int]] = None,
+) -> Dict[int, str]:
+    """
+    Havuza atanmış (task_id, start, end) aralıklarını somut makinelere dağıtır (interval coloring).
+    Cumulative kısıtı aynı anda en fazla capacity görev olmasını garanti ettiği için
+    başlangıca göre sıralı açgözlü atama her zaman yeterli makine bulur.
+    release: makinenin ancak bu zamandan sonra boş olduğu durumlar (0'dan başlayan bloklar).
+    """
+    release = release or {}
+    assignment: Dict[int, str] = {}
+    free: List[int] = []  # Boştaki makinelerin index'leri, en küçük index önce.
+    busy: List[Tuple[int, int]] = []  # (bitiş, makine index'i)
+    for idx, machine in enumerate(pool.machines):
+        if release.get(machine, 0) > 0:
+            busy.append((release[machine], idx))
+        else:
+            free.append(idx)
+    heapq.heapify(free)
+    heapq.heapify(busy)
+
+    for task_id, start, end in sorted(intervals, key=lambda x: (x[1], x[2], x[0])):
+        while busy and busy[0][0] <= start:
+            _, idx = heapq.heappop(busy)
+            heapq.heappush(free, idx)
+        if not free:
+            raise RuntimeError(f"Pool {pool.name} capacity exceeded at t={start}")
+        idx = heapq.heappop(free)
+        assignment[task_id] = pool.machines[idx]
+        heapq.heappush(busy, (end, idx))
+    return assignment
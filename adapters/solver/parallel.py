@@ -0,0 +1,17 @@
+# adapters/solver/parallel.py
+
+import multiprocessing as mp
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+def make_executor(workers: int, initializer: Optional[Callable] = None, initargs: tuple = ()) -> Executor:
+    """
+    Paralel çözüm için havuz açar. Celery prefork çocukları daemon olduğu için süreç açamaz; o durumda thread havuzu
+    kullanılır (CP-SAT çözerken GIL'i bıraktığı için thread'ler de çekirdekleri kullanabiliyor).
+    """
+    workers = max(1, workers)
+    if mp.current_process().daemon:
+        return ThreadPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=mp.get_context("spawn"), initializer=initializer, initargs=initargs,
+    )
@@ -0,0 +1,203 @@
+# adapters/solver/portfolio_solver.py
+
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+from config.machine_config_loader import MachineConfig
+from config.solver_profiles import SolverProfile, get_solver_profile
+from core.models.data_model import PlanResultDTO, TaskInstanceDTO
+from core.ports.logging_port import ILoggingPort
+from core.ports.solver_port import ISolverPort, SolveCancelled
+from adapters.solver.parallel import make_executor
+
+_NO_BEST = 2 ** 62
+
+@dataclass(frozen=True)
+class PortfolioStrategy:
+    """Portföydeki bir çözücü ayarı. Hepsi aynı problemi çözer, sadece model ve arama ayarları farklıdır."""
+    name: str
+    use_machine_pools: bool = True
+    heuristic_bounds: bool = True  # Liste çizelgesiyle horizon + ipucu.
+    break_symmetry: bool = True
+    random_seed: int = 0
+
+def default_strategies(cores: int) -> List[PortfolioStrategy]:
+    """Çekirdek sayısına göre strateji listesi; her stratejiye en az 4 thread düşecek kadar strateji açılır."""
+    candidates = [
+        PortfolioStrategy("pooled"),
+        PortfolioStrategy("per_machine", use_machine_pools=False),
+        PortfolioStrategy("pooled_unhinted", heuristic_bounds=False),
+        PortfolioStrategy("per_machine_unhinted", use_machine_pools=False, heuristic_bounds=False),
+    ]
+    candidates += [PortfolioStrategy(f"pooled_seed{seed}", random_seed=seed) for seed in range(1, 5)]
+    return candidates[:max(2, min(len(candidates), cores // 4))]
+
+# Çalışan süreç/thread'lerin paylaştığı durum: (en iyi makespan, herkes dursun olayı). Initializer ile kurulur.
+_shared = None
+
+def _init_shared(best, stop) -> None:
+    global _shared
+    _shared = (best, stop)
+
+def _run_strategy(
+    strategy: PortfolioStrategy,
+    config: MachineConfig,
+    profile: SolverProfile,
+    tasks: List[TaskInstanceDTO],
+    locks: list,
+    hint_plan: Optional[List[PlanResultDTO]],
+) -> dict:
+    """Tek bir stratejiyi çalıştırır. Süreçler arasında exception taşımak yerine sonucu dict olarak döner."""
+    from adapters.logging.logger_adapter import LoggerAdapter
+    from adapters.solver.solver_adapter import ORToolsSolver
+
+    best, stop = _shared
+    local = {"stage": 1, "objective": None, "bound": 0}
+
+    def on_progress(event: dict) -> None:
+        if event.get("type") != "progress":
+            return
+        local["stage"] = event.get("stage", 1)
+        if local["stage"] != 1:
+            return
+        local["objective"] = event.get("objective")
+        local["bound"] = event.get("bound") or 0
+        if local["objective"] is not None:
+            with best.get_lock():
+                if local["objective"] < best.value:
+                    best.value = int(local["objective"])
+
+    def should_stop() -> bool:
+        if stop.is_set():
+            return True
+        # Alt sınırımız başka bir stratejinin bulduğu makespan'e dayandıysa ondan iyisini bulamayız.
+        return (
+            local["stage"] == 1 and local["objective"] is not None
+            and local["bound"] >= best.value and local["objective"] > best.value
+        )
+
+    solver = ORToolsSolver(
+        config, logger=LoggerAdapter(level=logging.WARNING), profile=profile,
+        use_machine_pools=strategy.use_machine_pools, break_symmetry=strategy.break_symmetry,
+        heuristic_bounds=strategy.heuristic_bounds, random_seed=strategy.random_seed,
+        decompose=False,  # Stratejiler zaten paralel; içeride bir de bileşen süreçleri açmayalım.
+        progress_callback=on_progress, cancel_check=should_stop,
+    )
+    outcome = {"strategy": strategy.name, "results": [], "status": None, "stats": {}, "error": None}
+    try:
+        outcome["results"] = solver.solve(tasks, locks=locks, hint_plan=hint_plan)
+        outcome["status"] = solver.last_status
+        if solver.last_run_stats.get("stage1_status") == "OPTIMAL":
+            stop.set()  # Optimal makespan ispatlandı ve plan tamam; diğerleri boşuna çalışmasın.
+    except SolveCancelled as e:
+        outcome["results"] = e.results
+        outcome["status"] = "STOPPED"
+    except Exception as e:
+        outcome["error"] = str(e)
+    outcome["stats"] = dict(solver.last_run_stats)
+    return outcome
+
+def _total_job_completion(results: List[PlanResultDTO]) -> int:
+    """Stage 2'nin amacı: her job'ın son bitişlerinin toplamı (split parçaları job'ı bir kez sayar)."""
+    job_end = {}
+    for r in results:
+        job_end[r.job_id] = max(job_end.get(r.job_id, 0), r.end_time)
+    return sum(job_end.values())
+
+class PortfolioSolver(ISolverPort):
+    """
+    Aynı problemi birkaç farklı ayarla (havuzlu / makine başına, ipuçlu / ipuçsuz, farklı seed'ler) paralel çözer.
+    Stratejiler en iyi makespan'i paylaşır; biri optimali ispatlayınca ya da bir stratejinin alt sınırı
+    başkasının çözümüne dayanınca o stratejiler durur. En iyi plan ve kazanan strateji raporlanır.
+    Celery prefork çocukları daemon olduğu için süreç açamaz; o durumda thread havuzu kullanılır
+    (CP-SAT çözerken GIL'i bıraktığı için thread'ler de çekirdekleri kullanabiliyor).
+    """
+    def __init__(
+        self,
+        machine_config: MachineConfig,
+        logger: ILoggingPort,
+        profile: SolverProfile | None = None,
+        strategies: List[PortfolioStrategy] | None = None,
+        progress_callback: Callable[[dict], None] | None = None,
+        cancel_check: Callable[[], bool] | None = None,
+        cores: int | None = None,
+    ):
+        self.config = machine_config
+        self.logger = logger
+        self.profile = profile or get_solver_profile(None)
+        self.cores = cores or os.cpu_count() or 1
+        self.strategies = strategies or default_strategies(self.cores)
+        self.progress_callback = progress_callback
+        self.cancel_check = cancel_check
+        self.last_status: str | None = None
+        self.last_run_stats: dict = {}
+
+    def solve(
+        self,
+        tasks: List[TaskInstanceDTO],
+        locks: Optional[list] = None,
+        hint_plan: Optional[List[PlanResultDTO]] = None,
+    ) -> List[PlanResultDTO]:
+        locks = locks or []
+        ctx = mp.get_context("spawn")
+        best, stop = ctx.Value("q", _NO_BEST), ctx.Event()
+        # Çekirdekleri stratejiler arasında bölüyoruz; her biri kendi payı kadar CP-SAT thread'i açar.
+        per_strategy = max(1, self.cores // len(self.strategies))
+        profile = replace(self.profile, num_workers=per_strategy)
+        self.logger.info(
+            f"Portfolio: {len(self.strategies)} strategies x {per_strategy} workers "
+            f"({', '.join(s.name for s in self.strategies)})"
+        )
+
+        outcomes = []
+        cancelled = False
+        published = _NO_BEST
+        with make_executor(len(self.strategies), _init_shared, (best, stop)) as executor:
+            pending = {
+                executor.submit(_run_strategy, s, self.config, profile, tasks, locks, hint_plan) for s in self.strategies
+            }
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                outcomes.extend(f.result() for f in done)
+                if not cancelled and self.cancel_check and self.cancel_check():
+                    cancelled = True
+                    stop.set()
+                if best.value < published and self.progress_callback:
+                    published = best.value
+                    self.progress_callback({"type": "progress", "stage": 1, "objective": published})
+
+        for o in outcomes:
+            if o["error"]:
+                self.logger.warning(f"Portfolio strategy {o['strategy']} failed: {o['error']}")
+        finished = [o for o in outcomes if o["results"]]
+        # Aynı makespan'de ikinci amaç (toplam job bitişi) küçük olan kazanır.
+        finished.sort(key=lambda o: (max(r.end_time for r in o["results"]), _total_job_completion(o["results"])))
+        self.last_run_stats = {
+            "strategies": [
+                {
+                    "name": o["strategy"], "status": o["status"], "error": o["error"],
+                    "makespan": max((r.end_time for r in o["results"]), default=None),
+                    "total_job_completion": _total_job_completion(o["results"]) if o["results"] else None,
+                    "stage1_status": o["stats"].get("stage1_status"),
+                } for o in outcomes
+            ],
+            "winner": finished[0]["strategy"] if finished else None,
+        }
+        if cancelled:
+            self.last_status = "CANCELLED"
+            raise SolveCancelled(finished[0]["results"] if finished else [])
+        if not finished:
+            self.last_status = "INFEASIBLE"
+            raise RuntimeError("No feasible solution found by any portfolio strategy.")
+
+        winner = finished[0]
+        self.last_status = winner["status"] if winner["status"] != "STOPPED" else "FEASIBLE"
+        self.last_run_stats.update(winner["stats"])
+        self.logger.info(
+            f"Portfolio winner: {winner['strategy']} (makespan {max(r.end_time for r in winner['results'])}, "
+            f"status {self.last_status})"
+        )
+        return winner["results"]
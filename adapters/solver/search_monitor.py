@@ -0,0 +1,141 @@
+# adapters/solver/search_monitor.py
+
+import threading
+import time
+from typing import Callable, Optional
+from ortools.sat.python import cp_model
+
+class SearchMonitor(cp_model.CpSolverSolutionCallback):
+    """
+    CP-SAT her yeni çözüm bulduğunda çağrılan callback.
+    En iyi amaç değerini ve son iyileşme zamanını tutar; watchdog bunlara bakıp aramayı durdurabilir.
+    on_progress verilirse her iyileşen çözüm bir ilerleme olayı olarak (en fazla min_publish_interval'da bir) yayınlanır.
+    Yayınlama callback'in içinde değil watchdog thread'inde yapılır ki arama Redis/DB beklemesin.
+    Callback her iyileşmede sadece amaç/sınırı kaydeder. Plan (snapshot) değerleri sadece callback içinde
+    okunabildiği için yayın aralığı başına en fazla bir kez, kilit dışında kurulur; son plan aramadan sonra
+    çözücünün değerlerinden kurulur.
+    """
+    def __init__(
+        self,
+        no_improvement_window: Optional[float] = None,
+        on_progress: Optional[Callable[[dict], None]] = None,
+        stage: Optional[int] = None,
+        snapshot: Optional[Callable[["SearchMonitor"], list]] = None,
+        min_publish_interval: float = 1.0,
+        cancel_check: Optional[Callable[[], bool]] = None,
+    ):
+        super().__init__()
+        self.no_improvement_window = no_improvement_window
+        self.on_progress = on_progress
+        self.stage = stage
+        self.snapshot = snapshot  # Verilirse o anki planı da olaya ekler.
+        self.min_publish_interval = min_publish_interval
+        self.cancel_check = cancel_check  # True dönerse arama iptal edilir.
+        self.cancelled = False
+        self.best_objective: Optional[float] = None
+        self.solution_count = 0
+        self._last_improvement = time.monotonic()
+        self._last_publish = 0.0
+        self._last_capture = 0.0
+        self._pending: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def on_solution_callback(self) -> None:
+        objective = self.objective_value
+        capture = None
+        with self._lock:
+            self.solution_count += 1
+            if self.best_objective is None or objective < self.best_objective:
+                now = time.monotonic()
+                self.best_objective = objective
+                self._last_improvement = now
+                if self.on_progress is not None:
+                    self._pending = self._progress_event(objective)
+                    if self.snapshot is not None and now - self._last_capture >= self.min_publish_interval:
+                        self._last_capture = now
+                        capture = self._pending
+        if capture is not None:
+            plan = self.snapshot(self)
+            with self._lock:
+                if self._pending is capture:  # Bu arada daha iyisi geldiyse eski planı eklemeyelim.
+                    capture["plan"] = plan
+
+    def _progress_event(self, objective: float) -> dict:
+        bound = self.best_objective_bound
+        gap = abs(objective - bound) / max(1.0, abs(objective))
+        event = {
+            "type": "progress",
+            "stage": self.stage,
+            "objective": int(objective),
+            "bound": int(bound),
+            "gap": round(gap, 4),
+            "elapsed": round(self.wall_time, 3),
+            "solutions": self.solution_count,
+        }
+        return event
+
+    def _cancel_requested(self) -> bool:
+        try:
+            return bool(self.cancel_check())
+        except Exception:
+            # İptal bayrağı okunamıyorsa (Redis kapalı gibi) aramaya devam edelim.
+            return False
+
+    def flush(self, force: bool = False, values=None) -> None:
+        """
+        Bekleyen ilerleme olayını, throttle süresi dolduysa (ya da force ise) yayınlar. values (arama bitmiş
+        CpSolver) verilirse olayın planı en iyi çözümün değerlerinden yeniden kurulur.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._pending is None or (not force and now - self._last_publish < self.min_publish_interval):
+                return
+            event, self._pending = self._pending, None
+            self._last_publish = now
+        if values is not None and self.snapshot is not None:
+            event["plan"] = self.snapshot(values)
+        try:
+            self.on_progress(event)
+        except Exception:
+            # İlerleme yayınlanamadı diye çözümü bozmayalım.
+            pass
+
+    def should_stop(self) -> bool:
+        if self.cancel_check is not None and self._cancel_requested():
+            self.cancelled = True
+            return True
+        # İlk çözüm bulunmadan durdurmuyoruz, yoksa elimizde hiç plan kalmaz.
+        if self.no_improvement_window is None:
+            return False
+        with self._lock:
+            if self.best_objective is None:
+                return False
+            return time.monotonic() - self._last_improvement >= self.no_improvement_window
+
+def solve_with_monitor(
+    solver: cp_model.CpSolver,
+    model: cp_model.CpModel,
+    monitor: SearchMonitor,
+    poll_interval: float = 0.5,
+):
+    """
+    Modeli callback ile çözer. Arka planda bir watchdog thread'i monitor.should_stop()'a bakar
+    ve gerekirse aramayı durdurur. Durdurulan arama o ana kadarki en iyi çözümle döner.
+    """
+    done = threading.Event()
+
+    def watchdog():
+        while not done.wait(poll_interval):
+            monitor.flush()
+            if monitor.should_stop():
+                solver.stop_search()
+                return
+
+    thread = threading.Thread(target=watchdog, name="cpsat-watchdog", daemon=True)
+    thread.start()
+    try:
+        return solver.solve(model, monitor)
+    finally:
+        done.set()
+        thread.join()
+        monitor.flush(force=True, values=solver)
@@ -1,20 +1,359 @@
 # adapters/solver/solver_adapter
 
-import os
 from ortools.sat.python import cp_model
 from core.models.data_model import TaskInstanceDTO, PlanResultDTO
 from core.ports.logging_port import ILoggingPort
+from core.ports.solver_port import ISolverPort, SolveCancelled
 from config.machine_config_loader import MachineConfig
+from config.solver_profiles import SolverProfile, get_solver_profile
+from adapters.solver.machine_pools import group_identical_machines, assign_pool_machines
+from adapters.solver.search_monitor import SearchMonitor, solve_with_monitor
+from adapters.solver.lns import NEIGHBORHOODS as LNS_NEIGHBORHOODS, select_neighborhood
+from adapters.solver.list_scheduler import earliest_finish_schedule, phase_bounds
+from adapters.solver.symmetry import interchangeable_instance_groups, machine_value_precedence
+from adapters.solver.whatif_session import WhatIfSession
+from adapters.solver.parallel import make_executor
+from adapters.solver import decomposition
 from collections import defaultdict, Counter
+from dataclasses import asdict, dataclass, field, replace
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable
+import multiprocessing as mp
+import os
+import random
+import time
+
+LNS_MIN_TASKS = 150  # Bundan küçük modellerde Stage 1 zaten yeterince iyi; LNS'e gerek yok.
+LNS_MIN_NEIGHBORHOOD = 20
+LNS_ITERATION_SECONDS = 5.0  # Her alt problemin süre sınırı.
+DECOMPOSE_MIN_TASKS = 100  # Küçük problemlerde süreç açma maliyeti bölmenin kazancından fazla.
+
+def _fix_domain(model: cp_model.CpModel, var, value: int, upper: int | None = None) -> list:
+    """Değişkeni tek bir değere (upper verilirse [value, upper] aralığına) sabitler ve eski domain'ini döner."""
+    domain = model.proto.variables[var.index].domain
+    old = list(domain)
+    domain.clear()  # Yeni ortools'ta repeated alanlar slice atamasını desteklemiyor.
+    domain.extend([int(value), int(value if upper is None else upper)])
+    return old
 
-class ORToolsSolver:
-    def __init__(self, machine_config: MachineConfig, logger: ILoggingPort):
+def _restore_domain(model: cp_model.CpModel, index: int, domain: list) -> None:
+    target = model.proto.variables[index].domain
+    target.clear()
+    target.extend(domain)
+
+def _group_by_job(results: list[PlanResultDTO]) -> dict:
+    jobs = defaultdict(list)
+    for r in results:
+        jobs[r.job_id].append(r)
+    return jobs
+
+@dataclass
+class _CpModelBundle:
+    """
+    Kurulan CP-SAT modelini ve değişken sözlüklerini bir arada tutar.
+    Aşamalar, ipuçları ve callback'ler değişkenlere buradan ulaşır.
+    """
+    model: cp_model.CpModel
+    tasks: list
+    horizon: int
+    pools: dict
+    pooled: dict
+    pool_release: dict
+    task_resources: dict
+    start_vars: dict
+    end_vars: dict
+    interval_vars: dict
+    machine_assignments: dict
+    master_start: dict
+    master_dur: dict
+    master_end: dict
+    master_interval: dict
+    makespan: cp_model.IntVar = None
+    total_job_completion: cp_model.IntVar = None
+    job_final_ends: list = field(default_factory=list)
+    split_groups: list = field(default_factory=list)  # Başlangıca göre sıralanan eşdeğer split parçaları (id listeleri).
+    heuristic_plan: list = None  # Horizon'u veren liste çizelgesi; başka ipucu yoksa başlangıç çözümü olarak kullanılır.
+    symmetric_machines: set = field(default_factory=set)  # Havuza alınan ya da değer önceliği konan (eşdeğer) makineler.
+    locked_domains: dict = field(default_factory=dict)  # Kilitler uygulanmadan önceki domain'ler (what-if geri alma için).
+
+class ORToolsSolver(ISolverPort):
+    def __init__(
+        self,
+        machine_config: MachineConfig,
+        logger: ILoggingPort,
+        use_machine_pools: bool = True,
+        profile: SolverProfile | None = None,
+        progress_callback: Callable[[dict], None] | None = None,
+        publish_plan: bool = False,
+        cancel_check: Callable[[], bool] | None = None,
+        break_symmetry: bool = True,
+        heuristic_bounds: bool = True,
+        random_seed: int | None = None,
+        decompose: bool = True,
+        cores: int | None = None,
+        compact: bool = False,
+    ):
         self.config = machine_config
         self.logger = logger
+        # Pool modunda birbirinin aynısı olan makineler (örn. 20 adet kesme) tek bir kaynak sınıfı olarak modellenir.
+        self.use_machine_pools = use_machine_pools
+        # Split parçaları ve (havuz yoksa) aynı makineler arasındaki eşdeğer permütasyonları kısıtlarla eliyoruz.
+        self.break_symmetry = break_symmetry
+        # Model kurulmadan önce hızlı bir liste çizelgesi çıkarıp horizon'u onun makespan'iyle daraltıyoruz.
+        self.heuristic_bounds = heuristic_bounds
+        self.random_seed = random_seed  # Portföyde aynı modeli farklı seed'lerle çözmek için.
+        # Kompakt model: hayalet süre/aralık değişkenleri ve faz min/max değişkenleri olmadan, daha az değişken ve kısıt.
+        self.compact = compact
+        # Makine paylaşmayan job grupları ayrı modeller olarak paralel çözülür; çekirdekler bileşenlere bölünür.
+        self.decompose = decompose
+        self.cores = cores or os.cpu_count() or 1
+        # Süre bütçesi, thread sayısı, gap ve erken durdurma ayarları profilden gelir.
+        self.profile = profile or get_solver_profile(None)
+        self.last_status: str | None = None  # Son çözümün Stage 2 durumu (OPTIMAL / FEASIBLE).
+        # Son solve çağrısının aşama süreleri ve objective/bound değerleri (benchmark ve metrikler için).
+        self.last_run_stats: dict = {}
+        # Her iyileşen çözümde çağrılır (makespan, bound, gap, süre). publish_plan ise o anki plan da eklenir.
+        self.progress_callback = progress_callback
+        self.publish_plan = publish_plan
+        # True dönerse arama durdurulur ve o ana kadarki en iyi plan SolveCancelled ile geri verilir.
+        self.cancel_check = cancel_check
 
     # Eğer `locks` parametresi verilmezse (None gelirse yani), onu boş bir listeye çevirelim.
-    def solve(self, tasks: list[TaskInstanceDTO], locks: list | None = None) -> list[PlanResultDTO]:
+    # hint_plan: daha önceki bir run'ın planı; verilirse Stage 1 bu plandan ısınarak başlar.
+    def solve(
+        self,
+        tasks: list[TaskInstanceDTO],
+        locks: list | None = None,
+        hint_plan: list[PlanResultDTO] | None = None,
+    ) -> list[PlanResultDTO]:
         locks = locks or []
+        if self.decompose and len(tasks) >= DECOMPOSE_MIN_TASKS:
+            components = decomposition.independent_components(tasks, self.config)
+            if len(components) > 1:
+                return self._solve_decomposed(components, locks, hint_plan)
+
+        bundle = self._prepare(tasks, locks, hint_plan)
+        return self._run_stages(bundle)
+
+    def _prepare(
+        self,
+        tasks: list[TaskInstanceDTO],
+        locks: list,
+        hint_plan: list[PlanResultDTO] | None,
+    ) -> _CpModelBundle:
+        """Modeli kurar, ipuçlarını ekler ve last_run_stats'ı başlatır."""
+        build_start = time.perf_counter()
+        bundle = self._build_model(tasks, locks)
+
+        hinted = 0
+        if hint_plan:
+            hinted = self._add_plan_hints(bundle, hint_plan)
+            self.logger.info(f"Warm start: {hinted}/{len(tasks)} tasks hinted from previous plan.")
+        elif bundle.heuristic_plan:
+            hinted = self._add_plan_hints(bundle, bundle.heuristic_plan)
+        self.last_run_stats = {
+            "tasks": len(tasks),
+            "pools": len(bundle.pooled),
+            "horizon": bundle.horizon,
+            "hinted": hinted,
+            "heuristic_makespan": max((r.end_time for r in bundle.heuristic_plan), default=None) if bundle.heuristic_plan else None,
+            "build_seconds": time.perf_counter() - build_start,
+            "model_variables": len(bundle.model.proto.variables),
+            "model_constraints": len(bundle.model.proto.constraints),
+            "model_intervals": len(bundle.interval_vars) + len(bundle.master_interval),
+        }
+        return bundle
+
+    def solve_component(
+        self,
+        tasks: list[TaskInstanceDTO],
+        locks: list,
+        hint_plan: list[PlanResultDTO] | None,
+        agree_makespan: Callable[[int], int | None],
+        started_at: float,
+    ) -> list[PlanResultDTO]:
+        """
+        Bileşenlere bölünmüş çözümün bir bileşeni. Stage 1'den sonra makespan'ini agree_makespan'e verir; dönen global
+        makespan'i üst sınır alarak Stage 2'yi aynı model ve çözücüyle çözer. Bileşenin kendi makespan'i global
+        makespan'den küçükse bu pay ikincil amaç için kullanılabilir. started_at: turun başladığı an (time.time()).
+        """
+        bundle = self._prepare(tasks, locks, hint_plan)
+        solver, best_ms, best_solution, stage1_results, _ = self._run_stage1(bundle)
+        cap = agree_makespan(best_ms)
+        if cap is None:
+            self.logger.warning("Components did not reach the Stage 2 barrier, keeping the Stage 1 plan.")
+            return stage1_results
+        return self._run_stage2(bundle, solver, (0, cap), best_solution, stage1_results, time.time() - started_at)
+
+    def _solve_decomposed(
+        self,
+        components: list[list[TaskInstanceDTO]],
+        locks: list,
+        hint_plan: list[PlanResultDTO] | None,
+    ) -> list[PlanResultDTO]:
+        """
+        Bağımsız bileşenleri ayrı modeller olarak paralel çözer. Her bileşen Stage 1'den sonra bir bariyerde bekler;
+        global makespan bileşen makespan'lerinin en büyüğüdür. Sonra her bileşen Stage 2'yi aynı modelde bu global
+        makespan'i üst sınır alarak çözer; toplam job bitişi bileşenlerin toplamı olduğu için ayrı ayrı küçültmek
+        toplamı da küçültür.
+        """
+        tasks = [t for comp in components for t in comp]
+        workers = min(len(components), self.cores)
+        # Bariyer bütün bileşenlerin aynı anda koşmasını gerektirir; fazlası worker sayısına göre birleştirilir.
+        components = decomposition.merge_components(components, workers)
+        comp_locks = decomposition.split_locks(components, self.config, locks)
+        hint_by_tid = {int(r.task_instance_id): r for r in hint_plan or []}
+        comp_hints = [[hint_by_tid[t.id] for t in comp if t.id in hint_by_tid] or None for comp in components]
+        profile = replace(self.profile, num_workers=max(1, self.cores // workers))
+        self.logger.info(
+            f"Decomposition: {len(components)} independent components "
+            f"({', '.join(str(len(c)) for c in components)} tasks), {workers} parallel workers"
+        )
+
+        ctx = mp.get_context("spawn")
+        stop, barrier = ctx.Event(), ctx.Barrier(len(components))
+        makespans = ctx.Array("i", [-1] * len(components))
+        published = False
+
+        def on_poll() -> None:
+            nonlocal published
+            if not published and min(makespans[:]) >= 0:
+                published = True
+                global_ms = max(makespans[:])
+                self.logger.info(f"Decomposition Stage 1 | makespan: {global_ms}, time: {time.perf_counter() - round_start:.3f}s")
+                if self.progress_callback:
+                    self.progress_callback({"type": "progress", "stage": 1, "objective": global_ms})
+
+        started_at, round_start = time.time(), time.perf_counter()
+        with make_executor(workers, decomposition._init_shared, (stop, barrier, makespans)) as executor:
+            outcomes = self._run_component_round(executor, stop, [
+                (decomposition._solve_component, i, self.config, profile, comp, comp_locks[i], comp_hints[i], started_at)
+                for i, comp in enumerate(components)
+            ], on_poll)
+
+        failed = [o for o in outcomes if o["error"]]
+        if failed:
+            self.last_status = "INFEASIBLE"
+            raise RuntimeError(f"Component {failed[0]['index']} could not be solved: {failed[0]['error']}")
+        results = [r for o in outcomes for r in o["results"]]
+        if any(o["cancelled"] for o in outcomes):
+            self.last_status = "CANCELLED"
+            raise SolveCancelled(results if all(o["results"] for o in outcomes) else [])
+
+        stats = [o["stats"] for o in outcomes]
+        stage1_optimal = all(st.get("stage1_status") == "OPTIMAL" for st in stats)
+        stage2_optimal = all(st.get("stage2_status") == "OPTIMAL" for st in stats)
+        self.last_status = "OPTIMAL" if stage1_optimal and stage2_optimal else "FEASIBLE"
+        self.last_run_stats = {
+            "tasks": len(tasks),
+            "components": [len(c) for c in components],
+            "build_seconds": max(st.get("build_seconds", 0.0) for st in stats),
+            "stage1_seconds": max(st.get("stage1_seconds", 0.0) for st in stats),
+            "stage1_status": "OPTIMAL" if stage1_optimal else "FEASIBLE",
+            "stage1_makespan": max(st["stage1_makespan"] for st in stats),
+            "stage2_seconds": max(st.get("stage2_seconds", 0.0) for st in stats),
+            "stage2_status": self.last_status,
+            "stage2_fallback": any(st.get("stage2_fallback", False) for st in stats),
+            "total_seconds": time.perf_counter() - round_start,
+            "total_job_completion": sum(
+                max(r.end_time for r in job) for job in _group_by_job(results).values()
+            ),
+        }
+        return results
+
+    def _run_component_round(self, executor, stop, calls: list, on_poll: Callable[[], None] | None = None) -> list[dict]:
+        """Bileşen çağrılarını çalıştırır, iptali izler; sonuçları bileşen sırasıyla döner."""
+        pending = {executor.submit(*call) for call in calls}
+        outcomes = []
+        while pending:
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            outcomes.extend(f.result() for f in done)
+            if on_poll:
+                on_poll()
+            if not stop.is_set() and self.cancel_check and self.cancel_check():
+                stop.set()
+        return sorted(outcomes, key=lambda o: o["index"])
+
+    def open_session(self, tasks: list[TaskInstanceDTO], fingerprint: str, locks: list | None = None) -> WhatIfSession:
+        """
+        What-if oturumu için modeli normal yoldakiyle aynı seçeneklerle (havuz, simetri, sezgisel horizon) ve
+        verilen kilitlerle kurar. Sonraki kilitler domain sabitleme ile uygulanır; bu modelle uyumlu olmayan
+        kilitlerde (bkz. session_accepts) oturum yeniden kurulmalı.
+        """
+        build_start = time.perf_counter()
+        bundle = self._build_model(tasks, locks or [])
+        self.logger.info(f"What-if session built for {len(tasks)} tasks in {time.perf_counter() - build_start:.3f}s")
+        return WhatIfSession(fingerprint=fingerprint, bundle=bundle, locked_domains=bundle.locked_domains)
+
+    def session_accepts(self, session: WhatIfSession, locks: list | None) -> bool:
+        """
+        Oturum modeli bu kilitlerle yeniden kullanılabilir mi? Kilitli görev simetri grubunda olmamalı, kilidin
+        makinesi havuza ya da değer önceliğine girmemiş olmalı ve horizon sezgisel çizelgeyle daraltıldıysa yeni
+        kilitlerle de bir çizelge o horizon'a sığmalı. Makine blokları modele gömülü olduğu için kabul edilmez.
+        """
+        bundle = session.bundle
+        symmetric_ids = {tid for ids in bundle.split_groups for tid in ids}
+        for lk in locks or []:
+            if "task_instance_id" not in lk:
+                return False
+            tid = int(lk["task_instance_id"])
+            if tid not in bundle.task_resources:
+                continue
+            machine = str(lk["machine"])
+            if tid in symmetric_ids or machine in bundle.symmetric_machines or (tid, machine) not in bundle.machine_assignments:
+                return False
+        if bundle.heuristic_plan is not None:
+            plan = earliest_finish_schedule(bundle.tasks, self.config, locks or [])
+            if not plan or max(r.end_time for r in plan) > bundle.horizon:
+                return False
+        return True
+
+    def solve_session(
+        self,
+        session: WhatIfSession,
+        locks: list | None = None,
+        hint_plan: list[PlanResultDTO] | None = None,
+    ) -> list[PlanResultDTO]:
+        """
+        Oturumdaki modeli yeniden kurmadan çözer: önceki kilitler geri alınır, yenileri uygulanır,
+        önceki plan (hint_plan ya da oturumun son planı) ipucu olarak verilir.
+        """
+        bundle = session.bundle
+        model = bundle.model
+        for index, domain in session.locked_domains.items():
+            _restore_domain(model, index, domain)
+        session.locked_domains = {}
+        session.locked_domains = self._apply_task_locks(bundle, locks or [])
+
+        model.clear_hints()
+        previous = hint_plan or session.last_results
+        hinted = self._add_plan_hints(bundle, previous) if previous else 0
+        self.logger.info(
+            f"What-if re-solve: {len(session.locked_domains)} fixed variables, {hinted}/{len(bundle.tasks)} tasks hinted."
+        )
+        self.last_run_stats = {
+            "tasks": len(bundle.tasks),
+            "pools": len(bundle.pooled),
+            "horizon": bundle.horizon,
+            "hinted": hinted,
+            "build_seconds": 0.0,
+            "session_reused": True,
+        }
+        results = self._run_stages(bundle)
+        session.last_results = results
+        return results
+
+    def _build_model(
+        self,
+        tasks: list[TaskInstanceDTO],
+        locks: list,
+        use_pools: bool | None = None,
+        break_symmetry: bool | None = None,
+        heuristic_bounds: bool | None = None,
+        compact: bool | None = None,
+    ) -> _CpModelBundle:
+        """Görevlerden ve kilitlerden CP-SAT modelini kurar."""
+        compact = self.compact if compact is None else compact
         # Boş bir oda yaratalım. Tüm problemimizi bu model nesnesinin üzerine çizeceğiz.
         model = cp_model.CpModel()
 
@@ -23,20 +362,47 @@ class ORToolsSolver:
         # Her task için en büyük uygun süreyi alıp topluyoruz, %50 pay koyup horizon belirliyoruz.
         max_duration_sum = 0
         for task in tasks:
-            durations = [
-                self.config.get_duration(task.base_name, m)
-                for m in task.machine_candidates
-                if self.config.get_duration(task.base_name, m) > 0
-            ]
+            row = self.config.durations_for(task.base_name)
+            durations = [row[m] for m in task.machine_candidates if m in row]
             if durations:
                 max_duration_sum += max(durations)
-        horizon = int(max_duration_sum * 1.5)
+        # task_instance_id'si olmayan kilitler makine bloklarıdır: makine [start_min, end_min) aralığında dolu.
+        # Rolling horizon önceki pencerelerin planını bu şekilde donduruyor.
+        machine_blocks = [l for l in locks if "task_instance_id" not in l]
+        horizon = int(max_duration_sum * 1.5) + max((int(b["end_min"]) for b in machine_blocks), default=0)
+
+        # Kilitlerle uyumlu bir liste çizelgesi bulunursa onun makespan'i geçerli bir üst sınır: horizon bu olur.
+        heuristic_plan = None
+        if self.heuristic_bounds if heuristic_bounds is None else heuristic_bounds:
+            heuristic_plan = earliest_finish_schedule(tasks, self.config, locks)
+            if heuristic_plan:
+                heuristic_ms = max(r.end_time for r in heuristic_plan)
+                self.logger.info(f"Heuristic schedule: makespan {heuristic_ms} (loose horizon was {horizon})")
+                horizon = min(horizon, heuristic_ms)
+        # Faz zincirinden görev başına en erken başlangıç ve bitişten sonra en az kalan süre (kuyruk).
+        earliest, tail = phase_bounds(tasks, self.config)
+
+        # Kilitlerde geçen makineler somut kalmalı, onları havuza almıyoruz.
+        # Sadece 0'dan başlayan bloklar (makinenin serbest kalma zamanı) havuz içinde kalabilir, renklendirme bunu bozmaz.
+        locked_machines = {str(l["machine"]) for l in locks if "task_instance_id" in l}
+        locked_machines |= {str(b["machine"]) for b in machine_blocks if int(b["start_min"]) > 0}
+        use_pools = self.use_machine_pools if use_pools is None else use_pools
+        if use_pools:
+            pools = group_identical_machines(tasks, self.config, excluded=locked_machines)
+        else:
+            pools = {}
+        pooled = {p.name: p for p in pools.values() if p.is_pooled}
+        if pooled:
+            self.logger.info(
+                "Machine pools: " + ", ".join(f"{name} (capacity={p.capacity})" for name, p in pooled.items())
+            )
 
         start_vars = {}
         end_vars = {}
         interval_vars = {}
         machine_assignments = {}
         machine_to_tasks = {}
+        task_resources = {}
         master_start = {}
         master_dur = {}
         master_end = {}
@@ -52,9 +418,10 @@ class ORToolsSolver:
             self.logger.info(f"Task: {task.name} ({task.id})")
             durations_map = {}
             # Bu görevin gidebileceği her bir makinedeki süresini bir sözlükte toplayalım.
+            row = self.config.durations_for(task.base_name)
             for machine in task.machine_candidates:
-                d = self.config.get_duration(task.base_name, machine)
-                if d and d > 0:
+                d = row.get(machine)
+                if d:
                     durations_map[machine] = d
                 else:
                     self.logger.error(f"{machine}'s duration is not found or zero for task {task.name}.")
@@ -62,26 +429,38 @@ class ORToolsSolver:
             if not durations_map: # Eğer bir görev hiçbir makinede çalışamıyorsa, bu problem çözülemez.
                 raise ValueError(f"No valid machine durations for task {task.name} ({task.id})")
 
+            # Pool modunda aynı havuzdaki makineler tek bir kaynak gibi davranır; o yüzden her havuz için tek beden yeterli.
+            resource_durations = {}
+            for machine, duration in durations_map.items():
+                resource = pools[machine].name if machine in pools else machine
+                resource_durations.setdefault(resource, duration)
+            task_resources[task.id] = list(resource_durations.keys())
+
             # İleriye Not 2: Bir görevi, bir hayalet gibi düşün. Bu hayaletin bir başlangıcı, bir bitişi ve bir süresi var. Ama nerede olduğu belli değil. İşte bu master değişkenler, bu soyut, makineden bağımsız hayalet görevi temsil eder.
             min_d = min(durations_map.values())
             max_d = max(durations_map.values())
-            ms = model.new_int_var(0, horizon, f"tstart_{task.id}")
-            md = model.new_int_var(min_d, max_d, f"tdur_{task.id}")
-            me = model.new_int_var(0, horizon, f"tend_{task.id}")
-            mi = model.new_interval_var(ms, md, me, f"tiv_{task.id}") # Bu üçünü birleştirir ve ms + md = me kuralını koyar.
-
-            # # Bu hayalet değişkenleri, ID'leriyle birlikte sözlüklere koyalım.
-            master_start[task.id] = ms
-            master_dur[task.id]   = md
-            master_end[task.id]   = me
-            master_interval[task.id] = mi
-
-            # Şimdi her bir makine için bir beden yaratıyoruz. Bu görev, K#1 makinesine girerse ne olur? K#2'ye girerse ne olur? Her bir olasılık, bir opsiyonel bedendir.
+            es, latest_end = earliest[task.id], horizon - tail[task.id]
+            # Kompakt modelde tek kaynaklı görevin hayaleti kendi bedenidir (aşağıda); çok kaynaklıda süre ve aralık yok,
+            # çünkü seçilen bedenle eşitlenen başlangıç/bitiş süreyi zaten belirliyor.
+            if not (compact and len(resource_durations) == 1):
+                ms = model.new_int_var(es, max(es, latest_end - min_d), f"tstart_{task.id}")
+                me = model.new_int_var(es + min_d, max(es + min_d, latest_end), f"tend_{task.id}")
+                master_start[task.id] = ms
+                master_end[task.id]   = me
+                if not compact:
+                    md = model.new_int_var(min_d, max_d, f"tdur_{task.id}")
+                    mi = model.new_interval_var(ms, md, me, f"tiv_{task.id}") # Bu üçünü birleştirir ve ms + md = me kuralını koyar.
+                    # # Bu hayalet değişkenleri, ID'leriyle birlikte sözlüklere koyalım.
+                    master_dur[task.id]   = md
+                    master_interval[task.id] = mi
+
+            # Şimdi her bir makine (ya da havuz) için bir beden yaratıyoruz. Bu görev, K#1 makinesine girerse ne olur? K#2'ye girerse ne olur? Her bir olasılık, bir opsiyonel bedendir.
             assign_literals = [] # # Her bedenin bir karar düğümü olacak. Bu liste o düğümleri tutar.
-            for machine, duration in durations_map.items():
+            for machine, duration in resource_durations.items():
                 suffix = f"_{task.id}_{machine}"
-                start = model.new_int_var(0, horizon, f"start{suffix}") # # Her bir makine için ayrı bir başlangıç, bitiş ve görev aralığı değişkeni yaratalım.
-                end   = model.new_int_var(0, horizon, f"end{suffix}")
+                # Her bir makine için ayrı bir başlangıç, bitiş ve görev aralığı değişkeni yaratalım; sınırlar faz zincirinden.
+                start = model.new_int_var(es, max(es, latest_end - duration), f"start{suffix}")
+                end   = model.new_int_var(es + duration, max(es + duration, latest_end), f"end{suffix}")
                 is_assigned = model.new_bool_var(f"assign{suffix}") # İşte bu, o karar düğümü. True ya da False.
                 interval = model.new_optional_interval_var(start, duration, end, is_assigned, f"interval{suffix}") # Bu görev aralığı, SADECE is_assigned True ise var olur.
 
@@ -96,16 +475,48 @@ class ORToolsSolver:
                 machine_to_tasks.setdefault(machine, []).append(interval)
 
                 # Çözücüye diyoruz ki: "Eğer bir bedeni seçersen (is_assigned True olursa),o bedenin başlangıcı, bitişi ve süresi, o soyut hayaletin başlangıcı, bitişi ve süresine eşit OLMALIDIR."
+                if task.id not in master_start:
+                    master_start[task.id] = start
+                    master_end[task.id]   = end
+                    continue
                 model.add(start == ms).only_enforce_if(is_assigned)
                 model.add(end   == me).only_enforce_if(is_assigned)
-                model.add(md    == duration).only_enforce_if(is_assigned)
+                if not compact:
+                    model.add(md    == duration).only_enforce_if(is_assigned)
 
             # Kısıt: Her görev için yaratılan tüm bu bedenlerden SADECE BİR TANESİNİ seçebilirsin.
             model.add_exactly_one(assign_literals)
 
+        # Makine blokları sabit aralıklar olarak ilgili makinenin (ya da havuzun) listesine girer.
+        pool_release = defaultdict(dict)  # havuz adı -> {makine: serbest kalma zamanı}
+        for b in machine_blocks:
+            machine = str(b["machine"])
+            resource = pools[machine].name if machine in pools else machine
+            if resource not in machine_to_tasks:
+                continue  # Bu makineyi kullanabilecek görev yoksa bloğun bir etkisi yok.
+            b_start, b_end = int(b["start_min"]), int(b["end_min"])
+            if b_end <= b_start:
+                continue
+            block = model.new_fixed_size_interval_var(b_start, b_end - b_start, f"block_{machine}_{b_start}")
+            machine_to_tasks[resource].append(block)
+            if resource in pooled:
+                pool_release[resource][machine] = max(pool_release[resource].get(machine, 0), b_end)
+
         # Kısıt 1: Bir makinede, aynı anda sadece bir beden olabilir (NoOverlap).
+        # Havuzlarda ise aynı anda en fazla kapasite kadar beden olabilir (Cumulative). Somut makine sonradan atanır.
         for machine, intervals in machine_to_tasks.items():
-            model.add_no_overlap(intervals)
+            if machine in pooled:
+                model.add_cumulative(intervals, [1] * len(intervals), pooled[machine].capacity)
+            else:
+                model.add_no_overlap(intervals)
+
+        split_groups = []
+        symmetric_machines = {m for m, p in pools.items() if p.is_pooled}
+        if self.break_symmetry if break_symmetry is None else break_symmetry:
+            split_groups, ordered_machines = self._add_symmetry_breaking(
+                model, tasks, locks, machine_blocks, use_pools, master_start, machine_assignments,
+            )
+            symmetric_machines |= ordered_machines
 
         # Kısıt 2: Bir işin görevleri doğru sırada yapılmalıdır (Precedence). Hatta inter-precedence da baktık sonra, deftere bak.
         # Görevleri önce job'a, sonra order'a göre grupluyoruz.
@@ -121,6 +532,19 @@ class ORToolsSolver:
                 next_tasks    = order_map[orders[i + 1]]
                 current_ends  = [master_end[t.id] for t in current_tasks]
                 next_starts   = [master_start[t.id] for t in next_tasks]
+                if compact:
+                    # min/max değişkenleri yerine doğrudan bitiş <= başlangıç; çok parçalı fazlarda tek bir bariyer daha az kısıt.
+                    if len(current_ends) * len(next_starts) <= len(current_ends) + len(next_starts):
+                        for e in current_ends:
+                            for st in next_starts:
+                                model.add(e <= st)
+                    else:
+                        barrier = model.new_int_var(0, horizon, f"phase{job_id}_{orders[i]}_barrier")
+                        for e in current_ends:
+                            model.add(e <= barrier)
+                        for st in next_starts:
+                            model.add(barrier <= st)
+                    continue
                 phase_end   = model.new_int_var(0, horizon, f"phase{job_id}_{orders[i]}_end")
                 phase_start = model.new_int_var(0, horizon, f"phase{job_id}_{orders[i+1]}_start")
                 model.add_max_equality(phase_end, current_ends)
@@ -148,76 +572,209 @@ class ORToolsSolver:
         total_job_completion = model.new_int_var(0, horizon * max(1, len(job_final_ends)), "total_job_completion")
         model.add(total_job_completion == sum(job_final_ends))
 
-        if locks:
-            # Eğer kullanıcı belirli görevleri kilitlemek istiyorsa...
-            lock_by_tid = { int(l["task_instance_id"]): l for l in locks if "task_instance_id" in l }
-            for t in tasks:
-                if t.id in lock_by_tid:
-                    # O görevin sadece kilitlenen makineye atanmasını (lit = 1) ve diğerlerine atanmamasını (lit = 0) zorunlu kıl.
-                    # Ve o görevin hayaletinin başlangıç zamanını sabit bir değere eşitle.
-                    lk = lock_by_tid[t.id]
-                    m  = str(lk["machine"])
-                    s  = int(lk["start_min"])
-                    if (t.id, m) not in machine_assignments:
-                        raise ValueError(f"Lock refers to invalid machine '{m}' for task {t.id}")
-                    for mc in t.machine_candidates:
-                        if (t.id, mc) not in machine_assignments:
-                            continue
-                        lit = machine_assignments[(t.id, mc)]
-                        if mc == m:
-                            model.add(lit == 1)
-                        else:
-                            model.add(lit == 0)
-                    model.add(master_start[t.id] == s)
+        bundle = _CpModelBundle(
+            model=model, tasks=tasks, horizon=horizon,
+            pools=pools, pooled=pooled, pool_release=pool_release,
+            task_resources=task_resources,
+            start_vars=start_vars, end_vars=end_vars, interval_vars=interval_vars,
+            machine_assignments=machine_assignments,
+            master_start=master_start, master_dur=master_dur, master_end=master_end, master_interval=master_interval,
+            makespan=makespan, total_job_completion=total_job_completion, job_final_ends=job_final_ends,
+            split_groups=split_groups, heuristic_plan=heuristic_plan, symmetric_machines=symmetric_machines,
+        )
+        # Eğer kullanıcı belirli görevleri kilitlemek istiyorsa...
+        bundle.locked_domains = self._apply_task_locks(bundle, locks)
+        return bundle
 
-        # Aşama 1: Sadece makespan'i minimize et.
-        self.logger.info("Solver starting... (Stage 1: minimize makespan)")
+    def _add_symmetry_breaking(self, model, tasks, locks, machine_blocks, use_pools, master_start, machine_assignments) -> tuple:
+        """
+        Eşdeğer split parçalarını başlangıca göre sıralar; havuz yoksa aynı makinelere değer önceliği koyar.
+        (split grupları, değer önceliği konan makineler) döner.
+        """
+        locked_ids = {int(l["task_instance_id"]) for l in locks if "task_instance_id" in l}
+        groups = interchangeable_instance_groups(tasks, excluded_ids=locked_ids)
+        for ids in groups:
+            for a, b in zip(ids, ids[1:]):
+                model.add(master_start[a] <= master_start[b])
+
+        forbidden = []
+        ordered_machines = set()
+        if not use_pools:
+            # Blok ya da kilit geçen makineler artık diğerleriyle eşdeğer değil.
+            excluded = {str(l["machine"]) for l in locks if "task_instance_id" in l}
+            excluded |= {str(b["machine"]) for b in machine_blocks}
+            identical = group_identical_machines(tasks, self.config, excluded=excluded)
+            task_resources = defaultdict(list)
+            for tid, machine in machine_assignments:
+                task_resources[tid].append(machine)
+            forbidden = machine_value_precedence(task_resources, identical)
+            ordered_machines = {m for m, p in identical.items() if p.is_pooled}
+            for key in forbidden:
+                model.add(machine_assignments[key] == 0)
+        if groups or forbidden:
+            self.logger.info(
+                f"Symmetry breaking: {len(groups)} split groups, {len(forbidden)} machine assignments pruned."
+            )
+        return groups, ordered_machines
+
+    @staticmethod
+    def _apply_task_locks(bundle: _CpModelBundle, locks: list) -> dict:
+        """
+        Görev kilitlerini değişken domain'lerini sabitleyerek uygular: görev sadece kilitli makineye atanır (lit = 1,
+        diğerleri 0) ve hayaletin başlangıcı sabit değere eşitlenir. Kısıt eklemediği için geri alınabilir;
+        değişen değişkenlerin eski domain'lerini döner (what-if oturumları bununla kilitleri geri alıyor).
+        """
+        # Önce hepsini doğrulayalım ki hatalı bir kilit modeli yarı sabitlenmiş bırakmasın.
+        pinned = []
+        for lk in locks or []:
+            if "task_instance_id" not in lk:
+                continue  # Makine blokları model kurulurken işleniyor.
+            tid = int(lk["task_instance_id"])
+            if tid not in bundle.task_resources:
+                continue
+            m = str(lk["machine"])
+            if (tid, m) not in bundle.machine_assignments:
+                raise ValueError(f"Lock refers to invalid machine '{m}' for task {tid}")
+            pinned.append((tid, m, int(lk["start_min"])))
+
+        saved = {}
+        for tid, m, s in pinned:
+            for mc in bundle.task_resources[tid]:
+                lit = bundle.machine_assignments[(tid, mc)]
+                saved.setdefault(lit.index, _fix_domain(bundle.model, lit, 1 if mc == m else 0))
+            start = bundle.master_start[tid]
+            saved.setdefault(start.index, _fix_domain(bundle.model, start, s))
+        return saved
+
+    def _run_stages(self, bundle: _CpModelBundle) -> list[PlanResultDTO]:
+        """İki aşamalı çözümü çalıştırır ve planı döner."""
+        solver, best_ms, best_solution, stage1_results, elapsed = self._run_stage1(bundle)
+        return self._run_stage2(bundle, solver, (best_ms, best_ms), best_solution, stage1_results, elapsed)
+
+    def _new_cp_solver(self, time_limit: float) -> cp_model.CpSolver:
+        profile = self.profile
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 60.0
+        solver.parameters.max_time_in_seconds = time_limit
+        solver.parameters.num_workers = profile.workers()
+        solver.parameters.relative_gap_limit = profile.relative_gap_limit
         solver.parameters.log_search_progress = False
         solver.parameters.log_to_stdout = False
-        # solver.parameters.num_search_workers = os.cpu_count() or 4
+        if self.random_seed is not None:
+            solver.parameters.random_seed = int(self.random_seed)
+        return solver
+
+    def _run_stage1(self, bundle: _CpModelBundle):
+        """
+        Aşama 1 (ve gerekirse LNS): makespan'i minimize eder.
+        (solver, en iyi makespan, çözüm vektörü, plan, geçen süre) döner.
+        """
+        model, tasks = bundle.model, bundle.tasks
+        makespan = bundle.makespan
+
+        # Aşama 1: Sadece makespan'i minimize et.
+        profile = self.profile
+        self.logger.info(
+            f"Solver starting... (Stage 1: minimize makespan) profile={profile.name}, "
+            f"budget={profile.time_budget:.0f}s, workers={profile.workers()}"
+        )
+        solver = self._new_cp_solver(profile.stage1_limit())
 
         model.minimize(makespan)
-        status1 = solver.solve(model)
+        monitor1 = self._new_monitor(bundle, stage=1)
+        status1 = solve_with_monitor(solver, model, monitor1)
+        if monitor1.cancelled:
+            self.last_status = "CANCELLED"
+            found = status1 in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+            self.logger.warning(f"Solve cancelled in Stage 1 ({'with' if found else 'without'} incumbent).")
+            raise SolveCancelled(self._collect_results(bundle, solver) if found else [])
         if status1 not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             self.logger.warning("No feasible solution found in Stage 1.")
             raise RuntimeError("No feasible solution found (Stage 1).")
 
         # Bulunan en iyi makespan değerini bir kenara yaz.
         best_ms = solver.value(makespan)
-        self.logger.info(f"Stage 1 | makespan: {best_ms}, status: {solver.StatusName(status1)}, time: {solver.WallTime():.3f}s")
+        stage1_time = solver.WallTime()
+        self.last_status = solver.StatusName(status1)
+        self.last_run_stats.update({
+            "stage1_seconds": stage1_time,
+            "stage1_status": solver.StatusName(status1),
+            "stage1_makespan": best_ms,
+            "stage1_bound": int(solver.best_objective_bound),
+            **self._response_stats(solver, "stage1"),
+        })
+        self.logger.info(f"Stage 1 | makespan: {best_ms}, status: {solver.StatusName(status1)}, time: {stage1_time:.3f}s")
+        stage1_results = self._collect_results(bundle, solver)  # Stage 2 iptal edilirse elimizde kalacak plan.
+        best_solution = list(solver.response_proto.solution)
+
+        # Büyük modellerde Stage 1 zayıf bir çözümde takılabiliyor; kalan payla küçük alt problemler çözerek iyileştirelim.
+        elapsed = stage1_time
+        if status1 != cp_model.OPTIMAL and profile.lns_limit() > 0 and len(tasks) >= LNS_MIN_TASKS:
+            best_ms, best_solution, lns_results, lns_time = self._run_lns(bundle, solver, best_ms, profile.lns_limit())
+            elapsed += lns_time
+            if lns_results is not None:
+                stage1_results = lns_results
+        return solver, best_ms, best_solution, stage1_results, elapsed
+
+    def _run_stage2(
+        self,
+        bundle: _CpModelBundle,
+        solver: cp_model.CpSolver,
+        makespan_range: tuple,
+        best_solution: list | None,
+        stage1_results: list[PlanResultDTO],
+        elapsed: float,
+    ) -> list[PlanResultDTO]:
+        """
+        Aşama 2: makespan [alt, üst] aralığında tutulurken toplam job bitişini minimize eder.
+        Tek modelde aralık tek değerdir (Stage 1'in makespan'i); bileşenlere bölünmüş çözümde üst sınır global makespan'dir.
+        """
+        model, tasks = bundle.model, bundle.tasks
+        makespan, total_job_completion = bundle.makespan, bundle.total_job_completion
+        profile = self.profile
+        low, high = makespan_range
 
         # Aşama 2: Makespan'i sabitle, şimdi ikincil hedefi minimize et.
-        self.logger.info("Solver starting... (Stage 2: minimize total_job_completion with fixed makespan)")
-        model.add(makespan == best_ms)
+        self.logger.info(
+            "Solver starting... (Stage 2: minimize total_job_completion with "
+            + ("fixed makespan)" if low == high else f"makespan <= {high})")
+        )
+        # makespan == best_ms kısıtı yerine domain'i sabitliyoruz; aşama bitince geri alınır ki model tekrar kullanılabilsin.
+        makespan_domain = _fix_domain(model, makespan, low, high)
         model.minimize(total_job_completion)
-        status2 = solver.solve(model)
+        # Stage 1'in bulduğu çözüm Stage 2 için de geçerli; sıfırdan aramak yerine onu ipucu olarak veriyoruz.
+        if best_solution is not None:
+            self._hint_from_solution(model, best_solution)
+            # Yeni amaçla presolve'un dual indirgemeleri ipucu çözümünü eleyebiliyor (CP-SAT "hint infeasible, repair"
+            # deyip Stage 2'yi UNKNOWN bitiriyor); ipucunun geçerli kalması için bu indirgemeleri kapatıyoruz.
+            solver.parameters.keep_all_feasible_solutions_in_presolve = True
+        solver.parameters.max_time_in_seconds = profile.stage2_limit(elapsed)
+        monitor2 = self._new_monitor(bundle, stage=2)
+        try:
+            status2 = solve_with_monitor(solver, model, monitor2)
+        finally:
+            _restore_domain(model, makespan.index, makespan_domain)
+        self.last_status = solver.StatusName(status2)
+        self.last_run_stats.update({
+            "stage2_seconds": solver.WallTime(),
+            "stage2_status": self.last_status,
+            **self._response_stats(solver, "stage2"),
+        })
+        if status2 in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            self.last_run_stats["total_job_completion"] = int(solver.objective_value)
+        if monitor2.cancelled:
+            self.last_status = "CANCELLED"
+            self.logger.warning("Solve cancelled in Stage 2, returning best incumbent.")
+            if status2 in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                raise SolveCancelled(self._collect_results(bundle, solver))
+            raise SolveCancelled(stage1_results)
 
         # Burası zaten dökümantasyondan. Deftere bakılabilir ilk günlere.
         results = []
         self.logger.info(f"Solver Status (Stage 2): {solver.StatusName(status2)}")
         if status2 in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            assignment_counter = Counter()
-            assigned_task_ids = set()
-            for task in tasks:
-                for machine in task.machine_candidates:
-                    key = (task.id, machine)
-                    if key in machine_assignments and solver.boolean_value(machine_assignments[key]):
-                        start = solver.value(start_vars[key])
-                        end   = solver.value(end_vars[key])
-                        results.append(PlanResultDTO(
-                            task_instance_id=task.id,
-                            job_id=task.job_id,
-                            task_name=task.name,
-                            assigned_machine=machine,
-                            start_time=start,
-                            end_time=end,
-                            package_uid=task.package_uid,
-                        ))
-                        assignment_counter[machine] += 1
-                        assigned_task_ids.add(task.id)
-                        break
+            results = self._collect_results(bundle, solver)
+            assignment_counter = Counter(r.assigned_machine for r in results)
+            assigned_task_ids = {r.task_instance_id for r in results}
             unassigned_ids = {t.id for t in tasks} - assigned_task_ids
             if unassigned_ids:
                 self.logger.error(f"{len(unassigned_ids)} task did not assigned: {sorted(unassigned_ids)}")
@@ -225,8 +782,213 @@ class ORToolsSolver:
             for machine, count in assignment_counter.items():
                 self.logger.debug(f"{machine}: {count} task")
             self.logger.debug(f"All tasks count: {len(tasks)} / Assigned: {len(results)}")
+        elif stage1_results:
+            # Stage 2 süresi ipucu kabul edilmeden dolabilir; Stage 1 planı zaten geçerli, run'ı düşürmeyelim.
+            self.logger.warning(
+                f"No feasible solution found in Stage 2 ({self.last_status}); returning the Stage 1 plan."
+            )
+            self.last_status = self.last_run_stats.get("stage1_status") or "FEASIBLE"
+            self.last_run_stats["stage2_fallback"] = True
+            results = stage1_results
         else:
             self.logger.warning("No feasible solution found in Stage 2.")
             raise RuntimeError("No feasible solution found (Stage 2).")
 
         return results
+
+    @staticmethod
+    def _response_stats(solver: cp_model.CpSolver, stage: str) -> dict:
+        """CP-SAT yanıtının arama istatistikleri: CPU süresi, dal ve çakışma sayıları, bound ve gap."""
+        response = solver.response_proto
+        objective, bound = response.objective_value, response.best_objective_bound
+        return {
+            f"{stage}_cpu_seconds": response.user_time,
+            f"{stage}_branches": response.num_branches,
+            f"{stage}_conflicts": response.num_conflicts,
+            f"{stage}_objective": objective,
+            f"{stage}_best_bound": bound,
+            f"{stage}_gap": (objective - bound) / abs(objective) if objective else 0.0,
+        }
+
+    def _incumbent(self, bundle: _CpModelBundle, values) -> dict:
+        """Çözümden görev başına (kaynak, başlangıç, bitiş); kaynak havuz adı olabilir."""
+        incumbent = {}
+        for task in bundle.tasks:
+            for resource in bundle.task_resources[task.id]:
+                key = (task.id, resource)
+                if values.boolean_value(bundle.machine_assignments[key]):
+                    incumbent[task.id] = (resource, values.value(bundle.start_vars[key]), values.value(bundle.end_vars[key]))
+                    break
+        return incumbent
+
+    def _run_lns(self, bundle: _CpModelBundle, stage1_solver: cp_model.CpSolver, best_ms: int, budget: float):
+        """
+        Large Neighborhood Search: her turda planın çoğunu (serbest bırakılanlar dışındaki görevlerin kaynağı ve başlangıcı)
+        domain sabitleyerek dondurur, kalan küçük kısmı kısa süreli çözer. Aynı model tekrar kullanılır, bellekte sadece
+        en iyi çözüm vektörü tutulur. (best_ms, çözüm vektörü, iyileşen plan ya da None, geçen süre) döner.
+        """
+        model = bundle.model
+        rng = random.Random(self.random_seed or 0)
+        incumbent = self._incumbent(bundle, stage1_solver)
+        best_solution = list(stage1_solver.response_proto.solution)
+        best_results = None
+        size = max(LNS_MIN_NEIGHBORHOOD, len(bundle.tasks) // 10)
+        started = time.perf_counter()
+        iterations = improvements = 0
+        self.logger.info(f"LNS starting: budget {budget:.1f}s, neighborhood size {size}")
+        while True:
+            remaining = budget - (time.perf_counter() - started)
+            if remaining < 0.5 or (self.cancel_check and self.cancel_check()):
+                break
+            kind = LNS_NEIGHBORHOODS[iterations % len(LNS_NEIGHBORHOODS)]
+            freed = select_neighborhood(kind, bundle.tasks, incumbent, size, rng)
+            iterations += 1
+
+            saved = {}
+            for task in bundle.tasks:
+                if task.id in freed:
+                    continue
+                resource, start, _ = incumbent[task.id]
+                for res in bundle.task_resources[task.id]:
+                    lit = bundle.machine_assignments[(task.id, res)]
+                    saved.setdefault(lit.index, _fix_domain(model, lit, 1 if res == resource else 0))
+                saved.setdefault(bundle.master_start[task.id].index, _fix_domain(model, bundle.master_start[task.id], start))
+            self._hint_from_solution(model, best_solution)
+            sub = cp_model.CpSolver()
+            sub.parameters.max_time_in_seconds = min(LNS_ITERATION_SECONDS, remaining)
+            sub.parameters.num_workers = self.profile.workers()
+            sub.parameters.log_search_progress = False
+            sub.parameters.random_seed = rng.randint(0, 2 ** 31 - 1)
+            try:
+                status = sub.solve(model)
+            finally:
+                for index, domain in saved.items():
+                    _restore_domain(model, index, domain)
+
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                size = max(LNS_MIN_NEIGHBORHOOD, int(size * 0.8))  # Çok büyük komşuluk, küçültelim.
+                continue
+            new_ms = sub.value(bundle.makespan)
+            if status == cp_model.OPTIMAL:
+                size = min(len(bundle.tasks), int(size * 1.2) + 1)  # Alt problem kolaymış, büyütelim.
+            if new_ms > best_ms:
+                continue
+            # Eşit makespan'i de kabul ediyoruz; plan değişince sonraki komşuluklar farklı fırsatlar görür.
+            incumbent = self._incumbent(bundle, sub)
+            best_solution = list(sub.response_proto.solution)
+            if new_ms < best_ms:
+                improvements += 1
+                best_ms = new_ms
+                best_results = self._collect_results(bundle, sub)
+                self.logger.info(f"LNS | {kind}: makespan improved to {best_ms}")
+                if self.progress_callback is not None:
+                    event = {"type": "progress", "stage": 1, "objective": best_ms, "lns": True,
+                             "elapsed": round(time.perf_counter() - started, 2)}
+                    try:
+                        self.progress_callback(event)
+                    except Exception:
+                        pass  # İlerleme yayını çözümü bozmamalı.
+        elapsed = time.perf_counter() - started
+        self.last_run_stats.update({
+            "lns_seconds": elapsed, "lns_iterations": iterations, "lns_improvements": improvements, "lns_makespan": best_ms,
+        })
+        self.logger.info(f"LNS finished: {iterations} iterations, {improvements} improvements, makespan {best_ms}")
+        return best_ms, best_solution, best_results, elapsed
+
+    def _new_monitor(self, bundle: _CpModelBundle, stage: int) -> SearchMonitor:
+        snapshot = None
+        if self.progress_callback is not None and self.publish_plan:
+            snapshot = lambda cb: [asdict(r) for r in self._collect_results(bundle, cb)]
+        return SearchMonitor(
+            no_improvement_window=self.profile.no_improvement_window,
+            on_progress=self.progress_callback,
+            stage=stage,
+            snapshot=snapshot,
+            cancel_check=self.cancel_check,
+        )
+
+    @staticmethod
+    def _hint_from_solution(model: cp_model.CpModel, solution) -> None:
+        """Bir çözümdeki (response_proto.solution) tüm değişken değerlerini modele ipucu olarak yazar."""
+        model.clear_hints()
+        model.proto.solution_hint.vars.extend(range(len(solution)))
+        model.proto.solution_hint.values.extend(solution)
+
+    def _collect_results(self, bundle: _CpModelBundle, values) -> list[PlanResultDTO]:
+        """
+        Çözümden planı çıkarır. values, CpSolver ya da çözüm callback'i olabilir (ikisinde de value/boolean_value var).
+        """
+        pooled = bundle.pooled
+        pool_members = defaultdict(list)  # havuz adı -> [(task_id, start, end)]
+        chosen = []
+        for task in bundle.tasks:
+            for resource in bundle.task_resources[task.id]:
+                key = (task.id, resource)
+                if values.boolean_value(bundle.machine_assignments[key]):
+                    start = values.value(bundle.start_vars[key])
+                    end   = values.value(bundle.end_vars[key])
+                    chosen.append((task, resource, start, end))
+                    if resource in pooled:
+                        pool_members[resource].append((task.id, start, end))
+                    break
+
+        # Havuzlara düşen görevlere somut makine numaralarını dağıtalım.
+        pool_assignment = {}
+        for name, members in pool_members.items():
+            pool_assignment.update(assign_pool_machines(pooled[name], members, release=bundle.pool_release.get(name)))
+
+        results = []
+        for task, resource, start, end in chosen:
+            machine = pool_assignment[task.id] if resource in pooled else resource
+            results.append(PlanResultDTO(
+                task_instance_id=task.id,
+                job_id=task.job_id,
+                task_name=task.name,
+                assigned_machine=machine,
+                start_time=start,
+                end_time=end,
+                package_uid=task.package_uid,
+            ))
+        return results
+
+    def _add_plan_hints(self, bundle: _CpModelBundle, hint_plan: list[PlanResultDTO]) -> int:
+        """
+        Önceki bir planın atamalarını ve zamanlarını ipucu olarak ekler.
+        Sadece id'si, adı ve job'u tutan görevler kullanılır; kaç görevin ipucu aldığını döner.
+        """
+        model = bundle.model
+        plan_by_tid = {int(r.task_instance_id): r for r in hint_plan}
+        usable = {}
+        for task in bundle.tasks:
+            r = plan_by_tid.get(task.id)
+            if r is None or r.task_name != task.name or int(r.job_id) != int(task.job_id):
+                continue
+            machine = str(r.assigned_machine)
+            resource = bundle.pools[machine].name if machine in bundle.pools else machine
+            if resource not in bundle.task_resources[task.id]:
+                continue
+            usable[task.id] = (resource, int(r.start_time), int(r.end_time))
+
+        # Split parçaları başlangıca göre sıralı olmak zorunda; eski planın parçalarını bu sıraya göre yeniden dağıtalım.
+        for ids in bundle.split_groups:
+            if all(tid in usable for tid in ids):
+                ordered = sorted((usable[tid] for tid in ids), key=lambda x: (x[1], x[2]))
+                usable.update(zip(ids, ordered))
+
+        hinted = 0
+        for task in bundle.tasks:
+            if task.id not in usable:
+                continue
+            resource, start, end = usable[task.id]
+            for res in bundle.task_resources[task.id]:
+                model.add_hint(bundle.machine_assignments[(task.id, res)], res == resource)
+            model.add_hint(bundle.start_vars[(task.id, resource)], start)
+            model.add_hint(bundle.end_vars[(task.id, resource)], end)
+            # Kompakt modelde tek kaynaklı görevin hayaleti bedenin kendisi; aynı değişkene iki ipucu verilmemeli.
+            if bundle.master_start[task.id] is not bundle.start_vars[(task.id, resource)]:
+                model.add_hint(bundle.master_start[task.id], start)
+                model.add_hint(bundle.master_end[task.id], end)
+            if task.id in bundle.master_dur:
+                model.add_hint(bundle.master_dur[task.id], end - start)
+            hinted += 1
+        return hinted
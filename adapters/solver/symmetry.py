@@ -0,0 +1,47 @@
+# adapters/solver/symmetry.py
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from core.models.data_model import TaskInstanceDTO
+from adapters.solver.machine_pools import MachinePool
+
+def interchangeable_instance_groups(
+    tasks: List[TaskInstanceDTO],
+    excluded_ids: Iterable[int] = (),
+) -> List[List[int]]:
+    """
+    Bir split görevin parçaları (aynı job, faz, görev tipi ve aday makineler) birbirinin aynısıdır;
+    çözücü bunların k! farklı sıralamasını boşuna gezer. Bu grupları id sırasıyla döner.
+    Kilitli parçalar (excluded_ids) gruba girmez, çünkü onların yeri kullanıcı tarafından belirlenmiş.
+    """
+    excluded = set(excluded_ids)
+    groups: Dict[tuple, List[int]] = defaultdict(list)
+    for t in tasks:
+        if t.id in excluded:
+            continue
+        key = (t.job_id, t.order, t.base_name, tuple(sorted(t.machine_candidates)))
+        groups[key].append(t.id)
+    return [sorted(ids) for ids in groups.values() if len(ids) > 1]
+
+def machine_value_precedence(
+    task_resources: Dict[int, List[str]],
+    pools: Dict[str, MachinePool],
+) -> List[tuple]:
+    """
+    Havuz kullanılmadığında birbirinin aynısı makineler de simetri yaratır. Makineleri ilk kullanıldıkları
+    göreve göre yeniden numaralandırırsak, id sırasıyla i. görev grubun ilk i+1 makinesinden birine düşer.
+    Bu yüzden (task_id, makine) çiftleri yasaklanabilir; yasaklanacak çiftlerin listesini döner.
+    """
+    forbidden = []
+    seen = set()
+    for pool in pools.values():
+        if not pool.is_pooled or pool.name in seen:
+            continue
+        seen.add(pool.name)
+        members = set(pool.machines)
+        # group_identical_machines aynı görev kümesine aday olmayı şart koştuğu için bu görevlerin hepsi tüm makineleri görür.
+        users = sorted(tid for tid, resources in task_resources.items() if members & set(resources))
+        for i, tid in enumerate(users):
+            for machine in pool.machines[i + 1:]:
+                forbidden.append((tid, machine))
+    return forbidden
@@ -0,0 +1,71 @@
+# adapters/solver/whatif_session.py
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from core.models.data_model import PlanResultDTO
+
+MAX_SESSIONS = 4  # Worker süreci başına bellekte tutulan model sayısı; fazlası en eskiden atılır.
+SESSION_IDLE_SECONDS = 30 * 60  # Bu kadar kullanılmayan oturum kendiliğinden düşer.
+
+@dataclass
+class WhatIfSession:
+    """
+    Bir sipariş defteri için bir kez kurulmuş CP-SAT modeli ve son bulunan plan.
+    Kilit değişiklikleri modele domain sabitleme ile uygulanır; locked_domains onları geri almak için eski domain'leri tutar.
+    """
+    fingerprint: str
+    bundle: object  # solver_adapter._CpModelBundle
+    last_run_id: Optional[str] = None
+    last_results: List[PlanResultDTO] = field(default_factory=list)
+    locked_domains: Dict[int, list] = field(default_factory=dict)
+    last_used: float = field(default_factory=time.monotonic)
+    busy: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+class WhatIfSessionStore:
+    """Süreç genelinde fingerprint -> WhatIfSession LRU deposu."""
+    def __init__(self, max_sessions: int = MAX_SESSIONS, idle_seconds: float = SESSION_IDLE_SECONDS):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self._sessions: "OrderedDict[str, WhatIfSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, s in self._sessions.items() if now - s.last_used > self.idle_seconds]:
+            del self._sessions[key]
+
+    def get(self, fingerprint: str) -> Optional[WhatIfSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(fingerprint)
+            if session is not None:
+                self._sessions.move_to_end(fingerprint)
+                session.last_used = time.monotonic()
+            return session
+
+    def put(self, session: WhatIfSession) -> None:
+        with self._lock:
+            self._sessions[session.fingerprint] = session
+            self._sessions.move_to_end(session.fingerprint)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+_store: Optional[WhatIfSessionStore] = None
+
+def get_whatif_sessions() -> WhatIfSessionStore:
+    # Fork sonrası çocuk süreç ebeveynin modellerini kullanmasın diye celery_app reset ediyor.
+    global _store
+    if _store is None:
+        _store = WhatIfSessionStore()
+    return _store
+
+def reset_whatif_sessions() -> None:
+    global _store
+    _store = None
@@ -1,19 +1,30 @@
 # backend/app.py
 
+import json
 import uuid
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-import psycopg2
 from psycopg2.extras import RealDictCursor
 from .tasks import execute_planning_task
-from config.settings import POSTGRESQL_CONFIG
-from pymongo import MongoClient
 from backend.database_select import resolve_db_from_request
 from adapters.driven.plan_result_writer_adapter import PostgreSQLPlanResultWriter
 from adapters.driven.mongo_plan_result_writer_adapter import MongoPlanResultWriter
 from adapters.driving.postgresql_order_writer_adapter import PostgreSQLOrderWriterAdapter
-from adapters.driving.mongo_order_writer_adapter import MongoOrderWriterAdapter
-from config.settings import MONGODB_CONFIG
+from adapters.driving.mongo_order_writer_adapter import MongoOrderWriterAdapter, PartialOrderWrite
+from adapters.driving.postgresql_data_reader_adapter import PostgreSQLReaderAdapter
+from adapters.driving.mongo_data_reader_adapter import MongoReaderAdapter
+from adapters.pooling.connection_pool import pg_connection, get_mongo_db
+from config.solver_profiles import get_solver_profile
+from config.worker_topology import SMALL_QUEUE, queue_eta_seconds, queue_for
+from adapters.driven.redis_progress_adapter import RedisProgressReader, RedisRunControl
+from adapters.driven.redis_read_cache import PlanReadCache
+from backend.orders import flatten_bulk_orders, parse_order
+from backend.gantt import (
+    build_gantt_payload, choose_encoding, encode_json, fetch_gantt_rows_mongo, fetch_gantt_rows_pg, gantt_etag,
+    parse_gantt_query,
+)
+
+TERMINAL_STATES = {"COMPLETED", "FAILED", "CANCELLED", "CANCELLED_WITH_INCUMBENT"} # Bu durumlardaki run'lar artık değişmez.
 
 ALLOWED_ORIGINS = ["http://localhost:5173", "http://127.0.0.1:5173", "*"] # Hangi frontend'lere bu backend istek atabilir?
 app = Flask(__name__)
@@ -25,16 +36,17 @@ CORS( # Sadece /api/ ve altındaki yollar için izin verilen originler'le çalı
     supports_credentials=False,
 )
 
+read_cache = PlanReadCache() # Durum ve Gantt okumaları için süreç içi + Redis önbellek.
+
 def get_db_connection():
-    conn = psycopg2.connect(**POSTGRESQL_CONFIG)
-    psycopg2.extras.register_uuid(conn_or_curs=conn)
-    return conn
+    # Her istekte yeni bağlantı açmak yerine süreç genelindeki havuzdan ödünç alıyoruz (with ile kullanılır).
+    return pg_connection()
 
 @app.after_request # Flask'e her bir istek bittikten ve bir cevap oluşturulduktan hemen sonra bu fonksiyonu çalıştır diyoruz. Baya hata almıştım öyle eklendi burası.
 def add_cors_headers(resp): # # Her cevaba CORS'u ekler.
     origin = request.headers.get("Origin", "*")
     resp.headers["Access-Control-Allow-Origin"] = origin if origin in ALLOWED_ORIGINS or "*" in ALLOWED_ORIGINS else "null"
-    resp.headers["Vary"] = "Origin"
+    resp.vary.add("Origin") # Gantt cevabı Accept-Encoding'e göre de değişiyor; üzerine yazmayalım.
     resp.headers["Access-Control-Allow-Methods"] = "GET,POST,PUT,PATCH,DELETE,OPTIONS"
     req_headers = request.headers.get("Access-Control-Request-Headers", "Content-Type, Authorization")
     resp.headers["Access-Control-Allow-Headers"] = req_headers
@@ -50,15 +62,53 @@ def _plan_writer_for(db: str):
 def _order_writer_for(db: str):
     return MongoOrderWriterAdapter() if db == "MONGO" else PostgreSQLOrderWriterAdapter()
 
+def _reader_for(db: str):
+    return MongoReaderAdapter() if db == "MONGO" else PostgreSQLReaderAdapter()
+
+def _profile_from_request(body: dict) -> str:
+    # Profil body'de ya da query'de gelebilir (fast / balanced / thorough). Bilinmeyen isimde ValueError fırlar.
+    return get_solver_profile(body.get("profile") or request.args.get("profile")).name
+
+# heuristic: saniyenin altında uygun (optimal olmayan) plan. portfolio: birkaç CP-SAT ayarını paralel çözer.
+SOLVER_BACKENDS = ("cpsat", "heuristic", "portfolio")
+
+def _solver_from_request(body: dict) -> str:
+    solver = (body.get("solver") or request.args.get("solver") or "cpsat").lower()
+    if solver not in SOLVER_BACKENDS:
+        raise ValueError(f"Unknown solver '{solver}'. Available: {', '.join(SOLVER_BACKENDS)}")
+    return solver
+
+def _enqueue_run(db: str, run_id: uuid.UUID, profile: str, solver: str, **task_kwargs) -> dict:
+    """
+    Run'ı PENDING olarak kaydedip Celery'e paslar. Problemin task instance sayısına göre küçük ya da büyük kuyruğa
+    gider (sezgisel çözücü hep küçük kuyruğa); kaydın sırası ve tahmini süresi cevapla birlikte döner.
+    """
+    instances = _reader_for(db).count_task_instances()
+    queue = SMALL_QUEUE if solver == "heuristic" else queue_for(instances)
+    # PENDING diyoruz anında. Sezgisel çözücüde profil kullanılmadığı için profil yerine onu kaydediyoruz.
+    queued = _plan_writer_for(db).create_run_record(
+        run_id, solver_profile=profile if solver != "heuristic" else solver, queue=queue, estimated_instances=instances,
+    )
+    # Ağır olan asıl işi Celery Worker'a paslıyoruz run_id ve db bilgisiyle. apply_async bu satırın anında bitmesini sağlar.
+    execute_planning_task.apply_async(
+        kwargs={"run_id": str(run_id), "db": db, "profile": profile, "solver": solver, **task_kwargs}, queue=queue,
+    )
+    return queued
+
 @app.route('/api/solver/start', methods=['POST'])
 def start_solver_endpoint():
     db = resolve_db_from_request(request)
+    body = request.get_json(force=True, silent=True) or {}
+    try:
+        profile = _profile_from_request(body)
+        solver = _solver_from_request(body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     run_id = uuid.uuid4()
-    _plan_writer_for(db).create_run_record(run_id)  # PENDING diyoruz anında.
-
-    # Ağır olan asıl işi Celery Worker'a paslıyoruz run_id ve db bilgisiyle. delay komutu bu satırın anında bitmesini sağlar.
-    execute_planning_task.delay(run_id=str(run_id), db=db)
-    return jsonify({"run_id": str(run_id), "db": db}) # Kullanıcıya işlem başladı diyoruz.
+    queued = _enqueue_run(
+        db, run_id, profile, solver, publish_plan=bool(body.get("publish_plan")), refresh=bool(body.get("refresh")),
+    )
+    return jsonify({"run_id": str(run_id), "db": db, "profile": profile, "solver": solver, **queued}) # Kullanıcıya işlem başladı diyoruz.
 
 
 @app.route('/api/solver/start_with_locks', methods=['POST'])
@@ -71,48 +121,156 @@ def start_solver_with_locks_endpoint():
     for lk in locks:
         if not isinstance(lk, dict) or not all(k in lk for k in ("task_instance_id","machine","start_min")):
             return jsonify({"error": "lock requires task_instance_id, machine, start_min"}), 400
+    base_run_id = body.get("base_run_id") # Kilitlerin alındığı run; verilirse solver o planla ısınarak başlar.
+    if base_run_id is not None:
+        try:
+            base_run_id = str(uuid.UUID(str(base_run_id)))
+        except ValueError:
+            return jsonify({"error": "base_run_id must be a valid UUID"}), 400
+    try:
+        profile = _profile_from_request(body)
+        solver = _solver_from_request(body)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     run_id = uuid.uuid4()
-    _plan_writer_for(db).create_run_record(run_id)
-    execute_planning_task.delay(run_id=str(run_id), db=db, locks=locks)
-    return jsonify({"run_id": str(run_id), "db": db})
+    queued = _enqueue_run(
+        db, run_id, profile, solver, locks=locks, base_run_id=base_run_id, publish_plan=bool(body.get("publish_plan")),
+        refresh=bool(body.get("refresh")),
+    )
+    return jsonify({"run_id": str(run_id), "db": db, "profile": profile, "solver": solver, **queued})
 
 
-@app.route('/api/solver/status/<run_id>', methods=['GET'])
-def get_solver_status_endpoint(run_id):
-    db = resolve_db_from_request(request)
+def _read_run_status(db: str, run_id: str):
+    # Durum sorguları önce önbelleğe gider: bitmiş run'lar hiç değişmez, süren run'lar birkaç saniye tutulur.
+    return read_cache.get_status(db, run_id, lambda: _load_run_status(db, run_id))
+
+def _load_run_status(db: str, run_id: str):
+    # plan_metadata'dan run'ın durumunu okur; yoksa None döner.
     if db == "MONGO":
-        cli = MongoClient(MONGODB_CONFIG["uri"])
-        meta = cli[MONGODB_CONFIG["db_name"]]["plan_metadata"]
+        meta = get_mongo_db()["plan_metadata"]
         row = meta.find_one({"run_id": run_id})
         if not row:
-            return jsonify({"error": "Plan bulunamadı."}), 404
-        return jsonify({
+            return None
+        return {
             "state": row.get("status"),
             "makespan": row.get("makespan"),
             "status": row.get("solver_status"),
             "created_at": str(row.get("created_at")),
             "completed_at": str(row.get("completed_at")),
-            "error": row.get("error_message")
-        })
-    else:
-        conn = get_db_connection()
-        try:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("SELECT * FROM plan_metadata WHERE run_id = %s", (run_id,))
-                run = cur.fetchone()
-        finally:
-            conn.close()
-        if run is None:
-            return jsonify({"error": "Plan bulunamadı."}), 404
-        return jsonify({
-            "state": run.get("status"),
-            "makespan": run.get("makespan"),
-            "status": run.get("solver_status"),
-            "created_at": run.get("created_at"),
-            "completed_at": run.get("completed_at"),
-            "error": run.get("error_message")
-        })
+            "error": row.get("error_message"),
+            "profile": row.get("solver_profile"),
+            "cache_hit": bool(row.get("cache_hit", False)),
+            **_queue_fields(db, row),
+        }
+    with get_db_connection() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT * FROM plan_metadata WHERE run_id = %s", (run_id,))
+            run = cur.fetchone()
+    if run is None:
+        return None
+    return {
+        "state": run.get("status"),
+        "makespan": run.get("makespan"),
+        "status": run.get("solver_status"),
+        "created_at": run.get("created_at"),
+        "completed_at": run.get("completed_at"),
+        "error": run.get("error_message"),
+        "profile": run.get("solver_profile"),
+        "cache_hit": bool(run.get("cache_hit") or False),
+        **_queue_fields(db, run),
+    }
+
+def _queue_fields(db: str, row) -> dict:
+    # Kuyrukta bekleyen run'ın sırası ve tahmini süresi kayıt anında yazılıyor; beklerken önündekiler bitince güncel hâlini hesaplıyoruz.
+    fields = {
+        "queue": row.get("queue"),
+        "estimated_instances": row.get("estimated_instances"),
+        "queue_position": row.get("queue_position"),
+        "eta_seconds": row.get("eta_seconds"),
+    }
+    if row.get("status") == "PENDING" and row.get("queue"):
+        ahead, running, avg_seconds = _plan_writer_for(db).queue_estimate(row["queue"], created_before=row.get("created_at"))
+        fields["queue_position"] = ahead + 1
+        fields["eta_seconds"] = queue_eta_seconds(row["queue"], ahead + running, avg_seconds)
+    return fields
+
+def _latest_progress(run_id: str):
+    # Redis'e ulaşılamazsa ilerleme bilgisi olmadan devam edelim; status endpoint'i bunun yüzünden düşmesin.
+    try:
+        return RedisProgressReader().latest(run_id)
+    except Exception:
+        return None
+
+@app.route('/api/solver/status/<run_id>', methods=['GET'])
+def get_solver_status_endpoint(run_id):
+    db = resolve_db_from_request(request)
+    run = _read_run_status(db, run_id)
+    if run is None:
+        return jsonify({"error": "Plan bulunamadı."}), 404
+    if run["state"] not in TERMINAL_STATES:
+        run["progress"] = _latest_progress(run_id) # Çözüm sürerken son iyileşen çözümün makespan/bound/gap bilgisi.
+    return jsonify(run)
+
+
+@app.route('/api/solver/cancel/<run_id>', methods=['POST'])
+def cancel_solver_endpoint(run_id): # Çalışan ya da kuyrukta bekleyen bir run'ı durdurur; bulunan en iyi plan saklanır.
+    db = resolve_db_from_request(request)
+    run = _read_run_status(db, run_id)
+    if run is None:
+        return jsonify({"error": "Plan bulunamadı."}), 404
+    if run["state"] in TERMINAL_STATES:
+        return jsonify({"error": f"Run zaten bitmiş ({run['state']})."}), 409
+    RedisRunControl().request_cancel(run_id) # Worker'daki watchdog bu bayrağı görünce aramayı durdurur.
+    return jsonify({"run_id": run_id, "cancel_requested": True})
+
+
+def _status_event(run_id: str, run: dict) -> dict:
+    # Yazıcıların yayınladığı {"type": "status"} olayıyla aynı biçim.
+    event = {
+        "type": "status", "run_id": run_id, "state": run["state"], "makespan": run.get("makespan"),
+        "solver_status": run.get("status"), "error": run.get("error"), "cache_hit": run.get("cache_hit"),
+    }
+    return {k: v for k, v in event.items() if v is not None}
+
+def _sse(events):
+    def body():
+        for event in events:
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+    return Response(
+        stream_with_context(body()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route('/api/solver/stream/<run_id>', methods=['GET'])
+def stream_solver_progress_endpoint(run_id): # Server-Sent Events: solver'ın ilerlemesini ve durum geçişlerini canlı olarak tarayıcıya akıtır.
+    db = resolve_db_from_request(request)
+    run = _read_run_status(db, run_id)
+    if run is None:
+        return jsonify({"error": "Plan bulunamadı."}), 404
+
+    def events():
+        if run["state"] in TERMINAL_STATES: # Zaten bittiyse tek bir olay gönderip kapatalım.
+            yield {'type': 'finished', 'state': run['state']}
+            return
+
+        def current_status():
+            # Abone olduktan sonra güncel durumu bir kez veritabanından okuyoruz; arada biten run kaçmasın.
+            latest = _load_run_status(db, run_id)
+            return _status_event(run_id, latest) if latest else None
+
+        yield from RedisProgressReader().stream(run_id, current_status=current_status)
+
+    return _sse(events())
+
+
+@app.route('/api/solver/stream', methods=['GET'])
+def stream_all_runs_endpoint(): # Tüm run'ların durum geçişleri (PENDING yok; RUNNING, COMPLETED, FAILED...). Dashboard listesi için.
+    return _sse(RedisProgressReader().stream_all())
 
 
 @app.route('/api/plans/<run_id>', methods=['GET'])
@@ -122,15 +280,13 @@ def get_plan_info(run_id):
 def get_recent_plans():
     db = resolve_db_from_request(request)
     if db == "MONGO":
-        cli = MongoClient(MONGODB_CONFIG["uri"])
-        meta = cli[MONGODB_CONFIG["db_name"]]["plan_metadata"]
+        meta = get_mongo_db()["plan_metadata"]
         rows = list(meta.find({}, {"run_id":1, "created_at":1}).sort("created_at", -1).limit(10))
         data = [{"id": str(r.get("run_id")), "label": f"Plan #{i+1} - {r.get('created_at')}"}
                 for i, r in enumerate(rows)]
         return jsonify(data)
     else:
-        conn = get_db_connection()
-        try:
+        with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute("""
                     SELECT run_id, created_at
@@ -139,87 +295,84 @@ def get_recent_plans():
                     LIMIT 10
                 """)
                 rows = cur.fetchall() or []
-        finally:
-            conn.close()
         data = [{"id": str(r["run_id"]), "label": f"Plan #{i+1} - {r['created_at']}"} for i, r in enumerate(rows)]
         return jsonify(data)
 @app.route('/api/plans/<run_id>/gantt', methods=['GET'])
 def get_plan_gantt_endpoint(run_id):
+    # Filtreler: from/to (dakika), machines, jobs; sayfalama: limit + cursor; layout=columnar ile paralel diziler.
+    db = resolve_db_from_request(request)
+    try:
+        query = parse_gantt_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    run = _read_run_status(db, run_id)
+    etag = None
+    if run is not None and run["state"] in TERMINAL_STATES:
+        # Bitmiş planın çubukları değişmez; tarayıcı aynı ETag'i gönderirse veritabanına hiç gitmeyelim.
+        etag = gantt_etag(run_id, run["completed_at"], query)
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+            resp.set_etag(etag, weak=True)
+            return resp
+
+    wanted = choose_encoding(request.accept_encodings)
+
+    def load():
+        if db == "MONGO":
+            rows = fetch_gantt_rows_mongo(get_mongo_db(), run_id, query)
+        else:
+            with get_db_connection() as conn:
+                rows = fetch_gantt_rows_pg(conn, run_id, query)
+        payload, next_cursor = build_gantt_payload(run_id, rows, query)
+        return (*encode_json(payload, wanted), next_cursor)
+
+    if etag:
+        # Aynı filtre ve kodlama için sıkıştırılmış gövde önbellekte; ikinci istekten sonra ne sorgu ne sıkıştırma.
+        body, encoding, next_cursor = read_cache.get_gantt(db, run_id, f"{etag}.{wanted or 'identity'}", load)
+    else:
+        body, encoding, next_cursor = load()
+    resp = Response(body, mimetype="application/json")
+    resp.vary.add("Accept-Encoding")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    if next_cursor:
+        resp.headers["X-Next-Cursor"] = next_cursor # Satır düzeninde gövde liste olduğu için sonraki sayfa header'da.
+    if etag:
+        resp.set_etag(etag, weak=True)
+        resp.headers["Cache-Control"] = "private, max-age=0, must-revalidate"
+    else:
+        resp.headers["Cache-Control"] = "no-store" # Run sürüyor, plan henüz yazılmamış olabilir.
+    return resp
+
+@app.route('/api/plans/<run_id>/metrics', methods=['GET'])
+def get_plan_metrics_endpoint(run_id): # Run'ın aşama süreleri, model boyutu, CP-SAT istatistikleri ve tepe belleği.
     db = resolve_db_from_request(request)
     if db == "MONGO":
-        cli = MongoClient(MONGODB_CONFIG["uri"])
-        res = cli[MONGODB_CONFIG["db_name"]]["plan_result"]
-        rows = list(res.find({"run_id": run_id}).sort("start_time", 1))
-        gantt_data = [{
-            "task": r.get("task_name",""),
-            "start": int(r.get("start_time",0)),
-            "finish": int(r.get("end_time",0)),
-            "resource": r.get("assigned_machine",""),
-            "job_id": int(r.get("job_id",0)),
-            "task_instance_id": int(r.get("task_instance_id",0)),
-        } for r in rows]
-        return jsonify(gantt_data)
+        row = get_mongo_db()["plan_metadata"].find_one({"run_id": run_id}, {"status": 1, "metrics": 1})
     else:
-        conn = get_db_connection()
-        try:
+        with get_db_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT task_instance_id, job_id, task_name, assigned_machine, start_time, end_time
-                    FROM plan_result
-                    WHERE run_id = %s
-                    ORDER BY start_time ASC
-                """, (run_id,))
-                rows = cur.fetchall() or []
-        finally:
-            conn.close()
-        gantt_data = [{
-            "task": r["task_name"],
-            "start": int(r["start_time"] or 0),
-            "finish": int(r["end_time"] or 0),
-            "resource": r["assigned_machine"],
-            "job_id": int(r["job_id"] or 0),
-            "task_instance_id": int(r["task_instance_id"] or 0),
-        } for r in rows]
-        return jsonify(gantt_data)
+                cur.execute("SELECT status, metrics FROM plan_metadata WHERE run_id = %s", (run_id,))
+                row = cur.fetchone()
+    if row is None:
+        return jsonify({"error": "Plan bulunamadı."}), 404
+    # Metrikler run bittiğinde yazılıyor; çözüm sürerken null döner.
+    return jsonify({"run_id": run_id, "state": row.get("status"), "metrics": row.get("metrics")})
 
 @app.route('/api/orders', methods=['POST'])
 def create_order_endpoint():
     db = resolve_db_from_request(request)
     data = request.get_json(force=True, silent=True) or {}
     try:
-        package_id = int(data.get("package_id"))
-        job_id = int(data.get("job_id"))
-        job_type = str(data.get("job_type") or "").strip()
-        mode = str(data.get("mode") or "").strip()
-        phase = int(data.get("phase"))
-        count = data.get("count", None)
-        count = int(count) if count is not None else None
-        em = data.get("eligible_machines") or []
-        deadline = data.get("deadline", 10000)
-
-        if job_type not in {"kesme", "oyma", "bükme", "yanak_açma"}:
-            return jsonify({"error": "Geçersiz iş türü."}), 400
-        if mode not in {"single", "split"}:
-            return jsonify({"error": "Geçersiz mod."}), 400
-        if phase < 1:
-            return jsonify({"error": "Faz 1 veya daha büyük olmalı."}), 400
-        if mode == "split" and (count is None or count < 1):
-            return jsonify({"error": "Split modunda count ≥ 1 olmalı."}), 400
-        if not isinstance(em, list) or any(not isinstance(x, str) for x in em):
-            return jsonify({"error": "eligible_machines listesi hatalı."}), 400
+        try:
+            order = parse_order(data) # Kurallar /api/orders/bulk ile ortak.
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         writer = _order_writer_for(db)
         try:
-            task_id = writer.create_task(
-                package_id=package_id,
-                job_id=job_id,
-                job_type=job_type,
-                mode=mode,
-                phase=phase,
-                count=count,
-                eligible_machines=em,
-                deadline=deadline,
-            )
+            task_id = writer.create_task(**order)
         finally:
             try: writer.close()
             except: pass
@@ -228,6 +381,50 @@ def create_order_endpoint():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+@app.route('/api/orders/bulk', methods=['POST'])
+def create_orders_bulk_endpoint():
+    # ERP'den gelen tüm sipariş defteri tek istekte: her girdi /api/orders kurallarıyla doğrulanır,
+    # geçerli olanlar tek transaction / bulk_write ile yazılır. Sonuç girdi başına döner; hatalı girdiler atlanır.
+    db = resolve_db_from_request(request)
+    try:
+        items = flatten_bulk_orders(request.get_json(force=True, silent=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results, valid, refs = [], [], []
+    for ref, raw in items:
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError("order must be a JSON object")
+            valid.append(parse_order(raw))
+            refs.append(len(results))
+            results.append({"ref": ref, "ok": True})
+        except (TypeError, ValueError) as e:
+            results.append({"ref": ref, "ok": False, "error": str(e)})
+
+    if valid:
+        writer = _order_writer_for(db)
+        write_error = None
+        try:
+            task_ids = writer.create_tasks(valid)
+        except PartialOrderWrite as e:
+            # Mongo'da toplu yazma atomik değil; hata öncesi yazılanlar kaldı, hangileri olduğunu girdi başına bildiriyoruz.
+            task_ids, write_error = e.task_ids, str(e)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 400 # PG'de yazma tek transaction; hiçbir girdi kaydedilmedi.
+        finally:
+            try: writer.close()
+            except: pass
+        for i, task_id in zip(refs, task_ids):
+            if task_id is None:
+                results[i].update(ok=False, error=write_error)
+            else:
+                results[i]["task_id"] = task_id
+
+    created = sum(1 for r in results if r["ok"])
+    failed = len(results) - created
+    return jsonify({"ok": failed == 0, "db": db, "created": created, "failed": failed, "results": results})
+
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -1,5 +1,8 @@
 # backend/celery_app.py
 from celery import Celery
+from celery.signals import worker_process_init
+from kombu import Queue
+from config.worker_topology import LARGE_QUEUE, queue_specs
 
 app = Celery(
     'backend', # Celery app'imin ismi.
@@ -14,4 +17,17 @@ app.conf.update( # Benim haberleşmem JSON yoluyla, onları tanımladım.
     result_serializer='json',
     timezone='Europe/Istanbul',
     enable_utc=True,
+    # Küçük ve büyük problemler ayrı kuyruklarda; API task instance sayısına göre seçiyor. Kuyruk verilmezse büyük kuyruk.
+    task_queues=[Queue(name, routing_key=name) for name in queue_specs()],
+    task_default_queue=LARGE_QUEUE,
+    worker_prefetch_multiplier=1, # Çözümler uzun sürüyor; boşta olan başka bir worker varken bir çocuk iki run'ı birden kapmasın.
 )
+
+@worker_process_init.connect
+def _reset_connection_pools(**_kwargs): # Prefork'ta her çocuk süreç ebeveynden kalan soketleri değil, kendi havuzunu kullansın.
+    from adapters.pooling.connection_pool import reset_pools
+    reset_pools()
+    from adapters.solver.whatif_session import reset_whatif_sessions
+    reset_whatif_sessions() # What-if modelleri de süreç başına; ebeveynden kopyalananları kullanmayalım.
+    from config.worker_topology import mark_shared_worker
+    mark_shared_worker() # Bu süreç kardeşleriyle aynı çekirdekleri paylaşıyor; her run kendi payı kadar thread açsın.
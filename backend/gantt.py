@@ -0,0 +1,153 @@
+# backend/gantt.py
+
+import gzip
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Tuple
+
+try:
+    import brotli  # Opsiyonel; kurulu değilse gzip ile devam ediyoruz.
+except ImportError:
+    brotli = None
+
+GANTT_COLUMNS = ("task", "start", "finish", "resource", "job_id", "task_instance_id")
+MAX_PAGE_SIZE = 5000
+COMPRESS_MIN_BYTES = 1024  # Bundan küçük cevapları sıkıştırmaya değmez.
+
+@dataclass(frozen=True)
+class GanttQuery:
+    """Gantt isteğinin filtreleri. cursor: bir önceki sayfanın son çubuğunun (start_time, task_instance_id) değeri."""
+    time_from: Optional[int] = None
+    time_to: Optional[int] = None
+    machines: Tuple[str, ...] = ()
+    jobs: Tuple[int, ...] = ()
+    limit: Optional[int] = None
+    cursor: Optional[Tuple[int, int]] = None
+    columnar: bool = False
+
+    def cache_key(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+
+def _csv(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in (value or "").split(",") if v.strip()]
+
+def parse_gantt_query(args) -> GanttQuery:
+    """
+    Query string'den filtreleri okur: from/to (dakika, bu aralıkla kesişen çubuklar), machines ve jobs (virgülle),
+    limit ve cursor (keyset sayfalama), layout=columnar. Hatalı değerde ValueError fırlar.
+    """
+    time_from = int(args["from"]) if args.get("from") not in (None, "") else None
+    time_to = int(args["to"]) if args.get("to") not in (None, "") else None
+    if time_from is not None and time_to is not None and time_to <= time_from:
+        raise ValueError("'to' must be greater than 'from'")
+    limit = None
+    if args.get("limit") not in (None, ""):
+        limit = int(args["limit"])
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    cursor = None
+    if args.get("cursor"):
+        start, _, tid = str(args["cursor"]).partition(":")
+        cursor = (int(start), int(tid))
+    layout = (args.get("layout") or "rows").lower()
+    if layout not in ("rows", "columnar"):
+        raise ValueError("layout must be 'rows' or 'columnar'")
+    return GanttQuery(
+        time_from=time_from, time_to=time_to,
+        machines=tuple(sorted(set(_csv(args.get("machines"))))),
+        jobs=tuple(sorted({int(j) for j in _csv(args.get("jobs"))})),
+        limit=limit, cursor=cursor, columnar=layout == "columnar",
+    )
+
+def fetch_gantt_rows_pg(conn, run_id: str, q: GanttQuery) -> List[tuple]:
+    """Filtreleri SQL'e taşır; (run_id, start_time, task_instance_id) index'i üzerinden keyset ile sayfalar."""
+    where = ["run_id = %s"]
+    params: list = [run_id]
+    if q.time_from is not None:
+        where.append("end_time > %s")
+        params.append(q.time_from)
+    if q.time_to is not None:
+        where.append("start_time < %s")
+        params.append(q.time_to)
+    if q.machines:
+        where.append("assigned_machine = ANY(%s)")
+        params.append(list(q.machines))
+    if q.jobs:
+        where.append("job_id = ANY(%s)")
+        params.append(list(q.jobs))
+    if q.cursor is not None:
+        where.append("(start_time, task_instance_id) > (%s, %s)")
+        params.extend(q.cursor)
+    sql = (
+        "SELECT task_name, start_time, end_time, assigned_machine, job_id, task_instance_id FROM plan_result "
+        f"WHERE {' AND '.join(where)} ORDER BY start_time ASC, task_instance_id ASC"
+    )
+    if q.limit is not None:
+        sql += " LIMIT %s"
+        params.append(q.limit + 1)  # Bir fazlasını alıp sonraki sayfa var mı anlıyoruz.
+    with conn.cursor() as cur:  # Satır başına dict kurmamak için düz tuple cursor.
+        cur.execute(sql, params)
+        return [
+            (task or "", int(start or 0), int(end or 0), machine, int(job or 0), int(tid or 0))
+            for task, start, end, machine, job, tid in cur.fetchall()
+        ]
+
+def fetch_gantt_rows_mongo(db, run_id: str, q: GanttQuery) -> List[tuple]:
+    """Aynı filtreler Mongo sorgusu olarak; (run_id, start_time, task_instance_id) index'ini kullanır."""
+    flt: dict = {"run_id": run_id}
+    if q.time_from is not None:
+        flt["end_time"] = {"$gt": q.time_from}
+    if q.time_to is not None:
+        flt["start_time"] = {"$lt": q.time_to}
+    if q.machines:
+        flt["assigned_machine"] = {"$in": list(q.machines)}
+    if q.jobs:
+        flt["job_id"] = {"$in": list(q.jobs)}
+    if q.cursor is not None:
+        start, tid = q.cursor
+        flt["$or"] = [{"start_time": {"$gt": start}}, {"start_time": start, "task_instance_id": {"$gt": tid}}]
+    projection = {"_id": 0, "task_name": 1, "start_time": 1, "end_time": 1, "assigned_machine": 1, "job_id": 1, "task_instance_id": 1}
+    cur = db["plan_result"].find(flt, projection).sort([("start_time", 1), ("task_instance_id", 1)])
+    if q.limit is not None:
+        cur = cur.limit(q.limit + 1)
+    return [
+        (
+            r.get("task_name", ""), int(r.get("start_time", 0)), int(r.get("end_time", 0)),
+            r.get("assigned_machine", ""), int(r.get("job_id", 0)), int(r.get("task_instance_id", 0)),
+        ) for r in cur
+    ]
+
+def build_gantt_payload(run_id: str, rows: List[tuple], q: GanttQuery):
+    """(gövde, sonraki sayfanın cursor'ı) döner. Satır düzeninde eski endpoint'le aynı dict listesi."""
+    next_cursor = None
+    if q.limit is not None and len(rows) > q.limit:
+        rows = rows[:q.limit]
+        next_cursor = f"{rows[-1][1]}:{rows[-1][5]}"
+    if q.columnar:
+        # Paralel diziler: anahtar isimleri her çubukta tekrar etmediği için çok daha küçük.
+        columns = {name: list(values) for name, values in zip(GANTT_COLUMNS, zip(*rows))} if rows else {c: [] for c in GANTT_COLUMNS}
+        return {"run_id": run_id, "count": len(rows), "next_cursor": next_cursor, "columns": columns}, next_cursor
+    return [dict(zip(GANTT_COLUMNS, r)) for r in rows], next_cursor
+
+def gantt_etag(run_id: str, completed_at, q: GanttQuery) -> str:
+    """Bitmiş planlar değişmez; run, bitiş zamanı ve filtreler aynıysa cevap da aynıdır."""
+    raw = f"{run_id}|{completed_at}|{q.cache_key()}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """İstemcinin kabul ettiği en iyi sıkıştırma: brotli (kuruluysa), gzip ya da None."""
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+def encode_json(payload, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """JSON'u kompakt yazar; küçük değilse verilen kodlamayla sıkıştırır. (gövde, Content-Encoding) döner."""
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    if encoding == "br":
+        return brotli.compress(body, quality=5), "br"
+    return gzip.compress(body, compresslevel=6), "gzip"
@@ -0,0 +1,72 @@
+# backend/orders.py
+
+from typing import List, Tuple
+
+VALID_JOB_TYPES = {"kesme", "oyma", "bükme", "yanak_açma"}
+VALID_MODES = {"single", "split"}
+MAX_BULK_ORDERS = 10000  # Tek istekte kabul edilen en fazla task; ERP'den gelen tüm defter rahatça sığıyor.
+
+def parse_order(data: dict) -> dict:
+    """
+    Tek bir iş emri girdisini /api/orders kurallarıyla doğrular ve yazıcıların beklediği alanlara çevirir.
+    Hatalı girdide mesajıyla ValueError (ya da sayıya çevrilemeyen alanda TypeError) fırlar.
+    """
+    package_id = int(data.get("package_id"))
+    job_id = int(data.get("job_id"))
+    job_type = str(data.get("job_type") or "").strip()
+    mode = str(data.get("mode") or "").strip()
+    phase = int(data.get("phase"))
+    count = data.get("count", None)
+    count = int(count) if count is not None else None
+    em = data.get("eligible_machines") or []
+    deadline = data.get("deadline", 10000)
+
+    if job_type not in VALID_JOB_TYPES:
+        raise ValueError("Geçersiz iş türü.")
+    if mode not in VALID_MODES:
+        raise ValueError("Geçersiz mod.")
+    if phase < 1:
+        raise ValueError("Faz 1 veya daha büyük olmalı.")
+    if mode == "split" and (count is None or count < 1):
+        raise ValueError("Split modunda count ≥ 1 olmalı.")
+    if not isinstance(em, list) or any(not isinstance(x, str) for x in em):
+        raise ValueError("eligible_machines listesi hatalı.")
+    return {
+        "package_id": package_id, "job_id": job_id, "job_type": job_type, "mode": mode, "phase": phase,
+        "count": count, "eligible_machines": em, "deadline": deadline,
+    }
+
+def _list_field(obj, key: str, where: str) -> list:
+    value = obj.get(key) if isinstance(obj, dict) else None
+    if not isinstance(value, list):
+        raise ValueError(f"{where}.{key} must be a list")
+    return value
+
+def flatten_bulk_orders(body) -> List[Tuple[str, object]]:
+    """
+    Toplu girdiyi (referans, tek iş emri) çiftlerine açar. İki biçim kabul edilir:
+    {"orders": [<tek /api/orders gövdesi>, ...]} ya da iç içe
+    {"packages": [{"package_id", "deadline", "jobs": [{"job_id", "tasks": [{"job_type", "mode", ...}]}]}]}.
+    Referans, cevaptaki sonucun hangi girdiye ait olduğunu gösterir (ör. "packages[0].jobs[2].tasks[1]").
+    Gövdenin kendisi bu biçimlere uymuyorsa ValueError fırlar; tek tek girdiler burada doğrulanmaz.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    items: List[Tuple[str, object]] = []
+    if "orders" in body:
+        items.extend((f"orders[{i}]", o) for i, o in enumerate(_list_field(body, "orders", "body")))
+    if "packages" in body:
+        for p, pkg in enumerate(_list_field(body, "packages", "body")):
+            for j, job in enumerate(_list_field(pkg, "jobs", f"packages[{p}]")):
+                for t, task in enumerate(_list_field(job, "tasks", f"packages[{p}].jobs[{j}]")):
+                    item = dict(task) if isinstance(task, dict) else {}
+                    # Paket ve job alanlarını task'a taşıyoruz; tek girdi kuralları aynen uygulanabilsin.
+                    item.update(package_id=pkg.get("package_id"), job_id=job.get("job_id"))
+                    if "deadline" in pkg:
+                        item["deadline"] = pkg["deadline"]
+                    items.append((f"packages[{p}].jobs[{j}].tasks[{t}]", item if isinstance(task, dict) else task))
+    if not items:
+        raise ValueError("body must contain a non-empty 'orders' or 'packages' list")
+    if len(items) > MAX_BULK_ORDERS:
+        raise ValueError(f"at most {MAX_BULK_ORDERS} orders per request")
+    return items
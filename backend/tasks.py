@@ -1,15 +1,30 @@
 # backend/tasks.py
 
 import logging
+from dataclasses import replace
 from .celery_app import app
 from adapters.driven.plan_result_writer_adapter import PostgreSQLPlanResultWriter
 from adapters.driven.mongo_plan_result_writer_adapter import MongoPlanResultWriter
 from adapters.driving.postgresql_data_reader_adapter import PostgreSQLReaderAdapter
 from adapters.driving.mongo_data_reader_adapter import MongoReaderAdapter
+from adapters.driven.redis_progress_adapter import RedisProgressPublisher, RedisRunControl
+from adapters.driven.redis_solution_cache import RedisSolutionCache
 from adapters.logging.logger_adapter import LoggerAdapter
 from config.machine_config_loader import MachineConfig
+from config.solver_profiles import get_solver_profile
+from config.worker_topology import cores_per_solve
 from core.fjsm_core import FJSMCore
+from core.instrumentation import RunMetrics
+from core.rolling_horizon import RollingHorizonPlanner
+from core.solution_fingerprint import problem_fingerprint
+from core.ports.solver_port import SolveCancelled
 from adapters.solver.solver_adapter import ORToolsSolver
+from adapters.solver.heuristic_solver import HeuristicSolver
+from adapters.solver.portfolio_solver import PortfolioSolver
+from adapters.solver.whatif_session import get_whatif_sessions
+
+# Bu sayıdan fazla task instance varsa tek model yerine rolling horizon ile pencere pencere çözüyoruz.
+ROLLING_HORIZON_WINDOW = 500
 
 def _get_io(db: str):
     db = (db or "PG").upper()
@@ -17,6 +32,42 @@ def _get_io(db: str):
         return MongoReaderAdapter(), MongoPlanResultWriter()
     return PostgreSQLReaderAdapter(), PostgreSQLPlanResultWriter()
 
+def _solve_whatif(solver, tasks, config_version, locks, base_run_id, run_id, result_writer, logger):
+    """
+    Kilitli yeniden çözüm: aynı sipariş defteri için bu süreçte kurulmuş model varsa onu kullanır,
+    sadece kilit farkını uygular ve önceki planı ipucu olarak verir. Kullanılacak model yoksa ve bu bir what-if
+    düzenlemesi değilse (base_run_id yok) ya da model meşgulse None döner; normal yoldan çözülür.
+    """
+    store = get_whatif_sessions()
+    fingerprint = problem_fingerprint(tasks, config_version, solver_options={"mode": "whatif"})
+    session = store.get(fingerprint)
+    if session is None and not base_run_id:
+        return None  # İlk kilitli çözüm; oturum kurmanın getirisi yok.
+    if session is None or not solver.session_accepts(session, locks):
+        # Oturum yok ya da yeni kilitler modelin havuz/simetri/horizon seçimleriyle çelişiyor; bu kilitlerle yeniden kuralım.
+        session = solver.open_session(tasks, fingerprint, locks)
+        store.put(session)
+    else:
+        logger.info(f"Reusing what-if session {fingerprint[:12]} for run_id: {run_id}")
+    if not session.busy.acquire(blocking=False):
+        return None  # Aynı model başka bir thread'de çözülüyor; normal yoldan çözelim.
+    try:
+        if base_run_id and session.last_run_id == str(base_run_id):
+            hint_plan = session.last_results  # Temel run bu oturumda çözülmüş, DB'ye gitmeye gerek yok.
+        else:
+            hint_plan = result_writer.read_results(base_run_id) if base_run_id else None
+        results = solver.solve_session(session, locks, hint_plan=hint_plan)
+        session.last_run_id = str(run_id)
+        return results
+    finally:
+        session.busy.release()
+
+def _solver_metrics(solver, planner) -> dict:
+    # Rolling horizon'da her pencerenin istatistiği ayrı; tek modelde son solve çağrısınınki.
+    if planner is not None:
+        return {"windows": planner.window_stats}
+    return dict(getattr(solver, "last_run_stats", None) or {})
+
 # Burada name genel ad, terminalde bu yazacak. bind da Celery'e fonksiyonu çağırırken ilk argüman self al diyoruz.
 @app.task(name='backend.tasks.execute_planning_task', bind=True)
 def execute_planning_task(self, *args, **kwargs): # args argümanları tuple toplar, kwargs anahtar kelimeleri tuple toplar.
@@ -24,34 +75,147 @@ def execute_planning_task(self, *args, **kwargs): # args argümanları tuple top
     run_id = kwargs.pop("run_id", None) or (args[0] if args else None)
     db     = (kwargs.pop("db", None) or "PG").upper()
     locks  = kwargs.pop("locks", None) or (args[1] if len(args) > 1 else None)
+    base_run_id = kwargs.pop("base_run_id", None)
+    profile = get_solver_profile(kwargs.pop("profile", None))
+    publish_plan = bool(kwargs.pop("publish_plan", False)) # İlerleme olaylarına o anki planı da ekleyelim mi?
+    solver_kind = (kwargs.pop("solver", None) or "cpsat").lower() # cpsat | heuristic | portfolio
+    refresh = bool(kwargs.pop("refresh", False)) # Önbellekteki optimal olmayan planı kullanma, yeniden çöz.
     if run_id is None:
         raise ValueError("run_id is required")
 
+    # Aynı worker'da yan yana çözülen run'lar çekirdekleri paylaşsın: kuyruğun çekirdek payı / eşzamanlılık kadar thread.
+    queue = (self.request.delivery_info or {}).get("routing_key")
+    cores = cores_per_solve(queue)
+    if cores is not None:
+        profile = replace(profile, num_workers=min(profile.workers(), cores))
+
     # Daha öncesinde main'de olan wiring'lerimiz.
     logger = LoggerAdapter(level=logging.DEBUG)
     reader, result_writer = _get_io(db)
+    progress = RedisProgressPublisher(run_id) # Her iyileşen çözüm buradan status/SSE endpoint'lerine akar.
+    control = RedisRunControl()
 
-    logger.info(f"Task started for run_id: {run_id} (DB={db})")
+    def cancel_requested() -> bool:
+        return control.is_cancel_requested(run_id)
+
+    metrics = RunMetrics() # Aşama süreleri ve çözücü istatistikleri; run bitince plan_metadata'ya yazılır.
+    solver = planner = None
+
+    logger.info(
+        f"Task started for run_id: {run_id} (DB={db}, solver={solver_kind}, profile={profile.name}, "
+        f"queue={queue}, workers={profile.workers()})"
+    )
     try:
+        # Kuyruktayken iptal edildiyse hiç başlamayalım.
+        if cancel_requested():
+            result_writer.update_run_status(run_id, 'CANCELLED')
+            progress.finish('CANCELLED')
+            logger.info(f"Task cancelled before start for run_id: {run_id}")
+            return {'status': 'CANCELLED'}
+
         result_writer.update_run_status(run_id, 'RUNNING')
 
-        machine_config = MachineConfig("config/machine_config.json")
-        packages = reader.read_packages()
+        # Worker süreci içinde önbellekli; dosya değişmedikçe yeniden parse edilmez.
+        with metrics.stage("config"):
+            machine_config = MachineConfig.load("config/machine_config.json")
+        with metrics.stage("read"):
+            packages = reader.read_packages()
 
-        core = FJSMCore(machine_config, logger=logger)
-        task_instances = core.process_packages(packages)
+        with metrics.stage("process"):
+            core = FJSMCore(machine_config, logger=logger)
+            task_instances = core.process_packages(packages)
 
-        solver = ORToolsSolver(machine_config, logger=logger)
-        plan_results = solver.solve(task_instances, locks=locks or [])
+        # Sipariş defteri, config, kilitler ve profil aynıysa daha önce bulunan planı direkt döndürelim.
+        with metrics.stage("cache_lookup"):
+            cache = RedisSolutionCache(logger=logger)
+            fingerprint = problem_fingerprint(
+                task_instances, machine_config.version, locks,
+                solver_options={"solver": solver_kind, "profile": profile.solution_options(), "rolling_window": ROLLING_HORIZON_WINDOW},
+            )
+            cached = cache.get(fingerprint, optimal_only=refresh)
+        if cached is not None:
+            with metrics.stage("write"):
+                result_writer.write_results(run_id, cached["results"])
+            result_writer.update_run_status(
+                run_id, 'COMPLETED', makespan=cached["makespan"], solver_status=cached["solver_status"],
+                fingerprint=fingerprint, cache_hit=True, metrics=metrics.as_dict(),
+            )
+            progress.finish('COMPLETED', makespan=cached["makespan"], cache_hit=True)
+            logger.info(f"Task served from solution cache for run_id: {run_id} (source run: {cached.get('run_id')})")
+            return {'status': 'COMPLETED', 'makespan': cached["makespan"], 'cache_hit': True}
 
-        result_writer.write_results(run_id, plan_results)
+        with metrics.stage("solve"):
+            plan_results = None
+            if solver_kind == "heuristic":
+                # Sezgisel çözücü tüm listeyi tek seferde saniyeler içinde çizelgeler; pencereye bölmeye gerek yok.
+                solver = HeuristicSolver(machine_config, logger=logger)
+                plan_results = solver.solve(task_instances, locks=locks or [])
+            elif solver_kind == "portfolio":
+                solver = PortfolioSolver(
+                    machine_config, logger=logger, profile=profile,
+                    progress_callback=progress, cancel_check=cancel_requested, cores=cores,
+                )
+            else:
+                solver = ORToolsSolver(
+                    machine_config, logger=logger, profile=profile,
+                    progress_callback=progress, publish_plan=publish_plan,
+                    cancel_check=cancel_requested, cores=cores,
+                )
+            if plan_results is None and solver_kind == "cpsat" and locks and len(task_instances) <= ROLLING_HORIZON_WINDOW:
+                # Gantt'ta bir çubuğu sürüklemek gibi what-if düzenlemeleri modeli yeniden kurmadan çözülür.
+                plan_results = _solve_whatif(
+                    solver, task_instances, machine_config.version, locks, base_run_id, run_id, result_writer, logger
+                )
+            if plan_results is None:
+                # Kilitli yeniden çözümlerde temel run'ın planını ipucu olarak kullanıyoruz.
+                hint_plan = result_writer.read_results(base_run_id) if base_run_id else None
+                if len(task_instances) > ROLLING_HORIZON_WINDOW:
+                    planner = RollingHorizonPlanner(
+                        solver, logger=logger, window_size=ROLLING_HORIZON_WINDOW, machine_config=machine_config,
+                        greedy=HeuristicSolver(machine_config, logger=logger),
+                    )
+                    plan_results = planner.plan(task_instances, locks=locks or [], hint_plan=hint_plan)
+                else:
+                    plan_results = solver.solve(task_instances, locks=locks or [], hint_plan=hint_plan)
+
+        with metrics.stage("write"):
+            result_writer.write_results(run_id, plan_results)
         makespan = max((r.end_time for r in plan_results), default=0)
-        result_writer.update_run_status(run_id, 'COMPLETED', makespan=makespan, solver_status="OPTIMAL")
+        solver_status = solver.last_status or "FEASIBLE"
+        if planner is not None and planner.greedy_fallback:
+            solver_status = "HEURISTIC"
+        metrics.solver = _solver_metrics(solver, planner)
+        result_writer.update_run_status(
+            run_id, 'COMPLETED', makespan=makespan, solver_status=solver_status,
+            fingerprint=fingerprint, cache_hit=False, metrics=metrics.as_dict(),
+        )
+        cache.put(fingerprint, plan_results, makespan=makespan, solver_status=solver_status, run_id=run_id)
 
+        progress.finish('COMPLETED', makespan=makespan)
         logger.info(f"Task completed successfully for run_id: {run_id}")
         return {'status': 'COMPLETED', 'makespan': makespan}
 
+    except SolveCancelled as e:
+        # Kullanıcı durdurdu: o ana kadarki en iyi planı saklayıp worker'ı hemen serbest bırakıyoruz.
+        metrics.solver = _solver_metrics(solver, planner)
+        if e.results:
+            with metrics.stage("write"):
+                result_writer.write_results(run_id, e.results)
+            makespan = max(r.end_time for r in e.results)
+            result_writer.update_run_status(
+                run_id, 'CANCELLED_WITH_INCUMBENT', makespan=makespan, solver_status="FEASIBLE", metrics=metrics.as_dict(),
+            )
+            progress.finish('CANCELLED_WITH_INCUMBENT', makespan=makespan)
+            logger.info(f"Task cancelled for run_id: {run_id}, incumbent makespan: {makespan}")
+            return {'status': 'CANCELLED_WITH_INCUMBENT', 'makespan': makespan}
+        result_writer.update_run_status(run_id, 'CANCELLED', metrics=metrics.as_dict())
+        progress.finish('CANCELLED')
+        logger.info(f"Task cancelled for run_id: {run_id} before any solution was found")
+        return {'status': 'CANCELLED'}
+
     except Exception as e:
         logger.error(f"Task failed for run_id: {run_id}. Error: {e}", exc_info=True)
-        result_writer.update_run_status(run_id, 'FAILED', error_message=str(e))
+        metrics.solver = _solver_metrics(solver, planner)
+        result_writer.update_run_status(run_id, 'FAILED', error_message=str(e), metrics=metrics.as_dict())
+        progress.finish('FAILED', error=str(e))
         raise
@@ -0,0 +1,61 @@
+# benchmarks/instance_generator.py
+
+import random
+from typing import List
+from config.machine_config_loader import MachineConfig
+from core.models.data_model import JobDTO, PackageDTO, TaskDTO
+
+def _expected_instances(task: TaskDTO) -> int:
+    return task.count if task.type == "split" else 1
+
+def generate_packages(
+    config: MachineConfig,
+    target_instances: int,
+    seed: int = 42,
+    split_ratio: float = 0.4,
+    max_split: int = 4,
+    jobs_per_package: int = 10,
+) -> List[PackageDTO]:
+    """
+    Gerçek machine_config üzerinden tekrarlanabilir (seed'li) sentetik paket/job/görev seti üretir.
+    Her job config'deki görev tiplerini faz sırasıyla içerir; görevlerin bir kısmı split (2..max_split parça).
+    Toplam task instance sayısı target_instances'a ulaşınca durur (son job yüzünden biraz aşabilir).
+    """
+    rnd = random.Random(seed)
+    task_types = config.all_tasks()  # Dosyadaki sıra faz sırası: kesme, oyma, bükme, yanak_açma.
+    families = {t: config.get_available_machines(t) for t in task_types}
+
+    packages: List[PackageDTO] = []
+    jobs: List[JobDTO] = []
+    produced = 0
+    job_id = 1
+    while produced < target_instances:
+        tasks: List[TaskDTO] = []
+        for order, task_type in enumerate(task_types, start=1):
+            machines = families[task_type]
+            # Bazı görevler ailenin sadece bir kısmında yapılabilir; en az yarısı aday kalsın.
+            if len(machines) > 2 and rnd.random() < 0.3:
+                k = rnd.randint((len(machines) + 1) // 2, len(machines))
+                machines = sorted(rnd.sample(machines, k), key=machines.index)
+            name = task_type.replace("_", " ")  # Veritabanındaki isimler boşluklu geliyor.
+            if rnd.random() < split_ratio and len(machines) >= 2:
+                count = rnd.randint(2, min(max_split, len(machines)))
+                task = TaskDTO(name=name, type="split", order=order, count=count, eligible_machines=list(machines))
+            else:
+                task = TaskDTO(name=name, type="single", order=order, eligible_machines=list(machines))
+            tasks.append(task)
+            produced += _expected_instances(task)
+        jobs.append(JobDTO(job_id=job_id, tasks=tasks))
+        job_id += 1
+
+        if len(jobs) == jobs_per_package or produced >= target_instances:
+            package_id = len(packages) + 1
+            packages.append(PackageDTO(
+                package_id=package_id,
+                deadline=str(1000 * package_id + rnd.randint(0, 500)),
+                jobs=jobs,
+                source="BENCH",
+                uid=f"BENCH-{package_id}",
+            ))
+            jobs = []
+    return packages
@@ -0,0 +1,252 @@
+# benchmarks/run_benchmarks.py
+"""
+FJSP hattının benchmark'ı. Örnek:
+
+    python -m benchmarks.run_benchmarks --sizes 50 200 500 --profile fast --output benchmarks/results/latest.json
+    python -m benchmarks.run_benchmarks --sizes 50 200 --baseline benchmarks/results/latest.json
+    python -m benchmarks.run_benchmarks --sizes 50 200 --formulation both
+
+Her boyut için aşama sürelerini (üretim/okuma, process_packages, model kurma, Stage 1, Stage 2, yazma),
+makespan'i ve alt sınıra göre boşluğu JSON olarak yazar. --baseline verilirse geriye gidişte 1 ile çıkar.
+--formulation both iki modeli de çözer; ikisi de optimal olup makespan'leri farklıysa 1 ile çıkar.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from adapters.logging.logger_adapter import LoggerAdapter
+from adapters.solver.heuristic_solver import HeuristicSolver
+from adapters.solver.solver_adapter import ORToolsSolver
+from benchmarks.instance_generator import generate_packages
+from config.machine_config_loader import MachineConfig
+from config.solver_profiles import SOLVER_PROFILES, get_solver_profile
+from core.fjsm_core import FJSMCore
+from core.models.data_model import PlanResultDTO, TaskInstanceDTO
+from core.ports.solver_port import ISolverPort
+from core.rolling_horizon import RollingHorizonPlanner
+
+DEFAULT_SIZES = [50, 200, 500, 1000, 2000, 5000]
+ROLLING_HORIZON_WINDOW = 500  # backend/tasks.py ile aynı eşik.
+FORMULATIONS = ("standard", "compact")
+
+class _StatsRecorder(ISolverPort):
+    """Rolling horizon her pencere için solve çağırıyor; her çağrının istatistiğini toplayalım."""
+    def __init__(self, solver: ORToolsSolver):
+        self.solver = solver
+        self.windows: List[dict] = []
+
+    def solve(self, tasks, locks=None, hint_plan=None):
+        try:
+            return self.solver.solve(tasks, locks=locks, hint_plan=hint_plan)
+        finally:
+            self.windows.append(dict(self.solver.last_run_stats))
+
+def lower_bound(tasks: List[TaskInstanceDTO], config: MachineConfig) -> int:
+    """
+    Basit makespan alt sınırı: en uzun job zinciri (her fazın en kısa süresi) ile
+    toplam minimum iş yükünün makine sayısına bölümünün büyüğü.
+    """
+    phase_min: Dict[int, Dict[int, int]] = defaultdict(dict)
+    total_work = 0
+    machines = set()
+    for t in tasks:
+        row = config.durations_for(t.base_name)
+        d = min(row[m] for m in t.machine_candidates if m in row)
+        phase = phase_min[t.job_id]
+        phase[t.order] = max(phase.get(t.order, 0), d)
+        total_work += d
+        machines.update(t.machine_candidates)
+    chain = max((sum(p.values()) for p in phase_min.values()), default=0)
+    load = -(-total_work // max(len(machines), 1))
+    return max(chain, load)
+
+def _get_writer(db: Optional[str]):
+    if not db:
+        return None
+    if db.upper() == "MONGO":
+        from adapters.driven.mongo_plan_result_writer_adapter import MongoPlanResultWriter
+        return MongoPlanResultWriter()
+    from adapters.driven.plan_result_writer_adapter import PostgreSQLPlanResultWriter
+    return PostgreSQLPlanResultWriter()
+
+def run_case(
+    size: int,
+    seed: int,
+    profile_name: str,
+    config: MachineConfig,
+    logger,
+    writer=None,
+    formulation: str = "standard",
+) -> dict:
+    timings: Dict[str, Optional[float]] = {}
+
+    t0 = time.perf_counter()
+    packages = generate_packages(config, size, seed=seed)
+    timings["read"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    tasks = FJSMCore(config, logger=logger).process_packages(packages)
+    timings["process"] = time.perf_counter() - t0
+
+    profile = get_solver_profile(profile_name)
+    recorder = _StatsRecorder(ORToolsSolver(config, logger=logger, profile=profile, compact=formulation == "compact"))
+    t0 = time.perf_counter()
+    error = None
+    results: List[PlanResultDTO] = []
+    try:
+        if len(tasks) > ROLLING_HORIZON_WINDOW:
+            planner = RollingHorizonPlanner(
+                recorder, logger=logger, window_size=ROLLING_HORIZON_WINDOW, machine_config=config,
+                greedy=HeuristicSolver(config, logger=logger),
+            )
+            results = planner.plan(tasks, locks=[])
+        else:
+            results = recorder.solve(tasks, locks=[])
+    except Exception as e:  # Başarısız boyut da sonuçta görünsün; diğer boyutlara devam edelim.
+        error = str(e)
+    timings["solve_total"] = time.perf_counter() - t0
+    for stage in ("build", "stage1", "lns", "stage2"):
+        timings[stage] = sum(w.get(f"{stage}_seconds", 0.0) for w in recorder.windows)
+    model_size = {
+        "variables": sum(w.get("model_variables", 0) for w in recorder.windows),
+        "constraints": sum(w.get("model_constraints", 0) for w in recorder.windows),
+    }
+
+    timings["write"] = None
+    if writer is not None and results:
+        run_id = uuid.uuid4()
+        t0 = time.perf_counter()
+        writer.create_run_record(run_id, solver_profile=f"bench:{profile_name}")
+        writer.write_results(run_id, results)
+        writer.update_run_status(run_id, "COMPLETED", makespan=max(r.end_time for r in results), solver_status="BENCHMARK")
+        timings["write"] = time.perf_counter() - t0
+
+    makespan = max((r.end_time for r in results), default=None)
+    lb = lower_bound(tasks, config)
+    return {
+        "size": size,
+        "instances": len(tasks),
+        "jobs": len({t.job_id for t in tasks}),
+        "windows": len(recorder.windows),
+        "profile": profile.as_dict(),
+        "formulation": formulation,
+        "model": model_size,
+        "timings": timings,
+        "makespan": makespan,
+        "lower_bound": lb,
+        "gap_to_lower_bound": (makespan - lb) / makespan if makespan else None,
+        "stage1_bound": recorder.windows[-1].get("stage1_bound") if len(recorder.windows) == 1 else None,
+        "solver_status": [w.get("stage2_status") for w in recorder.windows],
+        "stage1_optimal": bool(recorder.windows) and all(w.get("stage1_status") == "OPTIMAL" for w in recorder.windows),
+        "error": error,
+    }
+
+def compare(current: List[dict], baseline: List[dict], time_tolerance: float, quality_tolerance: float) -> List[str]:
+    """Baseline'a göre yavaşlayan model kurma süresini ve kötüleşen makespan'i listeler."""
+    key = lambda c: (c["size"], c["profile"]["name"], c.get("formulation", "standard"))
+    previous = {key(c): c for c in baseline}
+    problems = []
+    for case in current:
+        old = previous.get(key(case))
+        if old is None:
+            continue
+        label = f"size={case['size']} profile={case['profile']['name']} formulation={key(case)[2]}"
+        if case["error"] and not old.get("error"):
+            problems.append(f"{label}: failed ({case['error']})")
+            continue
+        old_build, new_build = old["timings"].get("build") or 0.0, case["timings"].get("build") or 0.0
+        if old_build > 0 and new_build > old_build * time_tolerance:
+            problems.append(f"{label}: model build {new_build:.2f}s vs baseline {old_build:.2f}s")
+        if old.get("makespan") and case.get("makespan") and case["makespan"] > old["makespan"] * quality_tolerance:
+            problems.append(f"{label}: makespan {case['makespan']} vs baseline {old['makespan']}")
+    return problems
+
+def compare_formulations(cases: List[dict]) -> List[str]:
+    """Aynı boyutta iki model de optimali ispatladıysa makespan'leri aynı olmalı; farklı olanları listeler."""
+    by_size: Dict[int, Dict[str, dict]] = defaultdict(dict)
+    for case in cases:
+        by_size[case["size"]][case["formulation"]] = case
+    problems = []
+    for size, variants in sorted(by_size.items()):
+        standard, compact = variants.get("standard"), variants.get("compact")
+        if not standard or not compact or not (standard["stage1_optimal"] and compact["stage1_optimal"]):
+            continue
+        if standard["makespan"] != compact["makespan"]:
+            problems.append(
+                f"size={size}: optimal makespan differs (standard {standard['makespan']}, compact {compact['makespan']})"
+            )
+    return problems
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="FJSP pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Hedef task instance sayıları")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--profile", choices=sorted(SOLVER_PROFILES), default="fast")
+    parser.add_argument("--config", default="config/machine_config.json")
+    parser.add_argument("--write-db", choices=["PG", "MONGO"], default=None, help="Yazma aşamasını da ölç (gerçek DB gerekir)")
+    parser.add_argument("--output", default=None, help="JSON çıktı dosyası (verilmezse stdout)")
+    parser.add_argument("--baseline", default=None, help="Karşılaştırılacak önceki JSON çıktısı")
+    parser.add_argument("--time-tolerance", type=float, default=1.5)
+    parser.add_argument("--quality-tolerance", type=float, default=1.05)
+    parser.add_argument("--formulation", choices=[*FORMULATIONS, "both"], default="standard", help="Model formülasyonu")
+    args = parser.parse_args(argv)
+
+    logger = LoggerAdapter(level=logging.WARNING)
+    config = MachineConfig.load(args.config)
+    writer = _get_writer(args.write_db)
+
+    formulations = FORMULATIONS if args.formulation == "both" else (args.formulation,)
+    cases = []
+    for size in args.sizes:
+        for formulation in formulations:
+            case = run_case(size, args.seed, args.profile, config, logger, writer, formulation=formulation)
+            t = case["timings"]
+            print(
+                f"size={size:>5} {formulation:<8} inst={case['instances']:>5} makespan={case['makespan']} "
+                f"lb={case['lower_bound']} vars={case['model']['variables']} cons={case['model']['constraints']} "
+                f"build={t['build']:.2f}s s1={t['stage1']:.2f}s s2={t['stage2']:.2f}s total={t['solve_total']:.2f}s"
+                + (f" ERROR={case['error']}" if case["error"] else ""),
+                file=sys.stderr,
+            )
+            cases.append(case)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config_version": config.version,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "cases": cases,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    problems = []
+    if args.formulation == "both":
+        mismatches = compare_formulations(cases)
+        for p in mismatches:
+            print(f"MISMATCH {p}", file=sys.stderr)
+        problems += mismatches
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["cases"]
+        regressions = compare(cases, baseline, args.time_tolerance, args.quality_tolerance)
+        for p in regressions:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        problems += regressions
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
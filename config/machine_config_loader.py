@@ -1,15 +1,61 @@
 # adapters/config/machine_config_loader.py
 
+import hashlib
 import json
-from typing import Dict
+import os
+import threading
+from typing import Dict, List, Tuple
 
 class MachineConfig:
+    # Worker süreci başına path -> (mtime_ns, size, MachineConfig) önbelleği. load() bunu kullanır.
+    _cache: Dict[str, Tuple[int, int, "MachineConfig"]] = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self, path: str):
-        with open(path, 'r', encoding='utf-8') as f:
-            # Her bir değeri dict olan bir sözlüğümüz var. Ulaşmak istediğimiz yapı yapılacak iş tipi, makine ve süresi.
-            # Dict[str, str, int] diye bir yapı yok.
-            # Tuple kullanmak da O(n) karmaşıklığa sahip olduğundan bu şekilde iç içe kullanıyoruz.
-            self._config: Dict[str, Dict[str, int]] = json.load(f)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        # Dosya içeriğinin hash'i config'in versiyonu gibi; çözüm önbelleği gibi yerler bunu anahtar olarak kullanabilir.
+        self.version = hashlib.sha256(raw).hexdigest()[:16]
+        # Her bir değeri dict olan bir sözlüğümüz var. Ulaşmak istediğimiz yapı yapılacak iş tipi, makine ve süresi.
+        # Dict[str, str, int] diye bir yapı yok.
+        # Tuple kullanmak da O(n) karmaşıklığa sahip olduğundan bu şekilde iç içe kullanıyoruz.
+        self._config: Dict[str, Dict[str, int]] = json.loads(raw.decode('utf-8'))
+        self._compile()
+
+    @classmethod
+    def load(cls, path: str) -> "MachineConfig":
+        """
+        Süreç içinde önbelleğe alınmış config'i döner. Dosyanın mtime'ı ya da boyutu değiştiyse yeniden okur;
+        içerik hash'i aynı kaldıysa eski (derlenmiş) nesneyi kullanmaya devam eder.
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+            fresh = cls(key)
+            if cached and cached[2].version == fresh.version:
+                fresh = cached[2]  # Dosyaya dokunulmuş ama içerik aynı.
+            cls._cache[key] = (stat.st_mtime_ns, stat.st_size, fresh)
+            return fresh
+
+    def _compile(self) -> None:
+        # Model kurarken her task için satırı tek aramada veren tablolar; süre 0 olan makineler baştan eleniyor.
+        # machine_names / machine_index: makinelerin yoğun (0..n-1) integer index'leri (NumPy tabanlı çözücü için).
+        machines = set()
+        for machine_map in self._config.values():
+            machines.update(machine_map.keys())
+        self.machine_names: List[str] = sorted(machines)
+        self.machine_index: Dict[str, int] = {m: i for i, m in enumerate(self.machine_names)}
+        # Görev başına sadece süresi 0'dan büyük olan makineler ve süreleri.
+        self._valid: Dict[str, Dict[str, int]] = {
+            t: {m: d for m, d in machine_map.items() if d > 0} for t, machine_map in self._config.items()
+        }
+        # Makine başına tüm görev tiplerindeki süre profili (birbirinin aynısı makineleri bulmak için).
+        self._profiles: Dict[str, Tuple[int, ...]] = {
+            m: tuple(int(machine_map.get(m, 0)) for machine_map in self._config.values()) for m in self.machine_names
+        }
 
     # _config dict'ine doğrudan erişmek yerine metotlarla erişiyoruz.
     def get_duration(self, task_name: str, machine_name: str) -> int:
@@ -20,12 +66,20 @@ class MachineConfig:
         # Yoksa 0 döndürüyoruz ki çökme yaşanmasın.
         return self._config.get(task_name, {}).get(machine_name, 0)
 
+    def durations_for(self, task_name: str) -> Dict[str, int]:
+        """Görevin çalışabildiği makineler ve süreleri (sadece > 0). Tek aramada tüm satırı verir; değiştirilmemeli."""
+        return self._valid.get(task_name, {})
+
+    def machine_profile(self, machine_name: str) -> Tuple[int, ...]:
+        """Makinenin tüm görev tiplerindeki süreleri, all_tasks() sırasıyla."""
+        return self._profiles.get(machine_name, ())
+
     def get_available_machines(self, task_name: str) -> list[str]:
         """Süresi 0'dan büyük olan makineleri döner."""
         # task_name kesme veya oyma idi.
         # Bu kesme veya oymada, hangisi ise task, onun makineleri items ile taranır.
         # Bu tarama sonucu içinde 0 kontrolü yapılır.
-        return [m for m, dur in self._config.get(task_name, {}).items() if dur > 0]
+        return list(self.durations_for(task_name).keys())
 
     def has_task(self, task_name: str) -> bool:
         """
@@ -47,12 +101,5 @@ class MachineConfig:
         """
         Makinelerin listesini döner.
         """
-        # Boş bir küme yaratılır.
-        all_m = set()
-        # Tüm makinelerin iç makine-süreleri gezilir. (K#1, K#2...)
-        for machine_map in self._config.values():
-            # Her makinenin ismi kümeye eklenir.
-            # Update sayesinde önceden var olanlar eklenmez.
-            all_m.update(machine_map.keys())
-        # Tüm makineleri alfabetik sıralayarak döndürür.
-        return sorted(all_m)
+        # Derleme sırasında tüm makineler alfabetik sıralanıp saklandı.
+        return list(self.machine_names)
@@ -10,4 +10,43 @@ MONGODB_CONFIG = {
     "uri": "your_uri",
     "db_name": "your_dbname",
     "collection": "your_collection",
-}
\ No newline at end of file
+}
+
+REDIS_URL = "redis://localhost:6379/0"
+
+# Süreç başına bağlantı havuzu ayarları (opsiyonel, verilmezse varsayılanlar kullanılır).
+POOL_CONFIG = {
+    "pg_minconn": 1,
+    "pg_maxconn": 10,
+    "pg_health_check_after": 30.0,
+    "pg_acquire_timeout": 30.0,
+    "mongo_max_pool_size": 50,
+    "redis_max_connections": 50,
+}
+
+# Çözüm önbelleği: aynı problem tekrar çözülmek istenirse kayıtlı plan döner (opsiyonel).
+SOLUTION_CACHE_CONFIG = {
+    "enabled": True,
+    "ttl_seconds": 7 * 24 * 60 * 60,
+    "max_entries": 200,
+}
+
+# API tarafındaki run durumu / Gantt önbelleği (opsiyonel, verilmezse varsayılanlar kullanılır).
+READ_CACHE_CONFIG = {
+    "enabled": True,
+    "memory_max_bytes": 64 * 1024 * 1024,
+    "ttl_seconds": 7 * 24 * 60 * 60,
+    "live_ttl_seconds": 2,
+}
+
+# Celery worker topolojisi (opsiyonel, verilmezse varsayılanlar kullanılır). concurrency değerleri run.txt'teki
+# --concurrency ile aynı olmalı; her run (total_cores x core_share) / concurrency kadar çekirdek kullanır.
+WORKER_CONFIG = {
+    "total_cores": 0,
+    "small_max_instances": 500,
+    "default_eta_seconds": 120.0,
+    "queues": {
+        "plans.small": {"concurrency": 4, "core_share": 0.5},
+        "plans.large": {"concurrency": 1, "core_share": 0.5},
+    },
+}
@@ -0,0 +1,74 @@
+# config/solver_profiles.py
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+@dataclass(frozen=True)
+class SolverProfile:
+    name: str
+    time_budget: float  # İki aşamanın toplam süre bütçesi (saniye).
+    stage1_share: float  # Bütçenin Stage 1'e (makespan) ayrılan oranı, kalanı Stage 2'ye.
+    num_workers: int  # CP-SAT arama thread sayısı. 0 ise makinedeki tüm çekirdekler.
+    relative_gap_limit: float  # Üst sınır ile alt sınır arasındaki oransal fark bu değerin altına inerse dur.
+    no_improvement_window: Optional[float] = None  # Bu kadar saniye iyileşme olmazsa aramayı erken bitir.
+    lns_share: float = 0.0  # Stage 1 optimal değilse bütçenin bu oranı LNS ile makespan'i iyileştirmeye ayrılır.
+
+    def stage1_limit(self) -> float:
+        return self.time_budget * self.stage1_share
+
+    def lns_limit(self) -> float:
+        return self.time_budget * self.lns_share
+
+    def stage2_limit(self, elapsed: float) -> float:
+        # Stage 1 (ve LNS) erken biterse artan süreyi Stage 2'ye devrediyoruz. Geç biterse (model kurma, süreç açma,
+        # bileşenleri bekleme) Stage 2 yine kendi payını alır.
+        return max(1.0, self.time_budget * (1.0 - self.stage1_share - self.lns_share), self.time_budget - elapsed)
+
+    def workers(self) -> int:
+        return self.num_workers or (os.cpu_count() or 1)
+
+    def solution_options(self) -> Dict[str, object]:
+        """
+        Bulunan planı etkileyen ayarlar (süre bütçesi, aşama payları, durma koşulları). Thread sayısı makineye ve
+        worker kuyruğuna göre değiştiği için dışarıda; çözüm önbelleği anahtarı bununla kurulur.
+        """
+        return {
+            "name": self.name,
+            "time_budget": self.time_budget,
+            "stage1_share": self.stage1_share,
+            "relative_gap_limit": self.relative_gap_limit,
+            "no_improvement_window": self.no_improvement_window,
+            "lns_share": self.lns_share,
+        }
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "time_budget": self.time_budget,
+            "stage1_share": self.stage1_share,
+            "num_workers": self.workers(),
+            "relative_gap_limit": self.relative_gap_limit,
+            "no_improvement_window": self.no_improvement_window,
+            "lns_share": self.lns_share,
+        }
+
+# fast: canlı önizleme ve küçük paketler için. balanced: eski davranışa yakın (2 x 60 sn).
+# thorough: gece koşuları gibi zamanın önemli olmadığı durumlar için.
+SOLVER_PROFILES: Dict[str, SolverProfile] = {
+    "fast": SolverProfile("fast", time_budget=15.0, stage1_share=0.7, num_workers=8,
+                          relative_gap_limit=0.05, no_improvement_window=3.0),
+    "balanced": SolverProfile("balanced", time_budget=120.0, stage1_share=0.4, num_workers=0,
+                              relative_gap_limit=0.01, no_improvement_window=20.0, lns_share=0.2),
+    "thorough": SolverProfile("thorough", time_budget=600.0, stage1_share=0.4, num_workers=0,
+                              relative_gap_limit=0.0, no_improvement_window=None, lns_share=0.3),
+}
+
+DEFAULT_SOLVER_PROFILE = "balanced"
+
+def get_solver_profile(name: Optional[str]) -> SolverProfile:
+    """İsimden profili döner. İsim verilmezse varsayılan profil; bilinmeyen isimde ValueError."""
+    key = (name or DEFAULT_SOLVER_PROFILE).strip().lower()
+    if key not in SOLVER_PROFILES:
+        raise ValueError(f"Unknown solver profile '{name}'. Valid: {', '.join(SOLVER_PROFILES)}")
+    return SOLVER_PROFILES[key]
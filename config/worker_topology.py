@@ -0,0 +1,79 @@
+# config/worker_topology.py
+
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+try:
+    from config.settings import WORKER_CONFIG
+except ImportError:
+    WORKER_CONFIG = {}
+
+@dataclass(frozen=True)
+class QueueSpec:
+    name: str
+    concurrency: int  # Bu kuyruğu dinleyen worker'ın aynı anda çözdüğü run sayısı (--concurrency).
+    core_share: float  # Makinedeki çekirdeklerin bu kuyruğa ayrılan oranı.
+
+# Küçük problemler çok sayıda ve kısa sürer; az çekirdekle yan yana çözülür. Büyükler az sayıda ama çok çekirdekli.
+_DEFAULTS = {
+    "total_cores": 0,  # 0 ise makinedeki tüm çekirdekler.
+    "small_max_instances": 500,  # Bu kadar task instance'a kadar olan run'lar küçük kuyruğa gider.
+    "default_eta_seconds": 120.0,  # Kuyrukta hiç bitmiş run yokken tek run için tahmini süre.
+    "queues": {
+        "plans.small": {"concurrency": 4, "core_share": 0.5},
+        "plans.large": {"concurrency": 1, "core_share": 0.5},
+    },
+}
+
+SMALL_QUEUE = "plans.small"
+LARGE_QUEUE = "plans.large"
+
+# Prefork çocuklarında run'lar yan yana çözülür; --pool=solo ile tek run tüm çekirdekleri kullanmaya devam eder.
+_shared_worker = False
+
+def mark_shared_worker() -> None:
+    global _shared_worker
+    _shared_worker = True
+
+def _setting(key: str):
+    return WORKER_CONFIG.get(key, _DEFAULTS[key])
+
+def total_cores() -> int:
+    return int(_setting("total_cores")) or (os.cpu_count() or 1)
+
+def queue_specs() -> Dict[str, QueueSpec]:
+    raw = _setting("queues")
+    return {
+        name: QueueSpec(name, max(1, int(spec.get("concurrency", 1))), float(spec.get("core_share", 0.5)))
+        for name, spec in raw.items()
+    }
+
+def queue_for(instance_count: Optional[int]) -> str:
+    """Task instance sayısına göre kuyruk. Sayı bilinmiyorsa büyük kuyruk; küçük worker'ı tıkamasın."""
+    if instance_count is not None and instance_count <= int(_setting("small_max_instances")):
+        return SMALL_QUEUE
+    return LARGE_QUEUE
+
+def cores_per_solve(queue: Optional[str]) -> Optional[int]:
+    """
+    Bir run'ın kullanabileceği çekirdek sayısı: kuyruğun çekirdek payı / eşzamanlılık. Aynı makinede yan yana
+    çözülen run'lar birbirinin thread'lerini ezmesin diye. Solo worker'da ya da bilinmeyen kuyrukta None.
+    """
+    if not _shared_worker:
+        return None
+    spec = queue_specs().get(queue or "")
+    if spec is None:
+        return None
+    return max(1, int(total_cores() * spec.core_share) // spec.concurrency)
+
+def queue_eta_seconds(queue: str, position: int, avg_seconds: Optional[float]) -> float:
+    """
+    Kuyrukta önünde position kadar run olan bir run'ın bitmesine kalan tahmini süre: önündekiler concurrency'lik
+    dalgalar halinde biter, sonra kendisi çözülür. Ortalama, kuyruğun son bitmiş run'larından gelir.
+    """
+    spec = queue_specs().get(queue)
+    concurrency = spec.concurrency if spec else 1
+    per_run = avg_seconds or float(_setting("default_eta_seconds"))
+    return round((math.floor(position / concurrency) + 1) * per_run, 1)
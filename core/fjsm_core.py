@@ -19,10 +19,9 @@ class FJSMCore(IFJSMCore):
             for job in package.jobs:
                 for task in job.tasks:
                     task_key = task.name.replace(" ", "_")
-                    valid_machines = [
-                        m for m in task.eligible_machines
-                        if self.machine_config.get_duration(task_key, m) > 0
-                    ]
+                    # Görevin süre satırını bir kez alıp üyelik kontrolüyle süzüyoruz.
+                    durations = self.machine_config.durations_for(task_key)
+                    valid_machines = [m for m in task.eligible_machines if m in durations]
 
                     if not valid_machines:
                         self.logger.error(f"No valid machines for task '{task.name}' in job {job.job_id}")
@@ -36,6 +35,7 @@ class FJSMCore(IFJSMCore):
                             job_id=job.job_id,
                             package_id=package.package_id,
                             package_uid=package.uid,
+                            deadline=package.deadline,
                             suffix=None,
                             override_machines=valid_machines
                         )
@@ -54,6 +54,7 @@ class FJSMCore(IFJSMCore):
                                 job_id=job.job_id,
                                 package_id=package.package_id,
                                 package_uid=package.uid,
+                                deadline=package.deadline,
                                 suffix=f"_{i}",
                                 override_machines=valid_machines
                             )
@@ -63,13 +64,8 @@ class FJSMCore(IFJSMCore):
                         self.logger.error(f"Unknown task type '{task.type}' in job {job.job_id}")
                         raise ValueError(f"Unknown task type: {task.type}")
 
+        # Artık kırpma yapmıyoruz; büyük listeler rolling horizon ile pencere pencere çözülüyor.
         self.logger.debug(f"Toplam task instance sayısı: {len(all_task_instances)}")
-
-        # Eğer çok fazlaysa ilk 1000 instance ile sınırlıyoruz.
-        if len(all_task_instances) > 500:
-            self.logger.warning("Task instance sayısı 1000'i geçti. İlk 1000 ile sınırlandırılıyor.")
-            return all_task_instances[:1000]
-
         return all_task_instances
 
     def _create_task_instance(
@@ -78,6 +74,7 @@ class FJSMCore(IFJSMCore):
         job_id: int,
         package_id: int,
         package_uid: str | None,
+        deadline: str | None,
         suffix: str | None,
         override_machines: List[str] | None = None
     ) -> TaskInstanceDTO:
@@ -97,6 +94,7 @@ class FJSMCore(IFJSMCore):
             job_id=job_id,
             package_id=package_id,
             package_uid=package_uid,
+            deadline=deadline,
             order=task.order,
             name=instance_name,
             base_name=base_name,
@@ -0,0 +1,48 @@
+# core/instrumentation.py
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import resource  # Sadece Unix'te var; Windows'ta tepe bellek bilgisi olmadan devam ediyoruz.
+except ImportError:
+    resource = None
+
+def peak_rss_mb() -> Optional[float]:
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (MB). Ölçülemiyorsa None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürüyor.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+class RunMetrics:
+    """
+    Bir run'ın aşama aşama duvar saati ve CPU süresi (okuma, process_packages, model, Stage 1/2, yazma),
+    çözücü istatistikleri ve tepe bellek kullanımı. Sonuç plan_metadata'ya JSON olarak yazılır.
+    """
+    def __init__(self) -> None:
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.solver: dict = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        """with içindeki kodun süresini name aşamasına ekler; aynı aşama birden çok kez ölçülürse toplanır."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0})
+            entry["wall_seconds"] = round(entry["wall_seconds"] + time.perf_counter() - wall, 4)
+            entry["cpu_seconds"] = round(entry["cpu_seconds"] + time.process_time() - cpu, 4)
+
+    def as_dict(self) -> dict:
+        return {
+            "stages": self.stages,
+            "solver": self.solver,
+            "total_wall_seconds": round(time.perf_counter() - self._started, 4),
+            "peak_rss_mb": peak_rss_mb(),
+        }
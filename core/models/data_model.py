@@ -37,6 +37,7 @@ class TaskInstanceDTO:
     base_name: Optional[str] = None  # Orijinal görevin ismini tutuyoruz. (suffix eklemek için)
     package_id: Optional[int] = None
     package_uid: Optional[str] = None
+    deadline: Optional[str] = None  # Paketin deadline'ı, rolling horizon pencerelerini sıralamak için.
 
 # Solver'ın sonucunu döndürüyoruz. Bunu tutan listemiz.
 @dataclass
@@ -0,0 +1,33 @@
+# core/ports/solver_port.py
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from core.models.data_model import TaskInstanceDTO, PlanResultDTO
+
+class SolveCancelled(Exception):
+    """
+    Çözüm kullanıcı isteğiyle yarıda kesildiğinde fırlatılır.
+    results, o ana kadar bulunan en iyi planı taşır (hiç çözüm yoksa boş liste).
+    """
+    def __init__(self, results: Optional[List[PlanResultDTO]] = None):
+        super().__init__("Solve cancelled by request.")
+        self.results = results or []
+
+class ISolverPort(ABC):
+    """
+    Task instance listesini plana çeviren çözücülerin sözleşmesidir.
+    """
+    @abstractmethod
+    def solve(
+        self,
+        tasks: List[TaskInstanceDTO],
+        locks: Optional[list] = None,
+        hint_plan: Optional[List[PlanResultDTO]] = None,
+    ) -> List[PlanResultDTO]:
+        """
+        Görevleri makinelere ve zamanlara atar.
+        locks: {"task_instance_id", "machine", "start_min"} görev kilitleri ya da
+        {"machine", "start_min", "end_min"} makine blokları (o aralıkta makine dolu).
+        hint_plan: önceki bir planın sonuçları; çözücü bunları başlangıç ipucu olarak kullanabilir.
+        """
+        pass
@@ -0,0 +1,205 @@
+# core/rolling_horizon.py
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from config.machine_config_loader import MachineConfig
+from core.models.data_model import TaskInstanceDTO, PlanResultDTO
+from core.ports.logging_port import ILoggingPort
+from core.ports.solver_port import ISolverPort, SolveCancelled
+
+def _deadline_key(deadline: Optional[str]):
+    # Deadline bazen sayı (10000), bazen tarih string'i olabiliyor. Sayıları önce, diğerlerini alfabetik sıralıyoruz.
+    try:
+        return (0, float(deadline))
+    except (TypeError, ValueError):
+        return (1, str(deadline or ""))
+
+def _plan_score(results: List[PlanResultDTO]) -> Tuple[int, int]:
+    # Önce makespan, eşitlikte toplam bitiş; iki planın hangisinin daha iyi olduğuna bununla bakıyoruz.
+    return max((r.end_time for r in results), default=0), sum(r.end_time for r in results)
+
+class RollingHorizonPlanner:
+    """
+    Büyük task instance listelerini zamana göre sıralı pencerelere bölüp pencere pencere çözer.
+    Bir pencerenin planı kesinleşince görevlerin makinelerde kapladığı aralıklar bloklanır; sonraki pencere
+    aradaki boşlukları da kullanabilir. Sonraki pencerelere düşen kilitli görevlerin yerleri önceki pencerelerde
+    baştan ayrılır ki kesinleşen planla çakışmasınlar.
+    greedy verilirse (hızlı sezgisel çözücü) her pencere onun planıyla ısınır ve ondan kötü bir pencere planı
+    kabul edilmez; pencereleme yüzünden toplam plan tüm listenin sezgisel planından kötü kalırsa o döner.
+    """
+    def __init__(
+        self,
+        solver: ISolverPort,
+        logger: ILoggingPort,
+        window_size: int = 500,
+        machine_config: Optional[MachineConfig] = None,
+        greedy: Optional[ISolverPort] = None,
+    ):
+        self.solver = solver
+        self.logger = logger
+        self.window_size = window_size
+        self.config = machine_config  # Kilitli görevlerin sürelerini bulmak için; yoksa kilitler tek pencereye sığmalı.
+        self.greedy = greedy
+        self.window_stats: List[dict] = []  # Son plan çağrısında her pencerenin çözücü istatistikleri.
+        self.greedy_fallback = False  # Son plan çağrısı tüm liste için sezgisel planı mı döndürdü?
+
+    def split_windows(self, tasks: List[TaskInstanceDTO], locks: Optional[list] = None) -> List[List[TaskInstanceDTO]]:
+        """
+        Görevleri job bütünlüğünü bozmadan pencerelere böler.
+        Sıralama: kilitli görevi olan job'lar, sonra paket deadline'ı, sonra job'un ilk fazı.
+        """
+        locked_ids = {int(l["task_instance_id"]) for l in (locks or []) if "task_instance_id" in l}
+
+        # Precedence sadece job içinde olduğu için job'ları bölmüyoruz.
+        jobs: Dict[int, List[TaskInstanceDTO]] = defaultdict(list)
+        for t in tasks:
+            jobs[t.job_id].append(t)
+
+        def job_key(job_id: int):
+            job_tasks = jobs[job_id]
+            has_lock = any(t.id in locked_ids for t in job_tasks)
+            # Kilitli görevler ilk pencereye gelsin ki sonraki pencerelerin makine blokları onlarla çakışmasın.
+            return (
+                0 if has_lock else 1,
+                min(_deadline_key(t.deadline) for t in job_tasks),
+                min(t.order for t in job_tasks),
+                job_id,
+            )
+
+        windows: List[List[TaskInstanceDTO]] = []
+        current: List[TaskInstanceDTO] = []
+        for job_id in sorted(jobs.keys(), key=job_key):
+            job_tasks = sorted(jobs[job_id], key=lambda t: (t.order, t.id))
+            if current and len(current) + len(job_tasks) > self.window_size:
+                windows.append(current)
+                current = []
+            current.extend(job_tasks)
+        if current:
+            windows.append(current)
+        return windows
+
+    def _lock_slots(self, tasks: List[TaskInstanceDTO], task_locks: list) -> Dict[int, Tuple[str, int, int]]:
+        """
+        Kilitli görev id -> (makine, başlangıç, bitiş). Aynı makinede çakışan iki kilit hiçbir pencerede
+        çözülemeyeceği için burada ValueError fırlar.
+        """
+        by_id = {t.id: t for t in tasks}
+        slots: Dict[int, Tuple[str, int, int]] = {}
+        for lk in task_locks:
+            task = by_id.get(int(lk["task_instance_id"]))
+            if task is None:
+                continue
+            machine, start = str(lk["machine"]), int(lk["start_min"])
+            duration = self.config.durations_for(task.base_name).get(machine, 0)
+            if duration <= 0:
+                raise ValueError(f"Lock refers to invalid machine '{machine}' for task {task.id}")
+            slots[task.id] = (machine, start, start + duration)
+        per_machine: Dict[str, list] = defaultdict(list)
+        for tid, (machine, start, end) in slots.items():
+            per_machine[machine].append((start, end, tid))
+        for machine, spans in per_machine.items():
+            spans.sort()
+            for (_, a_end, a), (b_start, _, b) in zip(spans, spans[1:]):
+                if b_start < a_end:
+                    raise ValueError(f"Locked tasks {a} and {b} overlap on machine {machine}")
+        return slots
+
+    def _machine_blocks(self, busy: Dict[str, List[Tuple[int, int]]], window: List[TaskInstanceDTO]) -> list:
+        """
+        Dolu aralıkları makine bloklarına çevirir. Bu penceredeki hiçbir görevin sığamayacağı kadar kısa boşluklar
+        birleştirilir; blok sayısı azalır ve 0'dan başlayan tek blok kalan makineler havuzda kalabilir.
+        """
+        shortest: Dict[str, int] = {}
+        if self.config is not None:
+            for t in window:
+                for m, d in self.config.durations_for(t.base_name).items():
+                    if m in t.machine_candidates:
+                        shortest[m] = min(shortest.get(m, d), d)
+        blocks = []
+        for machine, spans in busy.items():
+            min_gap = shortest.get(machine, 1)
+            merged: List[List[int]] = []
+            for start, end in sorted(spans):
+                start = 0 if start < min_gap else start  # Baştaki kullanılamaz boşluk da bloğa katılsın.
+                if merged and start - merged[-1][1] < min_gap:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            blocks.extend({"machine": machine, "start_min": a, "end_min": b} for a, b in merged if b > a)
+        return blocks
+
+    def _greedy_plan(self, tasks: List[TaskInstanceDTO], locks: list) -> Optional[List[PlanResultDTO]]:
+        if self.greedy is None:
+            return None
+        try:
+            return self.greedy.solve(tasks, locks=locks)
+        except (RuntimeError, ValueError) as e:
+            self.logger.warning(f"Greedy plan failed, continuing without it: {e}")
+            return None
+
+    def plan(
+        self,
+        tasks: List[TaskInstanceDTO],
+        locks: Optional[list] = None,
+        hint_plan: Optional[List[PlanResultDTO]] = None,
+    ) -> List[PlanResultDTO]:
+        locks = locks or []
+        task_locks = [l for l in locks if "task_instance_id" in l]
+        windows = self.split_windows(tasks, task_locks)
+        self.logger.info(f"Rolling horizon: {len(tasks)} task instances in {len(windows)} windows (size <= {self.window_size})")
+
+        window_of = {t.id: i for i, window in enumerate(windows) for t in window}
+        locked_windows = {window_of[int(l["task_instance_id"])] for l in task_locks if int(l["task_instance_id"]) in window_of}
+        slots: Dict[int, Tuple[str, int, int]] = {}
+        if len(locked_windows) > 1:
+            # Kilitler tek pencereye sığmadı: sonraki pencerelerin kilit yerleri önceki pencerelerde bloklanmalı.
+            if self.config is None:
+                raise ValueError("Locked tasks span several rolling horizon windows; machine_config is required")
+            slots = self._lock_slots(tasks, task_locks)
+
+        self.window_stats = []
+        self.greedy_fallback = False
+        committed: List[PlanResultDTO] = []
+        busy: Dict[str, List[Tuple[int, int]]] = defaultdict(list)  # makine -> kesinleşmiş (başlangıç, bitiş) aralıkları
+        for i, window in enumerate(windows):
+            window_ids = {t.id for t in window}
+            window_locks = [l for l in task_locks if int(l["task_instance_id"]) in window_ids]
+            # Önceki pencerelerin planını ve sonraki pencerelerin kilitli görevlerini donduruyoruz.
+            reserved: Dict[str, List[Tuple[int, int]]] = defaultdict(list, {m: list(v) for m, v in busy.items()})
+            for tid, (machine, start, end) in slots.items():
+                if window_of[tid] > i:
+                    reserved[machine].append((start, end))
+            window_locks += self._machine_blocks(reserved, window)
+
+            self.logger.info(f"Rolling horizon window {i + 1}/{len(windows)}: {len(window)} task instances")
+            window_hints = [r for r in hint_plan if r.task_instance_id in window_ids] if hint_plan else None
+            # Sezgisel plan bu pencerenin kilitleri ve kesinleşmiş bloklarıyla kuruluyor; yani pencere için geçerli.
+            greedy_plan = self._greedy_plan(window, window_locks)
+            try:
+                results = self.solver.solve(window, locks=window_locks, hint_plan=window_hints or greedy_plan)
+            except SolveCancelled as e:
+                # İptal edildiyse kesinleşmiş pencereler + yarım kalan pencerenin en iyi planı.
+                self.logger.warning(f"Rolling horizon cancelled in window {i + 1}/{len(windows)}.")
+                raise SolveCancelled(committed + e.results)
+            finally:
+                self.window_stats.append(dict(getattr(self.solver, "last_run_stats", None) or {}))
+            if greedy_plan and _plan_score(greedy_plan) < _plan_score(results):
+                self.logger.info(
+                    f"Rolling horizon window {i + 1}: greedy plan (makespan {_plan_score(greedy_plan)[0]}) "
+                    f"beats the solver plan (makespan {_plan_score(results)[0]}); keeping the greedy plan."
+                )
+                results = greedy_plan
+                self.window_stats[-1]["greedy"] = True
+            for r in results:
+                busy[r.assigned_machine].append((r.start_time, r.end_time))
+            committed.extend(results)
+
+        full_greedy = self._greedy_plan(tasks, locks)
+        if full_greedy and _plan_score(full_greedy) < _plan_score(committed):
+            self.logger.warning(
+                f"Rolling horizon plan (makespan {_plan_score(committed)[0]}) is worse than the greedy plan for all "
+                f"tasks (makespan {_plan_score(full_greedy)[0]}); returning the greedy plan."
+            )
+            self.greedy_fallback = True
+            return full_greedy
+        return committed
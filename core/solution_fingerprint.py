@@ -0,0 +1,38 @@
+# core/solution_fingerprint.py
+
+import hashlib
+import json
+from typing import Iterable, List, Optional
+from core.models.data_model import TaskInstanceDTO
+
+def _canonical_task(task: TaskInstanceDTO) -> list:
+    # Planı etkileyen her alan; aday makineler sırasız bir küme olduğu için sıralıyoruz.
+    return [
+        task.id, task.job_id, task.order, task.name, task.base_name,
+        sorted(task.machine_candidates), task.package_uid, task.deadline,
+    ]
+
+def _canonical_lock(lock: dict) -> list:
+    return [
+        lock.get("task_instance_id"), str(lock.get("machine")),
+        int(lock.get("start_min", 0)), lock.get("end_min"),
+    ]
+
+def problem_fingerprint(
+    tasks: List[TaskInstanceDTO],
+    config_version: str,
+    locks: Optional[Iterable[dict]] = None,
+    solver_options: Optional[dict] = None,
+) -> str:
+    """
+    Solver girdisinin kanonik hash'i. Aynı sipariş defteri, aynı makine config'i, aynı kilitler ve
+    aynı solver ayarları her zaman aynı parmak izini verir; sıra farkları sonucu değiştirmez.
+    """
+    payload = {
+        "tasks": sorted(_canonical_task(t) for t in tasks),
+        "config": config_version,
+        "locks": sorted((_canonical_lock(l) for l in (locks or [])), key=lambda x: json.dumps(x, default=str)),
+        "solver": solver_options or {},
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
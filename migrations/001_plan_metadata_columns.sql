@@ -0,0 +1,19 @@
+-- migrations/001_plan_metadata_columns.sql
+-- Sonradan eklenen plan_metadata kolonları ve Gantt index'i. IF NOT EXISTS sayesinde tekrar çalıştırmak zararsız.
+
+-- Çözücü profili, problem parmak izi (çözüm önbelleği anahtarı) ve planın önbellekten gelip gelmediği.
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS solver_profile TEXT;
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS cache_hit BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Aşama süreleri, model boyutu ve çözücü istatistikleri.
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS metrics JSONB;
+
+-- Run'ın düştüğü Celery kuyruğu, kuyruğa girerken tahmini boyutu, sırası ve tahmini bitiş süresi.
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS queue TEXT;
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS estimated_instances INTEGER;
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS queue_position INTEGER;
+ALTER TABLE plan_metadata ADD COLUMN IF NOT EXISTS eta_seconds DOUBLE PRECISION;
+
+-- Gantt endpoint'i run içinde start_time sırasıyla keyset sayfalıyor.
+CREATE INDEX IF NOT EXISTS plan_result_run_start_idx ON plan_result (run_id, start_time, task_instance_id);
@@ -0,0 +1,24 @@
+-- migrations/002_task_eligible_machines_jsonb.sql
+-- task.eligible_machines metin kolonundan JSONB'ye. Eski satırlar JSON ('["K#1"]'), Python listesi gösterimi
+-- ("['K#1', 'K#2']") ya da köşeli parantezsiz "K#1, K#2" olabiliyor; hepsi JSON dizisine çevrilir.
+-- Kolon zaten JSONB ise dokunulmaz.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'task' AND column_name = 'eligible_machines'
+          AND data_type IN ('text', 'character varying')
+    ) THEN
+        ALTER TABLE task ALTER COLUMN eligible_machines TYPE JSONB USING (
+            CASE
+                WHEN eligible_machines IS NULL OR btrim(eligible_machines) = '' THEN '[]'::jsonb
+                WHEN left(btrim(eligible_machines), 1) = '[' THEN replace(eligible_machines, '''', '"')::jsonb
+                ELSE to_jsonb(regexp_split_to_array(btrim(eligible_machines), '\s*,\s*'))
+            END
+        );
+    END IF;
+END
+$$;
+
+ALTER TABLE task ALTER COLUMN eligible_machines SET DEFAULT '[]'::jsonb;
@@ -0,0 +1,45 @@
+# migrations/apply_migrations.py
+"""
+PostgreSQL şema değişikliklerini uygular. Deploy sırasında API ve worker'lar başlamadan bir kez çalıştırılır:
+
+    python -m migrations.apply_migrations
+
+migrations/ altındaki NNN_*.sql dosyaları isim sırasıyla, her biri kendi transaction'ında çalışır; uygulananlar
+schema_migrations tablosuna yazılır ve bir daha çalıştırılmaz.
+"""
+
+import os
+import sys
+from adapters.pooling.connection_pool import pg_connection
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def pending_migrations(applied) -> list:
+    names = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith(".sql") and f[:3].isdigit())
+    return [n for n in names if n not in applied]
+
+def apply_migrations() -> list:
+    """Uygulanmamış migration'ları çalıştırır; uygulananların isimlerini döner."""
+    done = []
+    with pg_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations (name TEXT PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW())"
+            )
+            cur.execute("SELECT name FROM schema_migrations")
+            applied = {row[0] for row in cur.fetchall()}
+        conn.commit()
+        for name in pending_migrations(applied):
+            with open(os.path.join(MIGRATIONS_DIR, name), encoding="utf-8") as f:
+                sql = f.read()
+            with conn.cursor() as cur:
+                cur.execute(sql)
+                cur.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+            conn.commit()
+            done.append(name)
+    return done
+
+if __name__ == "__main__":
+    applied_now = apply_migrations()
+    print("Applied: " + ", ".join(applied_now) if applied_now else "Database schema is up to date.")
+    sys.exit(0)
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# pytest'i repo kökünden değil tests/ içinden çalıştıranlar için; paketler kökten import ediliyor.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
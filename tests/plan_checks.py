@@ -0,0 +1,60 @@
+# tests/plan_checks.py
+import logging
+import os
+from collections import defaultdict
+
+from adapters.logging.logger_adapter import LoggerAdapter
+from config.machine_config_loader import MachineConfig
+from core.fjsm_core import FJSMCore
+from core.models.data_model import JobDTO, PackageDTO, TaskDTO
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "machine_config.json")
+
+def load_config() -> MachineConfig:
+    return MachineConfig(CONFIG_PATH)
+
+def quiet_logger() -> LoggerAdapter:
+    return LoggerAdapter(level=logging.WARNING)
+
+def make_tasks(config, jobs, logger=None, deadline="1000"):
+    """jobs: her job için (görev adı, split count ya da None) listesi. Tek paketlik task instance listesi döner."""
+    job_dtos = []
+    for job_id, spec in enumerate(jobs, 1):
+        tasks = [
+            TaskDTO(name=name, type="split" if count else "single", order=order, count=count,
+                    eligible_machines=config.get_available_machines(name))
+            for order, (name, count) in enumerate(spec, 1)
+        ]
+        job_dtos.append(JobDTO(job_id=job_id, tasks=tasks))
+    package = PackageDTO(package_id=1, deadline=deadline, jobs=job_dtos, uid="PG-1")
+    return FJSMCore(config, logger=logger or quiet_logger()).process_packages([package])
+
+def makespan(results) -> int:
+    return max(r.end_time for r in results)
+
+def assert_valid_plan(tasks, results, config, locks=()):
+    """Her task tek kez, aday makinede, doğru sürede; makinede çakışma yok; order sırası korunuyor; kilitler tutuyor."""
+    by_id = {r.task_instance_id: r for r in results}
+    assert len(by_id) == len(results)
+    assert set(by_id) == {t.id for t in tasks}
+    per_machine = defaultdict(list)
+    for t in tasks:
+        r = by_id[t.id]
+        assert r.assigned_machine in t.machine_candidates
+        assert r.end_time - r.start_time == config.get_duration(t.base_name, r.assigned_machine)
+        per_machine[r.assigned_machine].append((r.start_time, r.end_time))
+    for machine, intervals in per_machine.items():
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            assert end <= start, f"overlap on {machine}"
+    # Aynı job'da bir sonraki order, önceki order'ın tüm parçaları bitmeden başlayamaz.
+    per_job = defaultdict(lambda: defaultdict(list))
+    for t in tasks:
+        per_job[t.job_id][t.order].append(by_id[t.id])
+    for orders in per_job.values():
+        keys = sorted(orders)
+        for a, b in zip(keys, keys[1:]):
+            assert max(r.end_time for r in orders[a]) <= min(r.start_time for r in orders[b])
+    for lock in (l for l in locks if "task_instance_id" in l):
+        r = by_id[int(lock["task_instance_id"])]
+        assert r.assigned_machine == lock["machine"] and r.start_time == int(lock["start_min"])
@@ -0,0 +1,41 @@
+# tests/test_benchmarks_compare.py
+from benchmarks.run_benchmarks import compare, compare_formulations
+
+def _case(size=50, formulation="standard", build=1.0, makespan=100, error=None, optimal=True):
+    case = {
+        "size": size, "profile": {"name": "fast"}, "timings": {"build": build},
+        "makespan": makespan, "error": error, "stage1_optimal": optimal,
+    }
+    if formulation is not None:
+        case["formulation"] = formulation
+    return case
+
+def test_compare_accepts_results_within_tolerance():
+    assert compare([_case(build=1.1, makespan=104)], [_case()], time_tolerance=1.2, quality_tolerance=1.05) == []
+
+def test_compare_reports_slower_build_and_worse_makespan():
+    problems = compare([_case(build=2.0, makespan=120)], [_case()], time_tolerance=1.2, quality_tolerance=1.05)
+    assert len(problems) == 2
+    assert "model build" in problems[0] and "makespan 120" in problems[1]
+
+def test_compare_reports_new_failure_only():
+    failed = _case(error="boom", makespan=None)
+    assert compare([failed], [_case()], 1.2, 1.05) == ["size=50 profile=fast formulation=standard: failed (boom)"]
+    assert compare([failed], [dict(failed)], 1.2, 1.05) == []
+
+def test_compare_ignores_missing_build_time():
+    assert compare([_case(build=None)], [_case(build=None)], 1.2, 1.05) == []
+
+def test_compare_matches_formulations_separately():
+    # Eski baseline'larda formulation alanı yok; standard sayılmalı ve compact ile karşılaştırılmamalı.
+    baseline = [_case(formulation=None, makespan=100)]
+    assert compare([_case(formulation="compact", makespan=200)], baseline, 1.2, 1.05) == []
+    assert len(compare([_case(formulation="standard", makespan=200)], baseline, 1.2, 1.05)) == 1
+
+def test_compare_formulations_flags_only_proven_optimal_mismatch():
+    cases = [
+        _case(size=50, formulation="standard", makespan=100), _case(size=50, formulation="compact", makespan=101),
+        _case(size=200, formulation="standard", makespan=300), _case(size=200, formulation="compact", makespan=310, optimal=False),
+        _case(size=500, formulation="standard", makespan=400),
+    ]
+    assert compare_formulations(cases) == ["size=50: optimal makespan differs (standard 100, compact 101)"]
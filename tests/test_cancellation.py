@@ -0,0 +1,62 @@
+# tests/test_cancellation.py
+import threading
+
+import pytest
+
+from adapters.solver.heuristic_solver import HeuristicSolver
+from adapters.solver.solver_adapter import ORToolsSolver
+from benchmarks.instance_generator import generate_packages
+from config.solver_profiles import get_solver_profile
+from core.fjsm_core import FJSMCore
+from core.ports.solver_port import ISolverPort, SolveCancelled
+from core.rolling_horizon import RollingHorizonPlanner
+from plan_checks import assert_valid_plan, load_config, make_tasks, quiet_logger
+
+@pytest.fixture(scope="module")
+def instance():
+    config = load_config()
+    return config, FJSMCore(config, logger=quiet_logger()).process_packages(generate_packages(config, 60, seed=3))
+
+def _cancel_after_first_event(config, stage):
+    # Verilen aşamanın ilk ilerleme olayı yayınlanınca iptal istenir; o aşamada elde en az bir çözüm vardır.
+    seen = threading.Event()
+    return ORToolsSolver(
+        config, quiet_logger(), profile=get_solver_profile("fast"), random_seed=1,
+        progress_callback=lambda e: e["stage"] == stage and seen.set(), cancel_check=seen.is_set,
+    )
+
+@pytest.mark.parametrize("stage", [1, 2])
+def test_cancel_returns_incumbent(instance, stage):
+    config, tasks = instance
+    solver = _cancel_after_first_event(config, stage)
+    with pytest.raises(SolveCancelled) as exc:
+        solver.solve(tasks)
+    assert solver.last_status == "CANCELLED"
+    assert_valid_plan(tasks, exc.value.results, config)
+
+def test_cancel_without_solution_carries_empty_plan():
+    assert SolveCancelled().results == []
+
+class _CancelInSecondWindow(ISolverPort):
+    def __init__(self, solver):
+        self.solver = solver
+        self.calls = 0
+
+    def solve(self, tasks, locks=None, hint_plan=None):
+        self.calls += 1
+        results = self.solver.solve(tasks, locks=locks)
+        if self.calls == 2:
+            raise SolveCancelled(results[: len(results) // 2])
+        return results
+
+def test_rolling_horizon_cancel_keeps_committed_windows():
+    config = load_config()
+    tasks = make_tasks(config, [[("kesme", 2), ("oyma", None)], [("bükme", None), ("yanak_açma", 2)]] * 4)
+    solver = _CancelInSecondWindow(HeuristicSolver(config, quiet_logger()))
+    planner = RollingHorizonPlanner(solver, quiet_logger(), window_size=6, machine_config=config)
+    first_window = {t.id for t in planner.split_windows(tasks)[0]}
+    with pytest.raises(SolveCancelled) as exc:
+        planner.plan(tasks)
+    ids = [r.task_instance_id for r in exc.value.results]
+    assert first_window <= set(ids) and len(ids) == len(set(ids))
+    assert len(first_window) < len(ids) < len(tasks)
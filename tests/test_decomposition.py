@@ -0,0 +1,59 @@
+# tests/test_decomposition.py
+from dataclasses import replace
+
+import pytest
+
+from adapters.solver import decomposition
+from adapters.solver.solver_adapter import DECOMPOSE_MIN_TASKS, ORToolsSolver
+from config.solver_profiles import get_solver_profile
+from plan_checks import assert_valid_plan, load_config, make_tasks, makespan, quiet_logger
+
+# kesme/oyma job'ları ile bükme+yanak_açma job'ları hiçbir makineyi paylaşmıyor: iki bağımsız bileşen.
+TWO_FAMILIES = (
+    [[("kesme", 5), ("oyma", None)] for _ in range(4)]
+    + [[("oyma", None)] for _ in range(24)]
+    + [[("bükme", None), ("yanak_açma", None)] for _ in range(26)]
+)
+
+# Bileşen makespan'leri kanıtlanmış optimal olsun ki birleşik plan ile karşılaştırma kesin olsun.
+PROFILE = replace(get_solver_profile("fast"), time_budget=4.0, relative_gap_limit=0.0)
+
+@pytest.fixture(scope="module")
+def instance():
+    config = load_config()
+    tasks = make_tasks(config, TWO_FAMILIES)
+    bukme = next(t for t in tasks if t.base_name == "bükme")
+    locks = [{"task_instance_id": bukme.id, "machine": "B#5", "start_min": 40}]
+    return config, tasks, locks
+
+def _solver(config, decompose):
+    return ORToolsSolver(config, quiet_logger(), profile=PROFILE, decompose=decompose, cores=2)
+
+def test_instance_splits_into_two_components(instance):
+    config, tasks, _ = instance
+    components = decomposition.independent_components(tasks, config)
+    assert len(tasks) >= DECOMPOSE_MIN_TASKS
+    assert sorted(sorted({t.base_name for t in c}) for c in components) == [["bükme", "yanak_açma"], ["kesme", "oyma"]]
+
+def test_merged_plan_is_valid_and_keeps_largest_component_makespan(instance):
+    config, tasks, locks = instance
+    solver = _solver(config, decompose=True)
+    results = solver.solve(tasks, locks=locks)
+    assert sorted(solver.last_run_stats["components"]) == [48, 52]
+    assert_valid_plan(tasks, results, config, locks)
+
+    components = decomposition.independent_components(tasks, config)
+    separate = []
+    for comp, comp_locks in zip(components, decomposition.split_locks(components, config, locks)):
+        single = _solver(config, decompose=False)
+        separate.append(makespan(single.solve(comp, locks=comp_locks)))
+        assert single.last_run_stats["stage1_status"] == "OPTIMAL"
+    assert makespan(results) == max(separate)
+    # Stage 2 her bileşende bir çözüm bulmalı; Stage 1 planına düşmemeli.
+    assert not solver.last_run_stats["stage2_fallback"]
+
+def test_merge_components_balances_into_worker_count():
+    comps = [[object()] * n for n in (5, 4, 3, 2, 1)]
+    merged = decomposition.merge_components(comps, 2)
+    assert sorted(len(g) for g in merged) == [7, 8]
+    assert decomposition.merge_components(comps, 5) is comps
@@ -0,0 +1,93 @@
+# tests/test_gantt.py
+import pytest
+
+from backend.gantt import GANTT_COLUMNS, build_gantt_payload, fetch_gantt_rows_mongo, parse_gantt_query
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self.docs.sort(key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+_OPERATORS = {"$gt": lambda v, a: v > a, "$lt": lambda v, a: v < a, "$in": lambda v, a: v in a}
+
+def _matches(doc, flt):
+    """fetch_gantt_rows_mongo'nun kullandığı kadar Mongo filtre dili."""
+    for key, cond in flt.items():
+        if key == "$or":
+            if not any(_matches(doc, sub) for sub in cond):
+                return False
+        elif isinstance(cond, dict):
+            if not all(_OPERATORS[op](doc[key], arg) for op, arg in cond.items()):
+                return False
+        elif doc[key] != cond:
+            return False
+    return True
+
+class _FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, flt, projection):
+        return _FakeCursor([{k: d[k] for k in projection if k in d} for d in self.docs if _matches(d, flt)])
+
+def _db():
+    # Aynı start_time'ı paylaşan çubuklar sayfa sınırına denk gelsin diye başlangıçlar tekrar ediyor.
+    docs = [
+        {"run_id": "r1", "task_name": f"t{i}", "start_time": (i // 3) * 10, "end_time": (i // 3) * 10 + 5,
+         "assigned_machine": f"M{i % 2}", "job_id": i % 4, "task_instance_id": 100 - i}
+        for i in range(11)
+    ]
+    return {"plan_result": _FakeCollection(docs)}
+
+def _all_pages(db, args):
+    rows, cursor = [], None
+    for _ in range(20):
+        q = parse_gantt_query(dict(args, cursor=cursor) if cursor else args)
+        page = fetch_gantt_rows_mongo(db, "r1", q)
+        body, cursor = build_gantt_payload("r1", page, q)
+        rows.extend(body)
+        if cursor is None:
+            return rows
+    raise AssertionError("paging did not terminate")
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 11, 50])
+def test_cursor_pages_cover_every_row_once(limit):
+    db = _db()
+    everything = [dict(zip(GANTT_COLUMNS, r)) for r in fetch_gantt_rows_mongo(db, "r1", parse_gantt_query({}))]
+    assert _all_pages(db, {"limit": str(limit)}) == everything
+
+def test_cursor_round_trips_through_query_string():
+    db = _db()
+    q = parse_gantt_query({"limit": "4"})
+    body, cursor = build_gantt_payload("r1", fetch_gantt_rows_mongo(db, "r1", q), q)
+    last = body[-1]
+    assert cursor == f"{last['start']}:{last['task_instance_id']}"
+    assert parse_gantt_query({"limit": "4", "cursor": cursor}).cursor == (last["start"], last["task_instance_id"])
+
+def test_cursor_paging_respects_filters():
+    rows = _all_pages(_db(), {"limit": "2", "machines": "M1", "from": "10"})
+    assert rows and all(r["resource"] == "M1" and r["finish"] > 10 for r in rows)
+    assert len(rows) == len({r["task_instance_id"] for r in rows})
+
+def test_columnar_payload_carries_next_cursor():
+    db = _db()
+    q = parse_gantt_query({"limit": "3", "layout": "columnar"})
+    body, cursor = build_gantt_payload("r1", fetch_gantt_rows_mongo(db, "r1", q), q)
+    assert body["count"] == 3 and body["next_cursor"] == cursor
+    assert list(body["columns"]) == list(GANTT_COLUMNS)
+
+@pytest.mark.parametrize("args", [{"cursor": "abc"}, {"cursor": "10:x"}, {"limit": "0"}, {"from": "5", "to": "5"}, {"layout": "xml"}])
+def test_parse_gantt_query_rejects_bad_values(args):
+    with pytest.raises(ValueError):
+        parse_gantt_query(args)
@@ -0,0 +1,48 @@
+# tests/test_heuristic_solver.py
+import pytest
+
+from adapters.solver.heuristic_solver import DISPATCH_RULES, HeuristicSolver
+from benchmarks.instance_generator import generate_packages
+from core.fjsm_core import FJSMCore
+from plan_checks import assert_valid_plan, load_config, makespan, quiet_logger
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config()
+
+@pytest.fixture(scope="module")
+def tasks(config):
+    return FJSMCore(config, logger=quiet_logger()).process_packages(generate_packages(config, 150, seed=6))
+
+@pytest.mark.parametrize("rule", DISPATCH_RULES)
+def test_each_rule_builds_valid_plan(config, tasks, rule):
+    solver = HeuristicSolver(config, quiet_logger(), rule=rule)
+    results = solver.solve(tasks)
+    assert_valid_plan(tasks, results, config)
+    assert solver.last_status == "HEURISTIC" and solver.last_run_stats["rule"] == rule
+
+@pytest.mark.parametrize("rule", DISPATCH_RULES)
+def test_each_rule_respects_locks_and_blocks(config, tasks, rule):
+    first = sorted((t for t in tasks if t.order == 1), key=lambda t: t.id)[:3]
+    locks = [
+        {"task_instance_id": t.id, "machine": t.machine_candidates[-1], "start_min": 200 + 60 * k}
+        for k, t in enumerate(first)
+    ]
+    block = {"machine": "K#1", "start_min": 0, "end_min": 500}
+    results = HeuristicSolver(config, quiet_logger(), rule=rule).solve(tasks, locks=locks + [block])
+    assert_valid_plan(tasks, results, config, locks=locks)
+    assert all(r.start_time >= 500 for r in results if r.assigned_machine == "K#1")
+
+def test_best_returns_minimum_over_rules(config, tasks):
+    per_rule = {rule: makespan(HeuristicSolver(config, quiet_logger(), rule=rule).solve(tasks)) for rule in DISPATCH_RULES}
+    assert len(set(per_rule.values())) > 1  # Bu örnekte kurallar farklı sonuç veriyor; seçim gerçekten sınanıyor.
+    best = HeuristicSolver(config, quiet_logger())
+    assert makespan(best.solve(tasks)) == min(per_rule.values())
+    assert per_rule[best.last_run_stats["rule"]] == min(per_rule.values())
+
+def test_invalid_locks_and_rules_are_rejected(config, tasks):
+    with pytest.raises(ValueError):
+        HeuristicSolver(config, quiet_logger(), rule="fifo")
+    task = tasks[0]
+    with pytest.raises(RuntimeError):
+        HeuristicSolver(config, quiet_logger()).solve(tasks, locks=[{"task_instance_id": task.id, "machine": "X#9", "start_min": 0}])
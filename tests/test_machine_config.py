@@ -0,0 +1,43 @@
+# tests/test_machine_config.py
+import json
+import os
+
+from config.machine_config_loader import MachineConfig
+
+def _write(path, data, mtime_ns):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_load_caches_until_file_changes(tmp_path):
+    path = tmp_path / "machine_config.json"
+    _write(path, {"kesme": {"K#1": 35, "K#2": 35}}, 1_000_000_000)
+    first = MachineConfig.load(str(path))
+    assert MachineConfig.load(str(path)) is first
+
+    # Aynı boyutta farklı içerik + yeni mtime: yeniden okunmalı ve versiyon değişmeli.
+    _write(path, {"kesme": {"K#1": 36, "K#2": 35}}, 2_000_000_000)
+    second = MachineConfig.load(str(path))
+    assert second is not first
+    assert second.version != first.version
+    assert second.get_duration("kesme", "K#1") == 36
+    assert MachineConfig.load(str(path)) is second
+
+def test_load_keeps_object_when_only_mtime_changes(tmp_path):
+    path = tmp_path / "machine_config.json"
+    data = {"oyma": {"O#1": 10, "O#2": 0}}
+    _write(path, data, 1_000_000_000)
+    first = MachineConfig.load(str(path))
+    _write(path, data, 3_000_000_000)
+    # Dosya yeniden okunur ama içerik hash'i aynı olduğu için derlenmiş nesne korunur.
+    assert MachineConfig.load(str(path)) is first
+
+def test_lookup_tables(tmp_path):
+    path = tmp_path / "machine_config.json"
+    _write(path, {"kesme": {"K#2": 35, "K#1": 35, "O#1": 0}, "oyma": {"O#1": 10}}, 1_000_000_000)
+    config = MachineConfig(str(path))
+    assert config.durations_for("kesme") == {"K#2": 35, "K#1": 35}
+    assert config.durations_for("bükme") == {}
+    assert config.machine_names == ["K#1", "K#2", "O#1"]
+    assert config.machine_index == {"K#1": 0, "K#2": 1, "O#1": 2}
+    assert config.machine_profile("K#1") == config.machine_profile("K#2") == (35, 0)
+    assert config.machine_profile("O#1") == (0, 10)
@@ -0,0 +1,79 @@
+# tests/test_machine_pools.py
+import random
+from collections import defaultdict
+
+import pytest
+
+from adapters.solver.machine_pools import MachinePool, assign_pool_machines, group_identical_machines
+from adapters.solver.solver_adapter import ORToolsSolver
+from config.solver_profiles import get_solver_profile
+from plan_checks import assert_valid_plan, load_config, make_tasks, makespan, quiet_logger
+
+# 26 kesme instance'ı 20 makinelik havuzu aşıyor; havuz kapasitesi gerçekten bağlayıcı olsun.
+KESME_HEAVY = [[("kesme", c), ("oyma", None)] for c in (8, 7, 6, 5)]
+
+@pytest.fixture(scope="module")
+def instance():
+    config = load_config()
+    return config, make_tasks(config, KESME_HEAVY)
+
+def _solve(instance, use_machine_pools):
+    config, tasks = instance
+    solver = ORToolsSolver(config, quiet_logger(), use_machine_pools=use_machine_pools,
+                           profile=get_solver_profile("fast"), random_seed=1)
+    return solver.solve(tasks), solver.last_run_stats
+
+def test_pooled_and_per_machine_models_reach_same_makespan(instance):
+    config, tasks = instance
+    pooled, pooled_stats = _solve(instance, True)
+    single, single_stats = _solve(instance, False)
+    assert pooled_stats["pools"] > 0 and single_stats["pools"] == 0
+    assert pooled_stats["stage1_status"] == single_stats["stage1_status"] == "OPTIMAL"
+    assert_valid_plan(tasks, pooled, config)
+    assert_valid_plan(tasks, single, config)
+    assert makespan(pooled) == makespan(single)
+
+def _assert_no_overlap(pool, intervals, assignment, release=None):
+    per_machine = defaultdict(list)
+    for task_id, start, end in intervals:
+        assert assignment[task_id] in pool.machines
+        per_machine[assignment[task_id]].append((start, end))
+    for machine, spans in per_machine.items():
+        spans.sort()
+        assert spans[0][0] >= (release or {}).get(machine, 0)
+        for (_, end), (start, _) in zip(spans, spans[1:]):
+            assert end <= start
+
+@pytest.mark.parametrize("seed", range(5))
+def test_assign_pool_machines_never_overlaps(seed):
+    rnd = random.Random(seed)
+    pool = MachinePool(name="pool[K#1,K#2,K#3]", machines=("K#1", "K#2", "K#3"))
+    # Kapasiteyi aşmayan rastgele aralıklar: her makine için ardışık, birbirine değen/boşluklu görevler.
+    intervals, tid = [], 0
+    for _ in pool.machines:
+        t = rnd.randint(0, 5)
+        for _ in range(6):
+            duration = rnd.randint(1, 10)
+            intervals.append((tid, t, t + duration))
+            tid += 1
+            t += duration + rnd.choice([0, 0, 3])
+    assignment = assign_pool_machines(pool, intervals)
+    _assert_no_overlap(pool, intervals, assignment)
+
+def test_assign_pool_machines_respects_release():
+    pool = MachinePool(name="pool[K#1,K#2]", machines=("K#1", "K#2"))
+    release = {"K#1": 20}
+    intervals = [(1, 0, 10), (2, 10, 20), (3, 20, 30), (4, 20, 30)]
+    assignment = assign_pool_machines(pool, intervals, release=release)
+    _assert_no_overlap(pool, intervals, assignment, release)
+    with pytest.raises(RuntimeError):
+        assign_pool_machines(pool, [(1, 0, 10), (2, 5, 15)], release=release)
+
+def test_pool_name_lists_non_contiguous_members():
+    config = load_config()
+    pools = group_identical_machines(make_tasks(config, [[("oyma", None)]]), config)
+    # O#1, O#7 ve O#9 aynı süreli; arada kalan makineler bu havuza girmiyor.
+    assert pools["O#7"].machines == ("O#1", "O#7", "O#9")
+    assert pools["O#7"].name == "pool[O#1,O#7,O#9]"
+    assert pools["O#2"].name == "pool[O#2,O#6]"
+    assert not pools["O#3"].is_pooled and pools["O#3"].name == "O#3"
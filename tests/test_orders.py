@@ -0,0 +1,55 @@
+# tests/test_orders.py
+import pytest
+
+from backend.orders import MAX_BULK_ORDERS, flatten_bulk_orders, parse_order
+
+def _order(**overrides):
+    data = {"package_id": 1, "job_id": 2, "job_type": "kesme", "mode": "single", "phase": 1}
+    data.update(overrides)
+    return data
+
+def test_parse_order_normalizes_fields():
+    order = parse_order(_order(package_id="1", mode="split", count="3", eligible_machines=["M1"]))
+    assert order == {
+        "package_id": 1, "job_id": 2, "job_type": "kesme", "mode": "split", "phase": 1,
+        "count": 3, "eligible_machines": ["M1"], "deadline": 10000,
+    }
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"job_type": "dövme"}, "Geçersiz iş türü."),
+    ({"mode": "batch"}, "Geçersiz mod."),
+    ({"phase": 0}, "Faz 1 veya daha büyük olmalı."),
+    ({"mode": "split"}, "Split modunda count ≥ 1 olmalı."),
+    ({"mode": "split", "count": 0}, "Split modunda count ≥ 1 olmalı."),
+    ({"eligible_machines": "M1"}, "eligible_machines listesi hatalı."),
+    ({"eligible_machines": ["M1", 2]}, "eligible_machines listesi hatalı."),
+])
+def test_parse_order_rejects_invalid_input(overrides, message):
+    with pytest.raises(ValueError) as exc:
+        parse_order(_order(**overrides))
+    assert str(exc.value) == message
+
+@pytest.mark.parametrize("overrides", [{"package_id": None}, {"phase": None}])
+def test_parse_order_rejects_missing_numbers(overrides):
+    with pytest.raises(TypeError):
+        parse_order(_order(**overrides))
+
+def test_parse_order_rejects_non_numeric_ids():
+    with pytest.raises(ValueError):
+        parse_order(_order(job_id="abc"))
+
+def test_flatten_nested_packages_carries_package_fields():
+    body = {"packages": [{"package_id": 5, "deadline": 300, "jobs": [{"job_id": 9, "tasks": [{"job_type": "oyma"}, "x"]}]}]}
+    items = flatten_bulk_orders(body)
+    assert [ref for ref, _ in items] == ["packages[0].jobs[0].tasks[0]", "packages[0].jobs[0].tasks[1]"]
+    assert items[0][1] == {"job_type": "oyma", "package_id": 5, "job_id": 9, "deadline": 300}
+    assert items[1][1] == "x"
+
+@pytest.mark.parametrize("body", [[], {}, {"orders": []}, {"orders": {}}, {"packages": [{"jobs": None}]}])
+def test_flatten_rejects_malformed_body(body):
+    with pytest.raises(ValueError):
+        flatten_bulk_orders(body)
+
+def test_flatten_enforces_size_limit():
+    with pytest.raises(ValueError):
+        flatten_bulk_orders({"orders": [_order()] * (MAX_BULK_ORDERS + 1)})
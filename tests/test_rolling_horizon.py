@@ -0,0 +1,119 @@
+# tests/test_rolling_horizon.py
+from dataclasses import replace
+
+import pytest
+
+from adapters.solver.heuristic_solver import HeuristicSolver
+from adapters.solver.solver_adapter import ORToolsSolver
+from config.solver_profiles import get_solver_profile
+from core.ports.solver_port import ISolverPort
+from core.rolling_horizon import RollingHorizonPlanner
+from plan_checks import assert_valid_plan, load_config, make_tasks, makespan, quiet_logger
+
+JOBS = [
+    [("kesme", 3), ("oyma", None), ("bükme", 2)],
+    [("kesme", None), ("oyma", 2), ("yanak_açma", None)],
+    [("kesme", 2), ("bükme", None)],
+    [("oyma", 3), ("yanak_açma", 2)],
+] * 3
+
+class _RecordingSolver(ISolverPort):
+    """Her pencerede çözücüye giden kilitleri/blokları ve dönen planı saklar."""
+    def __init__(self, solver):
+        self.solver = solver
+        self.calls = []
+
+    def solve(self, tasks, locks=None, hint_plan=None):
+        results = self.solver.solve(tasks, locks=locks, hint_plan=hint_plan)
+        self.calls.append((list(locks or []), results))
+        return results
+
+class _DelayedSolver(ISolverPort):
+    """Sezgisel planı 50 dakika kaydırıp döner: geçerli ama her zaman daha kötü bir pencere planı."""
+    def __init__(self, solver):
+        self.solver = solver
+
+    def solve(self, tasks, locks=None, hint_plan=None):
+        return [replace(r, start_time=r.start_time + 50, end_time=r.end_time + 50) for r in self.solver.solve(tasks, locks)]
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config()
+
+@pytest.fixture(scope="module")
+def tasks(config):
+    return make_tasks(config, JOBS)
+
+def _cpsat(config):
+    return ORToolsSolver(config, quiet_logger(), profile=get_solver_profile("fast"), random_seed=1)
+
+def test_split_windows_keeps_jobs_whole_and_locked_jobs_first(config, tasks):
+    planner = RollingHorizonPlanner(_cpsat(config), quiet_logger(), window_size=8)
+    last_job = max(t.job_id for t in tasks)
+    locks = [{"task_instance_id": next(t.id for t in tasks if t.job_id == last_job), "machine": "K#1", "start_min": 0}]
+    windows = planner.split_windows(tasks, locks)
+    assert sorted(t.id for w in windows for t in w) == sorted(t.id for t in tasks)
+    window_of_job = {}
+    for i, window in enumerate(windows):
+        assert len(window) <= 8
+        for t in window:
+            assert window_of_job.setdefault(t.job_id, i) == i
+    assert window_of_job[last_job] == 0
+
+def test_machine_blocks_merge_gaps_no_window_task_fits(config, tasks):
+    planner = RollingHorizonPlanner(_cpsat(config), quiet_logger(), machine_config=config)
+    busy = {"K#1": [(60, 100), (5, 40), (130, 170), (240, 250)], "O#3": [(10, 20), (25, 30)]}
+    blocks = {(b["machine"], b["start_min"], b["end_min"]) for b in planner._machine_blocks(busy, tasks)}
+    # Kesme 35 dakika: baştaki 5'lik, 20'lik ve 30'luk boşluklar kullanılamaz; 70'lik boşluk kalır.
+    # O#3'te oyma 4 dakika: 5'lik boşluk kullanılabilir, baştaki 10'luk da.
+    assert blocks == {("K#1", 0, 170), ("K#1", 240, 250), ("O#3", 10, 20), ("O#3", 25, 30)}
+
+def test_machine_blocks_without_config_keep_intervals(tasks):
+    planner = RollingHorizonPlanner(None, quiet_logger())
+    blocks = planner._machine_blocks({"K#1": [(5, 40), (40, 60)]}, tasks)
+    assert blocks == [{"machine": "K#1", "start_min": 5, "end_min": 60}]
+
+def test_windows_never_overlap_committed_intervals(config, tasks):
+    solver = _RecordingSolver(_cpsat(config))
+    planner = RollingHorizonPlanner(solver, quiet_logger(), window_size=8, machine_config=config)
+    results = planner.plan(tasks)
+    assert len(solver.calls) > 2
+    assert_valid_plan(tasks, results, config)
+    committed = []
+    for locks, window_results in solver.calls:
+        blocks = [l for l in locks if "task_instance_id" not in l]
+        for machine, start, end in committed:
+            # Kesinleşmiş her aralık bu pencerenin bir bloğunun içinde kalmalı.
+            assert any(b["machine"] == machine and b["start_min"] <= start and end <= b["end_min"] for b in blocks)
+        committed.extend((r.assigned_machine, r.start_time, r.end_time) for r in window_results)
+
+def test_locks_in_later_windows_keep_their_slots(config, tasks):
+    by_job = {}
+    for t in tasks:
+        if t.order == 1:
+            by_job.setdefault(t.job_id, t)
+    # Job'lar pencerelere dağılıyor; kilitler sonraki pencerelerde de olsa yerleri önceden ayrılmalı.
+    first = [by_job[j] for j in sorted(by_job)[:4]]
+    locks = []
+    for k, t in enumerate(first):
+        machine = t.machine_candidates[0]
+        locks.append({"task_instance_id": t.id, "machine": machine, "start_min": 150 + 40 * k})
+    planner = RollingHorizonPlanner(_cpsat(config), quiet_logger(), window_size=8, machine_config=config)
+    windows = planner.split_windows(tasks, locks)
+    assert len({i for i, w in enumerate(windows) for t in w if t.id in {l["task_instance_id"] for l in locks}}) > 1
+    results = planner.plan(tasks, locks=locks)
+    assert_valid_plan(tasks, results, config, locks=locks)
+
+def test_locks_across_windows_need_machine_config(config, tasks):
+    first = sorted({t.job_id: t for t in reversed(tasks) if t.order == 1}.values(), key=lambda t: t.job_id)[:4]
+    locks = [{"task_instance_id": t.id, "machine": t.machine_candidates[0], "start_min": 150 + 40 * k} for k, t in enumerate(first)]
+    with pytest.raises(ValueError, match="machine_config"):
+        RollingHorizonPlanner(_cpsat(config), quiet_logger(), window_size=8).plan(tasks, locks=locks)
+
+def test_window_is_never_worse_than_greedy(config, tasks):
+    greedy = HeuristicSolver(config, quiet_logger())
+    planner = RollingHorizonPlanner(_DelayedSolver(greedy), quiet_logger(), window_size=8, machine_config=config, greedy=greedy)
+    results = planner.plan(tasks)
+    assert_valid_plan(tasks, results, config)
+    assert planner.window_stats and all(w.get("greedy") for w in planner.window_stats)
+    assert makespan(results) <= makespan(greedy.solve(tasks))
@@ -0,0 +1,102 @@
+# tests/test_solution_cache.py
+import json
+
+import pytest
+
+# Önbellek adapter'ı bağlantı havuzu üzerinden config/settings.py'ye bağlı; kurulumu olmayan ortamda atlanır.
+pytest.importorskip("config.settings", reason="config/settings.py is not configured")
+import redis  # noqa: E402
+from adapters.driven.redis_solution_cache import LRU_KEY, RedisSolutionCache, solution_key  # noqa: E402
+from core.models.data_model import PlanResultDTO  # noqa: E402
+
+class _FakeRedis:
+    """Önbelleğin kullandığı kadar Redis: string anahtarlar ve LRU sorted set'i."""
+    def __init__(self):
+        self.data = {}
+        self.zsets = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def expire(self, key, ttl):
+        pass
+
+    def delete(self, *keys):
+        for k in keys:
+            self.data.pop(k, None)
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def zrange(self, key, start, end):
+        return sorted(self.zsets.get(key, {}), key=self.zsets[key].get)[start:end + 1]
+
+    def zrem(self, key, *members):
+        for m in members:
+            self.zsets.get(key, {}).pop(m, None)
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.ops.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+class _BrokenRedis:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise redis.ConnectionError("down")
+        return fail
+
+def _plan(end):
+    return [PlanResultDTO(task_instance_id=1, job_id=1, task_name="kesme_1", assigned_machine="K#1", start_time=0, end_time=end)]
+
+def test_cache_round_trip():
+    cache = RedisSolutionCache(client=_FakeRedis())
+    cache.put("fp", _plan(35), makespan=35, solver_status="OPTIMAL", run_id="r1")
+    entry = cache.get("fp")
+    assert entry["results"] == _plan(35) and entry["solver_status"] == "OPTIMAL" and entry["run_id"] == "r1"
+    assert cache.get("other") is None
+
+def test_redis_errors_are_misses():
+    cache = RedisSolutionCache(client=_BrokenRedis())
+    assert cache.get("fp") is None
+    cache.put("fp", _plan(35), makespan=35, solver_status="OPTIMAL")  # Fırlatmamalı.
+
+def test_refresh_skips_non_optimal_entries():
+    cache = RedisSolutionCache(client=_FakeRedis())
+    cache.put("fp", _plan(40), makespan=40, solver_status="FEASIBLE")
+    assert cache.get("fp")["makespan"] == 40
+    assert cache.get("fp", optimal_only=True) is None
+    cache.put("fp", _plan(35), makespan=35, solver_status="OPTIMAL")
+    assert cache.get("fp", optimal_only=True)["makespan"] == 35
+
+def test_worse_time_limited_plan_does_not_replace_better_entry():
+    client = _FakeRedis()
+    cache = RedisSolutionCache(client=client)
+    cache.put("fp", _plan(40), makespan=40, solver_status="FEASIBLE")
+    cache.put("fp", _plan(45), makespan=45, solver_status="FEASIBLE")
+    assert json.loads(client.data[solution_key("fp")])["makespan"] == 40
+    cache.put("fp", _plan(38), makespan=38, solver_status="FEASIBLE")
+    assert json.loads(client.data[solution_key("fp")])["makespan"] == 38
+
+def test_lru_eviction():
+    client = _FakeRedis()
+    cache = RedisSolutionCache(client=client)
+    cache.max_entries = 2
+    for fp in ("a", "b", "c"):
+        cache.put(fp, _plan(35), makespan=35, solver_status="OPTIMAL")
+    assert solution_key("a") not in client.data and set(client.zsets[LRU_KEY]) == {"b", "c"}
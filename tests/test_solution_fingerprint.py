@@ -0,0 +1,41 @@
+# tests/test_solution_fingerprint.py
+from dataclasses import replace
+
+import pytest
+
+from config.solver_profiles import get_solver_profile
+from core.solution_fingerprint import problem_fingerprint
+from plan_checks import load_config, make_tasks
+
+LOCKS = [
+    {"task_instance_id": 1, "machine": "K#1", "start_min": 0},
+    {"machine": "O#3", "start_min": 10, "end_min": 30},
+]
+
+@pytest.fixture(scope="module")
+def tasks():
+    config = load_config()
+    return make_tasks(config, [[("kesme", 2), ("oyma", None)], [("bükme", None), ("yanak_açma", 3)]])
+
+def _fingerprint(tasks, version="v1", locks=LOCKS, profile="fast"):
+    options = {"solver": "cpsat", "profile": get_solver_profile(profile).solution_options()}
+    return problem_fingerprint(tasks, version, locks, solver_options=options)
+
+def test_fingerprint_ignores_task_and_lock_order(tasks):
+    shuffled = [replace(t, machine_candidates=list(reversed(t.machine_candidates))) for t in reversed(tasks)]
+    assert _fingerprint(tasks) == _fingerprint(shuffled, locks=list(reversed(LOCKS)))
+
+@pytest.mark.parametrize("change", [
+    {"version": "v2"},
+    {"locks": LOCKS[:1]},
+    {"locks": [dict(LOCKS[0], start_min=5), LOCKS[1]]},
+    {"profile": "balanced"},
+])
+def test_fingerprint_changes_with_inputs(tasks, change):
+    assert _fingerprint(tasks, **change) != _fingerprint(tasks)
+
+def test_fingerprint_ignores_worker_count(tasks):
+    profile = get_solver_profile("fast")
+    a = problem_fingerprint(tasks, "v1", LOCKS, {"profile": profile.solution_options()})
+    b = problem_fingerprint(tasks, "v1", LOCKS, {"profile": replace(profile, num_workers=2).solution_options()})
+    assert a == b
@@ -0,0 +1,34 @@
+# tests/test_solver_formulations.py
+import pytest
+
+from adapters.solver.solver_adapter import ORToolsSolver
+from benchmarks.instance_generator import generate_packages
+from config.solver_profiles import get_solver_profile
+from core.fjsm_core import FJSMCore
+from plan_checks import assert_valid_plan, load_config, quiet_logger
+
+@pytest.fixture(scope="module")
+def instance():
+    config = load_config()
+    logger = quiet_logger()
+    tasks = FJSMCore(config, logger=logger).process_packages(generate_packages(config, 20, seed=7))
+    return config, logger, tasks
+
+def _solve(instance, compact: bool):
+    config, logger, tasks = instance
+    solver = ORToolsSolver(config, logger, profile=get_solver_profile("fast"), compact=compact, random_seed=1)
+    return solver.solve(tasks), solver.last_run_stats
+
+@pytest.mark.parametrize("compact", [False, True], ids=["standard", "compact"])
+def test_plan_is_valid(instance, compact):
+    config, _, tasks = instance
+    results, _ = _solve(instance, compact)
+    assert_valid_plan(tasks, results, config)
+
+def test_formulations_reach_same_optimal_makespan(instance):
+    makespans = {}
+    for compact in (False, True):
+        results, stats = _solve(instance, compact)
+        assert stats["stage1_status"] == "OPTIMAL"
+        makespans[compact] = max(r.end_time for r in results)
+    assert makespans[False] == makespans[True]
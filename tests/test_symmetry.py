@@ -0,0 +1,63 @@
+# tests/test_symmetry.py
+import pytest
+
+from adapters.solver.machine_pools import MachinePool
+from adapters.solver.solver_adapter import ORToolsSolver
+from adapters.solver.symmetry import interchangeable_instance_groups, machine_value_precedence
+from config.solver_profiles import get_solver_profile
+from plan_checks import assert_valid_plan, load_config, make_tasks, makespan, quiet_logger
+
+SPLIT_HEAVY = [
+    [("oyma", 3), ("bükme", 2)],
+    [("bükme", 3), ("yanak_açma", 2)],
+    [("yanak_açma", 3), ("oyma", 2)],
+    [("kesme", 3), ("oyma", 2)],
+]
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config()
+
+@pytest.fixture(scope="module")
+def tasks(config):
+    return make_tasks(config, SPLIT_HEAVY)
+
+def _solver(config, use_machine_pools, break_symmetry):
+    return ORToolsSolver(config, quiet_logger(), use_machine_pools=use_machine_pools, break_symmetry=break_symmetry,
+                         profile=get_solver_profile("fast"), random_seed=1)
+
+@pytest.mark.parametrize("use_machine_pools", [True, False], ids=["pooled", "per_machine"])
+def test_symmetry_breaking_keeps_optimal_makespan(config, tasks, use_machine_pools):
+    makespans = {}
+    for break_symmetry in (True, False):
+        solver = _solver(config, use_machine_pools, break_symmetry)
+        groups = solver.open_session(tasks, "fp").bundle.split_groups
+        assert bool(groups) == break_symmetry
+        results = solver.solve(tasks)
+        assert solver.last_run_stats["stage1_status"] == "OPTIMAL"
+        assert_valid_plan(tasks, results, config)
+        makespans[break_symmetry] = makespan(results)
+    assert makespans[True] == makespans[False]
+
+def test_locked_split_instance_leaves_its_group(config, tasks):
+    oyma = sorted(t.id for t in tasks if t.job_id == 1 and t.base_name == "oyma")
+    lock = {"task_instance_id": oyma[-1], "machine": "O#3", "start_min": 0}
+    solver = _solver(config, True, True)
+    assert oyma[-1] not in {tid for ids in solver.open_session(tasks, "fp", [lock]).bundle.split_groups for tid in ids}
+    assert_valid_plan(tasks, solver.solve(tasks, locks=[lock]), config, locks=[lock])
+
+def test_interchangeable_groups(tasks):
+    groups = interchangeable_instance_groups(tasks)
+    # Her split görev bir grup: 4 job x 2 faz.
+    assert sorted(len(g) for g in groups) == [2, 2, 2, 2, 3, 3, 3, 3]
+    three = next(g for g in groups if len(g) == 3)
+    two = next(g for g in groups if len(g) == 2)
+    remaining = interchangeable_instance_groups(tasks, excluded_ids=[three[0], two[0]])
+    assert three[1:] in remaining and len(remaining) == 7
+
+def test_machine_value_precedence_orders_identical_machines():
+    pool = MachinePool(name="pool[K#1,K#2,K#3]", machines=("K#1", "K#2", "K#3"))
+    pools = {m: pool for m in pool.machines}
+    resources = {1: list(pool.machines), 2: list(pool.machines), 3: list(pool.machines), 4: ["O#1"]}
+    # 1. görev sadece K#1'e, 2. görev K#1/K#2'ye düşebilir; 3. görev serbest, havuz dışı görev etkilenmez.
+    assert sorted(machine_value_precedence(resources, pools)) == [(1, "K#2"), (1, "K#3"), (2, "K#3")]
@@ -0,0 +1,94 @@
+# tests/test_whatif_session.py
+import pytest
+
+from adapters.solver.solver_adapter import ORToolsSolver
+from adapters.solver.whatif_session import get_whatif_sessions, reset_whatif_sessions
+from config.solver_profiles import get_solver_profile
+from plan_checks import assert_valid_plan, load_config, make_tasks, makespan, quiet_logger
+
+JOBS = [
+    [("kesme", 2), ("oyma", None)],
+    [("kesme", None), ("oyma", None), ("bükme", None)],
+    [("bükme", 2), ("yanak_açma", None)],
+    [("oyma", None), ("yanak_açma", None)],
+]
+
+@pytest.fixture(scope="module")
+def config():
+    return load_config()
+
+@pytest.fixture(scope="module")
+def tasks(config):
+    return make_tasks(config, JOBS)
+
+def _solver(config):
+    return ORToolsSolver(config, quiet_logger(), profile=get_solver_profile("fast"), random_seed=1)
+
+def _task(tasks, job_id, name):
+    return next(t for t in tasks if t.job_id == job_id and t.base_name == name)
+
+def _lock(task, machine, start):
+    return {"task_instance_id": task.id, "machine": machine, "start_min": start}
+
+def test_session_resolves_with_changed_locks(config, tasks):
+    solver = _solver(config)
+    session = solver.open_session(tasks, "fp")
+    oyma, yanak = _task(tasks, 4, "oyma"), _task(tasks, 4, "yanak_açma")
+    # O#3, O#5 ve Y#5 tekil makineler; havuza ya da simetri kısıtlarına girmiyorlar.
+    for locks in ([_lock(oyma, "O#5", 2)], [_lock(oyma, "O#3", 0), _lock(yanak, "Y#5", 10)], []):
+        assert solver.session_accepts(session, locks)
+        results = solver.solve_session(session, locks)
+        assert solver.last_run_stats["session_reused"]
+        assert_valid_plan(tasks, results, config, locks=locks)
+        fresh = _solver(config)
+        assert makespan(results) == makespan(fresh.solve(tasks, locks=locks))
+
+# Her durum (görevler, oturumun horizon'u) -> kilitler.
+INCOMPATIBLE = {
+    "machine_block": lambda tasks, horizon: [{"machine": "O#3", "start_min": 0, "end_min": 10}],
+    "split_task": lambda tasks, horizon: [_lock(_task(tasks, 3, "bükme"), "B#3", 0)],
+    "pooled_machine": lambda tasks, horizon: [_lock(_task(tasks, 4, "oyma"), "O#1", 0)],
+    "not_candidate": lambda tasks, horizon: [_lock(_task(tasks, 4, "oyma"), "B#3", 0)],
+    "beyond_horizon": lambda tasks, horizon: [_lock(_task(tasks, 4, "oyma"), "O#3", horizon + 10)],
+}
+
+@pytest.mark.parametrize("case", sorted(INCOMPATIBLE))
+def test_session_rejects_incompatible_locks(config, tasks, case):
+    solver = _solver(config)
+    session = solver.open_session(tasks, "fp")
+    assert not solver.session_accepts(session, INCOMPATIBLE[case](tasks, session.bundle.horizon))
+
+def _solve_whatif():
+    pytest.importorskip("config.settings", reason="config/settings.py is not configured")
+    from backend.tasks import _solve_whatif as solve_whatif
+    return solve_whatif
+
+class _NoPlanWriter:
+    def read_results(self, run_id):
+        return []
+
+def test_solve_whatif_reuses_and_rebuilds_sessions(config, tasks):
+    solve_whatif = _solve_whatif()
+    reset_whatif_sessions()
+    solver, writer, logger = _solver(config), _NoPlanWriter(), quiet_logger()
+    oyma = _task(tasks, 4, "oyma")
+    locks = [_lock(oyma, "O#3", 0)]
+    try:
+        # Oturum yok ve base_run_id yok: normal yoldan çözülsün.
+        assert solve_whatif(solver, tasks, config.version, locks, None, "run-0", writer, logger) is None
+        assert solve_whatif(solver, tasks, config.version, locks, "run-0", "run-1", writer, logger) is not None
+        (session,) = get_whatif_sessions()._sessions.values()
+        assert session.last_run_id == "run-1"
+
+        locks = [_lock(oyma, "O#5", 2)]
+        results = solve_whatif(solver, tasks, config.version, locks, "run-1", "run-2", writer, logger)
+        assert get_whatif_sessions()._sessions[session.fingerprint] is session
+        assert_valid_plan(tasks, results, config, locks=locks)
+
+        # Havuz makinesine kilit bu modelle çözülemez; oturum bu kilitlerle yeniden kurulur.
+        locks = [_lock(oyma, "O#1", 0)]
+        results = solve_whatif(solver, tasks, config.version, locks, "run-2", "run-3", writer, logger)
+        assert get_whatif_sessions()._sessions[session.fingerprint] is not session
+        assert_valid_plan(tasks, results, config, locks=locks)
+    finally:
+        reset_whatif_sessions()